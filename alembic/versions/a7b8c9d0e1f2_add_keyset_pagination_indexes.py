@@ -0,0 +1,45 @@
+"""add (user_id, created_at, id) indexes for keyset pagination
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-03-09 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7b8c9d0e1f2'
+down_revision = 'f6a7b8c9d0e1'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_generations_user_id_created_at', 'generations', ['user_id', 'created_at', 'id']),
+    ('ix_gallery_items_user_id_created_at', 'gallery_items', ['user_id', 'created_at', 'id']),
+    ('ix_payments_user_id_created_at', 'payments', ['user_id', 'created_at', 'id']),
+    ('ix_payments_created_at_id', 'payments', ['created_at', 'id']),
+    ('ix_balance_history_user_id_created_at', 'balance_history', ['user_id', 'created_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в больших таблицах, но не работает в транзакции
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,62 @@
+"""add composite and partial indexes for hot query shapes
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-03-10 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8c9d0e1f2a3'
+down_revision = 'a7b8c9d0e1f2'
+branch_labels = None
+depends_on = None
+
+
+ACTIVE_GENERATIONS = "status IN ('PENDING', 'PROCESSING') AND kie_task_id IS NOT NULL"
+
+INDEXES = [
+    # История пользователя с фильтром по типу
+    ('ix_generations_user_id_type_created_at', 'generations',
+     ['user_id', 'generation_type', 'created_at', 'id'], None),
+    # Время выполнения по модели (ETA)
+    ('ix_generations_model_id_status_created_at', 'generations',
+     ['model_id', 'status', 'created_at'], None),
+    # Генерации в работе — малая часть таблицы
+    ('ix_generations_active', 'generations',
+     ['created_at'], ACTIVE_GENERATIONS),
+    # Галерея с фильтром по типу файла
+    ('ix_gallery_items_user_id_file_type_created_at', 'gallery_items',
+     ['user_id', 'file_type', 'created_at', 'id'], None),
+    # Избранное
+    ('ix_gallery_items_favorites', 'gallery_items',
+     ['user_id', 'created_at', 'id'], 'is_favorite'),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+            )
+
+    # Свежая статистика, чтобы планировщик сразу выбрал новые индексы
+    op.execute('ANALYZE generations')
+    op.execute('ANALYZE gallery_items')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in INDEXES:
+            op.drop_index(
+                name, table_name=table,
+                if_exists=True,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,83 @@
+"""add payments.currency and analytics rollup tables
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-03-12 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd0e1f2a3b4c5'
+down_revision = 'c9d0e1f2a3b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'payments',
+        sa.Column('currency', sa.String(length=3), server_default='USD', nullable=False),
+    )
+
+    op.create_table('generation_rollups',
+    sa.Column('resolution', sa.String(length=8), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('model_id', sa.Integer(), nullable=False),
+    sa.Column('provider', sa.String(length=50), nullable=False),
+    sa.Column('generation_type', sa.String(length=20), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('tokens_spent', sa.BigInteger(), nullable=False),
+    sa.Column('duration_seconds', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('resolution', 'bucket_start', 'model_id', 'provider', 'generation_type', 'status')
+    )
+    op.create_table('revenue_rollups',
+    sa.Column('resolution', sa.String(length=8), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('payments', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('tokens', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resolution', 'bucket_start', 'currency')
+    )
+    op.create_table('balance_rollups',
+    sa.Column('resolution', sa.String(length=8), nullable=False),
+    sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('operation_type', sa.String(length=20), nullable=False),
+    sa.Column('operations', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('resolution', 'bucket_start', 'operation_type')
+    )
+    op.create_table('rollup_watermarks',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('position', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    # Rollups read completed rows by completion time
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_generations_completed_at', 'generations', ['completed_at'],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_payments_paid_at', 'payments', ['paid_at'],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_payments_paid_at', table_name='payments', if_exists=True, postgresql_concurrently=True)
+        op.drop_index('ix_generations_completed_at', table_name='generations', if_exists=True, postgresql_concurrently=True)
+    op.drop_table('rollup_watermarks')
+    op.drop_table('balance_rollups')
+    op.drop_table('revenue_rollups')
+    op.drop_table('generation_rollups')
+    op.drop_column('payments', 'currency')
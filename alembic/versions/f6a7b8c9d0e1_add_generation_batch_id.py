@@ -0,0 +1,35 @@
+"""add batch_id to generations
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-03-02 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6a7b8c9d0e1'
+down_revision = 'e5f6a7b8c9d0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    columns = [row[0] for row in conn.execute(sa.text(
+        "SELECT column_name FROM information_schema.columns WHERE table_name='generations'"
+    ))]
+    if 'batch_id' not in columns:
+        op.add_column(
+            'generations',
+            sa.Column('batch_id', postgresql.UUID(as_uuid=True), nullable=True)
+        )
+        op.create_index('ix_generations_batch_id', 'generations', ['batch_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_generations_batch_id', table_name='generations')
+    op.drop_column('generations', 'batch_id')
@@ -1,6 +1,11 @@
 #!/bin/sh
 set -e
 
+# Workers run migrations-free, the app container owns the schema
+if [ "$SKIP_MIGRATIONS" = "1" ]; then
+    exec "$@"
+fi
+
 echo "Applying database migrations..."
 
 # Try normal migration first
@@ -23,5 +28,9 @@ else
     echo "Migrations applied successfully."
 fi
 
+if [ "$#" -gt 0 ]; then
+    exec "$@"
+fi
+
 echo "Starting application..."
 exec python -m src.main
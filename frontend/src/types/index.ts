@@ -129,6 +129,7 @@ export interface PaymentPackagesResponse {
 export interface Payment {
   id: string;
   amount: number;
+  currency: string;
   tokens: number;
   status: PaymentStatus;
   created_at: string;
@@ -160,6 +161,7 @@ export interface AdminUser extends User {
   is_banned: boolean;
   total_generations: number;
   total_spent: number;
+  last_activity_at: string | null;
 }
 
 export interface LogEntry {
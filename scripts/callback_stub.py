@@ -0,0 +1,73 @@
+"""
+Local stub that posts a provider completion callback.
+
+Usage:
+    python -m scripts.callback_stub --provider kie.ai --task-id <id> --result-url <url>
+    python -m scripts.callback_stub --provider poyo.ai --task-id <id> --failed
+"""
+
+import argparse
+import asyncio
+
+import httpx
+
+from src.modules.generation.callbacks import callback_token
+
+
+def build_payload(provider: str, task_id: str, result_url: str | None, failed: bool) -> dict:
+    """Build callback body in the provider's format."""
+    if provider == "kie.ai":
+        if task_id.startswith("veo_"):
+            return {
+                "code": 501 if failed else 200,
+                "msg": "Generation failed" if failed else "success",
+                "data": {
+                    "taskId": task_id.removeprefix("veo_"),
+                    "info": {"resultUrls": [] if failed else [result_url]},
+                },
+            }
+        return {
+            "code": 200,
+            "msg": "success",
+            "data": {
+                "taskId": task_id,
+                "state": "fail" if failed else "success",
+                "resultJson": {"resultUrls": [] if failed else [result_url]},
+                "failMsg": "Generation failed" if failed else None,
+            },
+        }
+
+    return {
+        "data": {
+            "task_id": task_id,
+            "status": "failed" if failed else "finished",
+            "files": [] if failed else [{"file_url": result_url}],
+            "error_message": "Generation failed" if failed else None,
+        }
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Post a fake provider callback")
+    parser.add_argument("--provider", choices=["kie.ai", "poyo.ai"], required=True)
+    parser.add_argument("--task-id", required=True)
+    parser.add_argument("--result-url", default="https://placehold.co/512x512.png")
+    parser.add_argument("--failed", action="store_true")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    args = parser.parse_args()
+
+    url = f"{args.base_url.rstrip('/')}/api/v1/generation/callback/{args.provider}"
+    payload = build_payload(args.provider, args.task_id, args.result_url, args.failed)
+
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        response = await client.post(
+            url,
+            params={"token": callback_token(args.provider)},
+            json=payload,
+        )
+
+    print(response.status_code, response.text)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
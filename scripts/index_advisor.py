@@ -0,0 +1,265 @@
+"""
+Index advisor: EXPLAIN the hot repository queries and flag sequential scans.
+
+Runs each query of the catalog below through the real repository code,
+captures the SQL it sends and prints the plan verdict. Needs PostgreSQL.
+
+Usage:
+    python -m scripts.index_advisor
+    python -m scripts.index_advisor --seed 1000000   # scratch databases only!
+    python -m scripts.index_advisor --min-rows 50000 --verbose
+"""
+
+import argparse
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy import event, text
+
+from src.core.database import async_session_maker, engine
+from src.modules.gallery.repository import GalleryRepository
+from src.modules.generation.repository import GenerationRepository
+from src.modules.payments.repository import BalanceHistoryRepository, PaymentRepository
+from src.modules.user.repository import UserRepository
+from src.shared.enums import GenerationType
+
+
+@dataclass
+class Sample:
+    """Realistic parameters: the heaviest user and existing keys."""
+    user_id: int
+    telegram_id: int
+    task_id: str | None
+    lava_id: str | None
+    model_code: str | None
+
+
+QueryCase = Callable[..., Awaitable]
+
+CATALOG: dict[str, QueryCase] = {
+    "users.by_telegram_id":
+        lambda s, x: UserRepository(s).get_by_telegram_id(x.telegram_id),
+    "generations.user_history":
+        lambda s, x: GenerationRepository(s).get_user_generations(x.user_id),
+    "generations.user_history_by_type":
+        lambda s, x: GenerationRepository(s).get_user_generations(
+            x.user_id, generation_type=GenerationType.IMAGE
+        ),
+    "generations.count_user_by_type":
+        lambda s, x: GenerationRepository(s).count_user_generations(
+            x.user_id, GenerationType.VIDEO
+        ),
+    "generations.pending":
+        lambda s, x: GenerationRepository(s).get_pending_generations(),
+    "generations.by_task_id":
+        lambda s, x: GenerationRepository(s).get_by_kie_task_id(x.task_id or ""),
+    "generations.completion_durations":
+        lambda s, x: GenerationRepository(s).get_completion_durations(x.model_code or ""),
+    "gallery.user":
+        lambda s, x: GalleryRepository(s).get_user_gallery(x.user_id),
+    "gallery.user_by_type":
+        lambda s, x: GalleryRepository(s).get_user_gallery(x.user_id, file_type="video"),
+    "gallery.user_favorites":
+        lambda s, x: GalleryRepository(s).get_user_gallery(x.user_id, favorites_only=True),
+    "gallery.count_user":
+        lambda s, x: GalleryRepository(s).count_user_gallery(x.user_id),
+    "payments.by_lava_id":
+        lambda s, x: PaymentRepository(s).get_by_lava_id(x.lava_id or ""),
+    "payments.user":
+        lambda s, x: PaymentRepository(s).get_user_payments(x.user_id),
+    "payments.admin_list":
+        lambda s, x: PaymentRepository(s).get_all_payments(),
+    "balance_history.user":
+        lambda s, x: BalanceHistoryRepository(s).get_user_history(x.user_id),
+    "balance_history.count_user":
+        lambda s, x: BalanceHistoryRepository(s).count_user_history(x.user_id),
+}
+
+
+SEED_SQL = [
+    """
+    INSERT INTO users (telegram_id, first_name, balance, is_banned, is_admin)
+    SELECT 900000000000 + g, 'Seed ' || g, 100, false, false
+    FROM generate_series(1, :users) g
+    ON CONFLICT (telegram_id) DO NOTHING
+    """,
+    """
+    CREATE TEMP TABLE seed_users AS
+    SELECT id, row_number() OVER (ORDER BY id) AS rn FROM users
+    """,
+    # Skewed: a few heavy users own most of the rows
+    """
+    CREATE TEMP TABLE seed_owners AS
+    SELECT g, u.id AS user_id
+    FROM (
+        SELECT g, 1 + floor(power(random(), 3) * c.n)::int AS rn
+        FROM generate_series(1, :rows) g, (SELECT count(*) AS n FROM seed_users) c
+    ) r
+    JOIN seed_users u ON u.rn = r.rn
+    """,
+    """
+    INSERT INTO generations (
+        id, user_id, model_id, generation_type, status, tokens_spent,
+        params, kie_task_id, created_at, completed_at
+    )
+    SELECT
+        gen_random_uuid(), o.user_id, m.ids[1 + floor(random() * cardinality(m.ids))::int],
+        (ARRAY['IMAGE', 'VIDEO', 'FACESWAP'])[1 + floor(random() * 3)::int]::generationtype,
+        (CASE WHEN random() < 0.002 THEN 'PROCESSING'
+              WHEN random() < 0.1 THEN 'FAILED'
+              ELSE 'SUCCESS' END)::generationstatus,
+        10, '{}', 'seed-' || o.g,
+        now() - random() * interval '365 days',
+        now()
+    FROM seed_owners o, (SELECT array_agg(id) AS ids FROM ai_models) m
+    """,
+    """
+    INSERT INTO gallery_items (id, user_id, generation_id, file_path, file_type, is_favorite, created_at)
+    SELECT
+        gen_random_uuid(), user_id, id, 'seed/' || id,
+        CASE WHEN generation_type = 'VIDEO' THEN 'video' ELSE 'image' END,
+        random() < 0.05, created_at
+    FROM generations
+    WHERE kie_task_id LIKE 'seed-%' AND status = 'SUCCESS'
+    ON CONFLICT (generation_id) DO NOTHING
+    """,
+    """
+    INSERT INTO payments (id, user_id, amount, tokens, lava_id, status, created_at)
+    SELECT
+        gen_random_uuid(), user_id, 10, 100, 'seed-' || g,
+        (CASE WHEN random() < 0.8 THEN 'SUCCESS' ELSE 'PENDING' END)::paymentstatus,
+        now() - random() * interval '365 days'
+    FROM seed_owners
+    WHERE g % 10 = 0
+    ON CONFLICT (lava_id) DO NOTHING
+    """,
+    """
+    INSERT INTO balance_history (user_id, amount, balance_after, operation_type, description, created_at)
+    SELECT user_id, -10, 100, 'GENERATION'::balanceoperationtype, 'Seed',
+        now() - random() * interval '365 days'
+    FROM seed_owners
+    """,
+    "ANALYZE",
+]
+
+
+async def seed(rows: int) -> None:
+    users = max(rows // 100, 10)
+    print(f"Seeding {rows} rows per table for {users} users...")
+    async with engine.begin() as conn:
+        for statement in SEED_SQL:
+            await conn.execute(text(statement), {"users": users, "rows": rows})
+
+
+async def load_sample() -> Sample:
+    async with engine.connect() as conn:
+        heavy = (await conn.execute(text(
+            "SELECT g.user_id, u.telegram_id FROM generations g JOIN users u ON u.id = g.user_id "
+            "GROUP BY g.user_id, u.telegram_id ORDER BY count(*) DESC LIMIT 1"
+        ))).first()
+        if heavy is None:
+            raise SystemExit("No generations in the database: run with --seed first")
+        task_id = (await conn.execute(text(
+            "SELECT kie_task_id FROM generations WHERE kie_task_id IS NOT NULL LIMIT 1"
+        ))).scalar()
+        lava_id = (await conn.execute(text(
+            "SELECT lava_id FROM payments WHERE lava_id IS NOT NULL LIMIT 1"
+        ))).scalar()
+        model_code = (await conn.execute(text(
+            "SELECT code FROM ai_models ORDER BY id LIMIT 1"
+        ))).scalar()
+    return Sample(heavy[0], heavy[1], task_id, lava_id, model_code)
+
+
+async def table_sizes() -> dict[str, float]:
+    async with engine.connect() as conn:
+        result = await conn.execute(text(
+            "SELECT relname, reltuples FROM pg_class WHERE relkind = 'r'"
+        ))
+        return {name: rows for name, rows in result.all()}
+
+
+async def capture_statements(case: QueryCase, sample: Sample) -> list[tuple[str, object]]:
+    """Run a catalog query and return the SELECT statements it executed."""
+    captured: list[tuple[str, object]] = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+    try:
+        async with async_session_maker() as session:
+            await case(session, sample)
+            await session.rollback()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
+    return captured
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+async def explain(statement: str, parameters: object) -> dict:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        raw = result.scalar()
+    return (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="EXPLAIN hot queries and flag sequential scans")
+    parser.add_argument("--seed", type=int, default=0, help="Insert N synthetic rows per table first")
+    parser.add_argument("--min-rows", type=int, default=10000,
+                        help="Ignore sequential scans of smaller tables")
+    parser.add_argument("--verbose", action="store_true", help="Print full plans")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        raise SystemExit("Index advisor needs PostgreSQL")
+
+    if args.seed:
+        await seed(args.seed)
+
+    sample = await load_sample()
+    sizes = await table_sizes()
+    problems = 0
+
+    for name, case in CATALOG.items():
+        for statement, parameters in await capture_statements(case, sample):
+            plan = await explain(statement, parameters)
+            seq_scans = [
+                node for node in plan_nodes(plan)
+                if node["Node Type"] == "Seq Scan"
+                and sizes.get(node.get("Relation Name"), 0) >= args.min_rows
+            ]
+            sorts = [node for node in plan_nodes(plan) if node["Node Type"] == "Sort"]
+
+            if seq_scans:
+                problems += 1
+                for node in seq_scans:
+                    table = node["Relation Name"]
+                    print(
+                        f"SEQ SCAN  {name:<36} {table} ({sizes[table]:.0f} rows) "
+                        f"filter={node.get('Filter', '-')}"
+                    )
+            else:
+                note = " (sort not served by an index)" if sorts else ""
+                print(f"ok        {name:<36} cost={plan['Total Cost']:.0f}{note}")
+
+            if args.verbose:
+                print(statement)
+                print(json.dumps(plan, indent=2))
+
+    await engine.dispose()
+    if problems:
+        raise SystemExit(f"{problems} queries scan large tables sequentially")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -11,7 +11,14 @@ from fastapi.responses import FileResponse
 
 from src.config import STORAGE_DIR, settings, BASE_DIR
 from src.core.database import check_db_connection, close_db
+from src.core.http import close_http_clients, init_http_clients
 from src.core.redis import check_redis_connection, close_redis
+from src.modules.admin.stats import stats_reconciler
+from src.modules.ai_models.catalog import model_catalog
+from src.modules.analytics.rollup import rollup_job
+from src.modules.generation.jobs import queue_enabled
+from src.modules.generation.poller import generation_poller
+from src.modules.user.cache import auth_cache
 from src.shared.logger import enable_websocket_logging, logger
 
 
@@ -38,41 +45,25 @@ async def lifespan(app: FastAPI):
     # Enable WebSocket logging for admin panel
     enable_websocket_logging(level="DEBUG")
 
-    # Resume pending/processing generations after restart
-    import asyncio
-    from src.core.database import async_session_maker
-    from src.modules.generation.repository import GenerationRepository
-    from src.modules.user.repository import UserRepository
+    # Shared keep-alive clients for providers, payments and downloads
+    init_http_clients()
+
+    # Drop cached users and models changed by other processes
+    await auth_cache.start()
+    await model_catalog.start()
+
+    # Correct drift of the incrementally maintained dashboard stats
+    await stats_reconciler.start()
+    await rollup_job.start()
 
-    async def resume_generations():
+    # Resume pending/processing generations after restart
+    # (with the job queue enabled, workers own polling)
+    if not queue_enabled():
         try:
-            async with async_session_maker() as session:
-                repo = GenerationRepository(session)
-                user_repo = UserRepository(session)
-                generations = await repo.get_pending_generations(limit=200)
-                if not generations:
-                    logger.info("No pending generations to resume")
-                    return
-                logger.info(f"Resuming {len(generations)} pending generations after restart")
-                from src.modules.generation.service import GenerationService
-                for gen in generations:
-                    provider_name = gen.params.get("_provider", "kie.ai")
-                    user = await user_repo.get_by_id(gen.user_id)
-                    telegram_id = user.telegram_id if user else None
-                    service = GenerationService(session)
-                    asyncio.create_task(
-                        service._poll_generation(
-                            gen.id,
-                            gen.kie_task_id,
-                            provider_name=provider_name,
-                            telegram_id=telegram_id,
-                        )
-                    )
-                    logger.info(f"Resumed polling | generation_id={gen.id}, task_id={gen.kie_task_id}")
+            await generation_poller.load_pending()
         except Exception as e:
             logger.error(f"Failed to resume generations | error={e}")
-
-    asyncio.create_task(resume_generations())
+        await generation_poller.start()
 
     logger.info(f"Frontend dir exists: {FRONTEND_DIR.exists()}")
     logger.info("FastAPI started")
@@ -81,6 +72,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("FastAPI shutting down...")
+    await generation_poller.stop()
+    await auth_cache.stop()
+    await model_catalog.stop()
+    await stats_reconciler.stop()
+    await rollup_job.stop()
+    await close_http_clients()
     await close_db()
     await close_redis()
     logger.info("FastAPI stopped")
@@ -1,12 +1,17 @@
 """FastAPI dependencies."""
 
+import time
+import uuid
 from typing import Annotated
 
 from fastapi import Depends, Header, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import async_session_maker
+from src.core.database import async_session_maker, replica_session_maker
+from src.core.exceptions import ValidationError
+from src.core.pagination import Cursor
 from src.core.security import validate_telegram_webapp_data, validate_webapp_token
+from src.modules.user.cache import auth_cache, auth_cache_key
 from src.modules.user.models import User
 from src.modules.user.service import UserService
 from src.shared.logger import logger, set_context
@@ -28,6 +33,15 @@ async def get_session() -> AsyncSession:
 SessionDep = Annotated[AsyncSession, Depends(get_session)]
 
 
+async def get_replica_session() -> AsyncSession:
+    """Get read-only database session, on the replica when configured."""
+    async with replica_session_maker() as session:
+        yield session
+
+
+ReplicaSessionDep = Annotated[AsyncSession, Depends(get_replica_session)]
+
+
 async def get_current_user(
     session: SessionDep,
     x_telegram_init_data: Annotated[str | None, Header()] = None,
@@ -38,11 +52,20 @@ async def get_current_user(
     Get current user. Supports two auth methods:
     1. Telegram WebApp initData (inline button, menu button)
     2. Token auth (reply keyboard button)
+
+    Users of already verified credentials are served from the auth cache
+    without touching the database.
     """
     
     # Method 1: initData (non-empty string)
     if x_telegram_init_data:
+        cache_key = auth_cache_key("init_data", x_telegram_init_data)
+        cached = await auth_cache.get(cache_key)
+        if cached:
+            return _check_cached_user(cached)
+
         try:
+            loaded_at = time.monotonic()
             data = validate_telegram_webapp_data(x_telegram_init_data)
             telegram_user = data["user"]
             telegram_id = telegram_user["id"]
@@ -62,6 +85,10 @@ async def get_current_user(
                     detail="User is banned",
                 )
             
+            if not is_new:
+                # New users are cached on their next request, after the commit
+                await auth_cache.store(cache_key, user, loaded_at)
+
             logger.debug(f"Auth via initData | telegram_id={telegram_id}")
             return user
             
@@ -90,6 +117,11 @@ async def get_current_user(
                 detail="Invalid telegram_id",
             )
         
+        cache_key = auth_cache_key("token", str(telegram_id), x_telegram_token)
+        cached = await auth_cache.get(cache_key)
+        if cached:
+            return _check_cached_user(cached)
+
         if not validate_webapp_token(telegram_id, x_telegram_token):
             logger.warning(f"Token auth: invalid token | telegram_id={telegram_id}")
             raise HTTPException(
@@ -99,6 +131,7 @@ async def get_current_user(
         
         set_context(user_id=telegram_id)
         
+        loaded_at = time.monotonic()
         user_service = UserService(session)
         user = await user_service.user_repo.get_by_telegram_id(telegram_id)
         
@@ -115,6 +148,8 @@ async def get_current_user(
                 detail="User is banned",
             )
         
+        await auth_cache.store(cache_key, user, loaded_at)
+
         logger.debug(f"Auth via token | telegram_id={telegram_id}")
         return user
     
@@ -130,6 +165,16 @@ async def get_current_user(
     )
 
 
+def _check_cached_user(user: User) -> User:
+    set_context(user_id=user.telegram_id)
+    if user.is_banned:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is banned",
+        )
+    return user
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
@@ -147,3 +192,27 @@ async def get_admin_user(
 
 AdminUser = Annotated[User, Depends(get_admin_user)]
 
+
+def _decode_cursor(cursor: str | None, id_type: type) -> Cursor | None:
+    try:
+        return Cursor.decode_optional(cursor, id_type)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+
+
+def get_cursor(cursor: str | None = None) -> Cursor | None:
+    """Decode the `cursor` query parameter of lists with UUID IDs."""
+    return _decode_cursor(cursor, uuid.UUID)
+
+
+def get_int_cursor(cursor: str | None = None) -> Cursor | None:
+    """Decode the `cursor` query parameter of lists with integer IDs."""
+    return _decode_cursor(cursor, int)
+
+
+CursorDep = Annotated[Cursor | None, Depends(get_cursor)]
+IntCursorDep = Annotated[Cursor | None, Depends(get_int_cursor)]
+
@@ -0,0 +1,83 @@
+"""ETag helpers for conditional GET requests."""
+
+import functools
+import hashlib
+import inspect
+from collections.abc import Awaitable, Callable
+
+from fastapi import Request, Response, status
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts: bytes | str) -> str:
+    """Strong ETag of the given content or version parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode() if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def json_response(payload: bytes, etag: str, if_none_match: str | None) -> Response:
+    """Serialized JSON with its ETag, or 304 if the client has it already."""
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+def conditional(version: Callable[..., Awaitable[str | None]]):
+    """
+    Opt a GET route into conditional requests.
+
+    `version` gets the endpoint arguments it names (e.g. `current_user`)
+    and returns a stamp that changes whenever the response would, or None
+    to serve the request unconditionally. The ETag is derived from the
+    stamp and the URL, so a matching If-None-Match gets 304 before the
+    endpoint runs.
+
+    Usage:
+        @router.get("/balance")
+        @conditional(balance_version)
+        async def get_balance(current_user: CurrentUser): ...
+    """
+    version_params = set(inspect.signature(version).parameters)
+
+    def decorator(endpoint: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+        signature = inspect.signature(endpoint)
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, _etag_request: Request, _etag_response: Response, **kwargs):
+            stamp = await version(**{k: v for k, v in kwargs.items() if k in version_params})
+            if stamp is None:
+                return await endpoint(*args, **kwargs)
+
+            url = _etag_request.url
+            etag = make_etag(url.path, url.query, stamp)
+            headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+            if etag_matches(_etag_request.headers.get("if-none-match"), etag):
+                return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            _etag_response.headers.update(headers)
+            return await endpoint(*args, **kwargs)
+
+        # FastAPI resolves the endpoint parameters plus request and response
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter("_etag_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            inspect.Parameter("_etag_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response),
+        ])
+        return wrapper
+
+    return decorator
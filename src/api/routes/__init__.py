@@ -10,6 +10,7 @@ from src.api.routes.gallery import router as gallery_router
 from src.api.routes.payments import router as payments_router
 from src.api.routes.admin import router as admin_router
 from src.api.routes.upload import router as upload_router
+from src.api.websockets.generation import router as generation_ws_router
 from src.api.websockets.logs import router as logs_ws_router
 
 
@@ -35,4 +36,5 @@ def setup_routes(app: FastAPI) -> None:
     
     # WebSocket routes
     app.include_router(logs_ws_router, tags=["WebSocket"])
+    app.include_router(generation_ws_router, tags=["WebSocket"])
 
@@ -1,22 +1,46 @@
 """Admin routes."""
 
-from fastapi import APIRouter, HTTPException, status
+from datetime import UTC, datetime, timedelta
+from typing import Literal
 
-from src.api.dependencies import AdminUser, SessionDep
+from fastapi import APIRouter, HTTPException, Query, status
+from sqlalchemy import Row
+
+from src.api.dependencies import AdminUser, CursorDep, ReplicaSessionDep, SessionDep
 from src.api.schemas.admin import (
     AdminPaymentListResponse,
     AdminStatsResponse,
     AdminUserListResponse,
     AdminUserResponse,
+    AdminUserSort,
     AdminUserUpdateRequest,
+    BalanceSeriesPoint,
+    DatabasePoolResponse,
+    DownloadStatsResponse,
+    GenerationSeriesPoint,
+    PollerProviderStats,
+    PollerStatsResponse,
+    ProviderHealthResponse,
+    QueueStatsResponse,
+    RevenueSeriesPoint,
+    StatsSeriesPoint,
 )
 from src.api.schemas.common import MessageResponse
 from src.api.schemas.model import AIModelCreateRequest, AIModelResponse, AIModelUpdateRequest
 from src.api.schemas.payment import PaymentResponse
+from src.core.database import pool_stats
+from src.core.exceptions import NotFoundError
+from src.core.pagination import Cursor
+from src.modules.admin.stats import get_dashboard_stats, get_series
 from src.modules.ai_models.service import AIModelService
-from src.modules.generation.service import GenerationService
+from src.modules.analytics.repository import AnalyticsRepository
+from src.modules.generation.circuit import circuit_breakers
+from src.modules.generation.downloader import result_downloader
+from src.modules.generation.jobs import generation_queue, queue_enabled
+from src.modules.generation.poller import generation_poller
 from src.modules.payments.repository import PaymentRepository
 from src.modules.user.service import UserService
+from src.shared.enums import BalanceOperationType, GenerationType, PaymentStatus
 from src.shared.logger import logger
 
 router = APIRouter()
@@ -28,54 +52,179 @@ async def get_admin_stats(
     session: SessionDep,
 ) -> AdminStatsResponse:
     """Get admin dashboard statistics."""
-    user_service = UserService(session)
-    generation_service = GenerationService(session)
-    payment_repo = PaymentRepository(session)
-    
-    user_stats = await user_service.get_stats()
-    payment_stats = await payment_repo.get_stats()
-    generation_stats = await generation_service.get_stats()
-    
-    return AdminStatsResponse(
-        users=user_stats,
-        payments=payment_stats,
-        generations=generation_stats,
+    return AdminStatsResponse(**await get_dashboard_stats(session))
+
+
+@router.get("/stats/series", response_model=list[StatsSeriesPoint])
+async def get_stats_series(
+    admin_user: AdminUser,
+    resolution: Literal["hour", "day"] = "hour",
+    periods: int = Query(24, ge=1, le=400),
+) -> list[StatsSeriesPoint]:
+    """
+    Counters per hour or day, oldest first.
+
+    Keys like `generations.success` are totals of the bucket, with
+    `:model:<id>` and `:provider:<name>` suffixed breakdowns.
+    """
+    series = await get_series(resolution, periods)
+    return [StatsSeriesPoint(bucket=bucket, counters=counters) for bucket, counters in series]
+
+
+def _analytics_range(
+    resolution: str,
+    since: datetime | None,
+    until: datetime | None,
+) -> tuple[datetime, datetime]:
+    """Default to the last 48 hours or 30 days."""
+    until = until or datetime.now(UTC)
+    default_span = timedelta(hours=48) if resolution == "hour" else timedelta(days=30)
+    return since or until - default_span, until
+
+
+@router.get("/analytics/generations", response_model=list[GenerationSeriesPoint])
+async def get_generation_analytics(
+    admin_user: AdminUser,
+    session: ReplicaSessionDep,
+    resolution: Literal["hour", "day"] = "day",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    group_by: Literal["model_id", "provider", "generation_type", "status"] | None = None,
+    model_id: int | None = None,
+    provider: str | None = None,
+    generation_type: GenerationType | None = None,
+) -> list[GenerationSeriesPoint]:
+    """Throughput, failure rate and latency over time, from the rollups."""
+    since, until = _analytics_range(resolution, since, until)
+    rows = await AnalyticsRepository(session).get_generation_series(
+        resolution, since, until, group_by, model_id, provider,
+        generation_type.value if generation_type else None,
+    )
+    return [
+        GenerationSeriesPoint(
+            bucket=row.bucket_start,
+            group=str(row.group) if row.group is not None else None,
+            total=row.total,
+            success=row.success,
+            failed=row.failed,
+            failure_rate=row.failed / row.total if row.total else 0.0,
+            tokens_spent=row.tokens_spent,
+            avg_duration=row.success_seconds / row.success if row.success else None,
+        )
+        for row in rows
+    ]
+
+
+@router.get("/analytics/revenue", response_model=list[RevenueSeriesPoint])
+async def get_revenue_analytics(
+    admin_user: AdminUser,
+    session: ReplicaSessionDep,
+    resolution: Literal["hour", "day"] = "day",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    currency: str | None = None,
+) -> list[RevenueSeriesPoint]:
+    """Revenue over time per currency, from the rollups."""
+    since, until = _analytics_range(resolution, since, until)
+    rollups = await AnalyticsRepository(session).get_revenue_series(
+        resolution, since, until, currency
+    )
+    return [
+        RevenueSeriesPoint(
+            bucket=r.bucket_start,
+            currency=r.currency,
+            payments=r.payments,
+            amount=r.amount,
+            tokens=r.tokens,
+        )
+        for r in rollups
+    ]
+
+
+@router.get("/analytics/balance", response_model=list[BalanceSeriesPoint])
+async def get_balance_analytics(
+    admin_user: AdminUser,
+    session: ReplicaSessionDep,
+    resolution: Literal["hour", "day"] = "day",
+    since: datetime | None = None,
+    until: datetime | None = None,
+    operation_type: BalanceOperationType | None = None,
+) -> list[BalanceSeriesPoint]:
+    """Token spend, deposits and refunds over time, from the rollups."""
+    since, until = _analytics_range(resolution, since, until)
+    rollups = await AnalyticsRepository(session).get_balance_series(
+        resolution, since, until, operation_type.value if operation_type else None
+    )
+    return [
+        BalanceSeriesPoint(
+            bucket=r.bucket_start,
+            operation_type=r.operation_type,
+            operations=r.operations,
+            amount=r.amount,
+        )
+        for r in rollups
+    ]
+
+
+def _admin_user_response(row: Row) -> AdminUserResponse:
+    user = row.User
+    return AdminUserResponse(
+        id=user.id,
+        telegram_id=user.telegram_id,
+        username=user.username,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        balance=user.balance,
+        is_admin=user.is_admin,
+        is_banned=user.is_banned,
+        created_at=user.created_at,
+        total_generations=row.total_generations,
+        total_spent=row.total_spent,
+        last_activity_at=row.last_activity_at,
     )
 
 
 @router.get("/users", response_model=AdminUserListResponse)
 async def get_users(
     admin_user: AdminUser,
-    session: SessionDep,
+    session: ReplicaSessionDep,
     offset: int = 0,
     limit: int = 50,
     search: str | None = None,
     is_banned: bool | None = None,
+    sort: AdminUserSort = "created_at",
+    order: Literal["asc", "desc"] = "desc",
 ) -> AdminUserListResponse:
-    """Get all users."""
+    """Get all users with their generation totals."""
     user_service = UserService(session)
-    users, total = await user_service.get_all_users(offset, limit, search, is_banned)
+    rows, total = await user_service.get_admin_users(
+        offset, limit, search, is_banned, sort, descending=order == "desc"
+    )
     
-    from src.modules.generation.repository import GenerationRepository
-    gen_repo = GenerationRepository(session)
+    return AdminUserListResponse(
+        items=[_admin_user_response(row) for row in rows],
+        total=total,
+    )
+
+
+@router.get("/users/{user_id}", response_model=AdminUserResponse)
+async def get_user(
+    user_id: int,
+    admin_user: AdminUser,
+    session: SessionDep,
+) -> AdminUserResponse:
+    """Get user with generation totals."""
+    user_service = UserService(session)
     
-    items = []
-    for user in users:
-        gen_count = await gen_repo.count_user_generations(user.id)
-        items.append(AdminUserResponse(
-            id=user.id,
-            telegram_id=user.telegram_id,
-            username=user.username,
-            first_name=user.first_name,
-            last_name=user.last_name,
-            balance=user.balance,
-            is_admin=user.is_admin,
-            is_banned=user.is_banned,
-            created_at=user.created_at,
-            total_generations=gen_count,
-        ))
+    try:
+        row = await user_service.get_admin_user(user_id)
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
     
-    return AdminUserListResponse(items=items, total=total)
+    return _admin_user_response(row)
 
 
 @router.patch("/users/{user_id}", response_model=AdminUserResponse)
@@ -89,8 +238,8 @@ async def update_user(
     user_service = UserService(session)
     
     try:
-        user = await user_service.get_user(user_id)
-    except Exception:
+        await user_service.get_user(user_id)
+    except NotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
@@ -105,44 +254,48 @@ async def update_user(
     if request.balance is not None:
         await user_service.set_balance(user_id, request.balance, admin_user.id)
     
-    user = await user_service.get_user(user_id)
+    row = await user_service.get_admin_user(user_id)
     
     logger.info(f"Admin updated user | admin_id={admin_user.id}, user_id={user_id}")
     
-    from src.modules.generation.repository import GenerationRepository
-    gen_repo = GenerationRepository(session)
-    gen_count = await gen_repo.count_user_generations(user.id)
-    
-    return AdminUserResponse(
-        id=user.id,
-        telegram_id=user.telegram_id,
-        username=user.username,
-        first_name=user.first_name,
-        last_name=user.last_name,
-        balance=user.balance,
-        is_admin=user.is_admin,
-        is_banned=user.is_banned,
-        created_at=user.created_at,
-        total_generations=gen_count,
-    )
+    return _admin_user_response(row)
 
 
 @router.get("/payments", response_model=AdminPaymentListResponse)
 async def get_all_payments(
     admin_user: AdminUser,
-    session: SessionDep,
+    session: ReplicaSessionDep,
+    cursor: CursorDep,
     offset: int = 0,
     limit: int = 50,
+    status_filter: PaymentStatus | None = Query(default=None, alias="status"),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    approximate: bool = True,
 ) -> AdminPaymentListResponse:
-    """Get all payments."""
+    """
+    Get all payments (by `offset` or after `cursor`).
+
+    With `approximate` (default) the total of a large table filtered at
+    most by status comes from planner statistics instead of a COUNT.
+    """
     repo = PaymentRepository(session)
-    payments = await repo.get_all_payments(offset, limit)
-    all_payments = await repo.get_all_payments(0, 10000)
-    total = len(all_payments)
+    payments = await repo.get_all_payments(
+        offset, limit, status_filter, cursor, created_from, created_to
+    )
+    
+    total = None
+    if approximate and not (created_from or created_to):
+        total = await repo.estimate_payments(status_filter)
+    total_is_estimate = total is not None
+    if total is None:
+        total = await repo.count_payments(None, status_filter, created_from, created_to)
     
     return AdminPaymentListResponse(
         items=[PaymentResponse.model_validate(p) for p in payments],
         total=total,
+        total_is_estimate=total_is_estimate,
+        next_cursor=Cursor.next_page(payments, limit),
     )
 
 
@@ -250,3 +403,67 @@ async def toggle_model(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+
+
+@router.get("/providers/health", response_model=list[ProviderHealthResponse])
+async def get_providers_health(
+    admin_user: AdminUser,
+) -> list[ProviderHealthResponse]:
+    """Get circuit breaker state and health score of providers and models."""
+    return [ProviderHealthResponse(**item) for item in circuit_breakers.snapshot()]
+
+
+@router.get("/database/pools", response_model=list[DatabasePoolResponse])
+async def get_database_pools(
+    admin_user: AdminUser,
+) -> list[DatabasePoolResponse]:
+    """Get connection pool usage and checkout wait times of this process."""
+    return [DatabasePoolResponse(**item) for item in pool_stats()]
+
+
+@router.get("/queue/stats", response_model=QueueStatsResponse)
+async def get_queue_stats(
+    admin_user: AdminUser,
+) -> QueueStatsResponse:
+    """Get ready, delayed, in-flight and dead-lettered job counts of the generation queue."""
+    return QueueStatsResponse(name=generation_queue.name, **await generation_queue.stats())
+
+
+@router.get("/poller/stats", response_model=PollerStatsResponse)
+async def get_poller_stats(
+    admin_user: AdminUser,
+) -> PollerStatsResponse:
+    """
+    Get in-flight provider tasks tracked by the status poller of this process.
+
+    In queue mode workers poll through delayed queue jobs instead, the
+    registry stays empty and `/queue/stats` shows the pending polls.
+    """
+    return PollerStatsResponse(
+        queue_mode=queue_enabled(),
+        providers=[PollerProviderStats(**item) for item in generation_poller.stats()],
+    )
+
+
+@router.get("/downloads/stats", response_model=DownloadStatsResponse)
+async def get_download_stats(
+    admin_user: AdminUser,
+) -> DownloadStatsResponse:
+    """Get result download volume, average rate, resumes and failures of this process."""
+    return DownloadStatsResponse(**result_downloader.stats.snapshot())
+
+
+@router.post("/providers/{key:path}/reset", response_model=MessageResponse)
+async def reset_provider_circuit(
+    key: str,
+    admin_user: AdminUser,
+) -> MessageResponse:
+    """Force-close circuit breaker of a provider or provider model."""
+    if not await circuit_breakers.reset(key):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Circuit not found",
+        )
+
+    logger.info(f"Admin reset provider circuit | admin_id={admin_user.id}, key={key}")
+    return MessageResponse(message="Circuit закрыт")
@@ -3,7 +3,8 @@
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, status
 
-from src.api.dependencies import CurrentUser, SessionDep
+from src.api.dependencies import CurrentUser, CursorDep, SessionDep
+from src.api.etag import conditional
 from src.api.schemas.common import MessageResponse
 from src.api.schemas.gallery import (
     GalleryItemResponse,
@@ -12,7 +13,12 @@ from src.api.schemas.gallery import (
 )
 from src.config import settings
 from src.core.exceptions import NotFoundError
+from src.core.pagination import Cursor
+from src.core.versions import get_version
+from src.modules.ai_models.catalog import model_catalog
+from src.modules.gallery.repository import gallery_version_name
 from src.modules.gallery.service import GalleryService
+from src.modules.user.models import User
 
 router = APIRouter()
 
@@ -40,16 +46,31 @@ def _build_gallery_item_response(item, base_url: str) -> GalleryItemResponse:
     )
 
 
+async def _gallery_version(current_user: User) -> str | None:
+    gallery_version = await get_version(gallery_version_name(current_user.id))
+    if gallery_version is None:
+        return None
+    # Items show model names
+    return f"{current_user.id}:{gallery_version}:{await model_catalog.version()}"
+
+
 @router.get("", response_model=GalleryListResponse)
+@conditional(_gallery_version)
 async def get_gallery(
     current_user: CurrentUser,
     session: SessionDep,
+    cursor: CursorDep,
     offset: int = 0,
     limit: int = 50,
     file_type: str | None = None,
     favorites_only: bool = False,
 ) -> GalleryListResponse:
-    """Get user's gallery."""
+    """
+    Get user's gallery.
+
+    Pass `next_cursor` of a page as `cursor` to get the next one; `offset`
+    is still supported but gets slower on deep pages.
+    """
     service = GalleryService(session)
     
     items, total = await service.get_user_gallery(
@@ -58,6 +79,7 @@ async def get_gallery(
         limit,
         file_type,
         favorites_only,
+        cursor=cursor,
     )
     
     return GalleryListResponse(
@@ -66,6 +88,7 @@ async def get_gallery(
             for item in items
         ],
         total=total,
+        next_cursor=Cursor.next_page(items, limit),
     )
 
 
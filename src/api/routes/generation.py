@@ -1,18 +1,33 @@
 """Generation routes."""
 
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Request, status
 
-from src.api.dependencies import CurrentUser, SessionDep
+from src.api.dependencies import CurrentUser, CursorDep, SessionDep
+from src.api.schemas.common import MessageResponse
 from src.api.schemas.generation import (
+    GenerationBatchCreateRequest,
+    GenerationBatchResponse,
     GenerationCreateRequest,
     GenerationListResponse,
     GenerationResponse,
     GenerationStatusResponse,
 )
 from src.config import settings
-from src.core.exceptions import InsufficientBalanceError, NotFoundError, ValidationError
-from src.modules.generation.service import GenerationService
+from src.core.exceptions import (
+    ExternalAPIError,
+    InsufficientBalanceError,
+    NotFoundError,
+    ProviderUnavailableError,
+    ValidationError,
+)
+from src.core.pagination import Cursor
+from src.modules.generation.callbacks import verify_callback_token
+from src.modules.generation.events import result_file_url, wait_status_change
+from src.modules.generation.jobs import cancel_poll, enqueue_download, queue_enabled
+from src.modules.generation.poller import generation_poller
+from src.modules.generation.service import PROVIDERS, GenerationService
+from src.shared.logger import logger
 from src.shared.enums import GenerationType
 
 router = APIRouter()
@@ -79,6 +94,64 @@ async def create_generation(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=e.message,
         )
+    except ProviderUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+        )
+
+
+@router.post(
+    "/batch",
+    response_model=GenerationBatchResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_generation_batch(
+    request: GenerationBatchCreateRequest,
+    current_user: CurrentUser,
+    session: SessionDep,
+) -> GenerationBatchResponse:
+    """Create several variants of a generation at once."""
+    service = GenerationService(session)
+
+    try:
+        batch_id, generations = await service.create_generation_batch(
+            user_id=current_user.id,
+            model_code=request.model_code,
+            count=request.count,
+            prompt=request.prompt,
+            image_url=request.image_url,
+            video_url=request.video_url,
+            aspect_ratio=request.aspect_ratio,
+            duration=request.duration,
+            extra_params=request.extra_params,
+        )
+
+        return GenerationBatchResponse(
+            batch_id=batch_id,
+            items=[_build_generation_response(g, settings.WEBAPP_URL) for g in generations],
+        )
+
+    except InsufficientBalanceError as e:
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail=e.message,
+        )
+    except NotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=e.message,
+        )
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=e.message,
+        )
+    except ProviderUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+        )
 
 
 @router.get("/{generation_id}", response_model=GenerationResponse)
@@ -113,52 +186,65 @@ async def get_generation_status(
     generation_id: UUID,
     current_user: CurrentUser,
     session: SessionDep,
+    wait: int = Query(0, ge=0, le=60, description="Long-poll: seconds to wait for a change"),
 ) -> GenerationStatusResponse:
-    """Get generation status (for polling)."""
+    """
+    Get generation status (for polling).
+
+    The status is read from the database. With `wait`, the request then
+    blocks until the status advances or the timeout expires; waiting uses
+    Redis only and holds no database connection.
+    """
     service = GenerationService(session)
-    
     try:
         generation = await service.get_generation(generation_id)
-        
-        if generation.user_id != current_user.id:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Generation not found",
-            )
-        
-        result_file_url = None
-        if generation.result_file_path:
-            file_name = generation.result_file_path.split("/")[-1]
-            result_file_url = f"{settings.WEBAPP_URL}/static/generations/{file_name}"
-        
-        return GenerationStatusResponse(
-            id=generation.id,
-            status=generation.status,
-            result_url=generation.result_url,
-            result_file_url=result_file_url,
-            error_message=generation.error_message,
-        )
-        
     except NotFoundError:
+        generation = None
+
+    if not generation or generation.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Generation not found",
         )
 
+    snapshot = {
+        "status": generation.status.value,
+        "result_url": generation.result_url,
+        "result_file_url": result_file_url(generation.result_file_path),
+        "error_message": generation.error_message,
+    }
+
+    if wait and generation.is_pending:
+        # Return the connection to the pool instead of holding it idle in
+        # a transaction for the whole wait
+        await session.commit()
+        changed = await wait_status_change(generation_id, snapshot["status"], timeout=wait)
+        if changed:
+            snapshot = changed
+
+    return GenerationStatusResponse(
+        id=generation_id,
+        status=snapshot["status"],
+        result_url=snapshot.get("result_url"),
+        result_file_url=snapshot.get("result_file_url"),
+        error_message=snapshot.get("error_message"),
+    )
+
 
 @router.get("", response_model=GenerationListResponse)
 async def get_generations(
     current_user: CurrentUser,
     session: SessionDep,
+    cursor: CursorDep,
     offset: int = 0,
     limit: int = 50,
     generation_type: GenerationType | None = None,
 ) -> GenerationListResponse:
-    """Get user's generations."""
+    """Get user's generations (by `offset` or after `cursor`)."""
     service = GenerationService(session)
     
     generations = await service.get_user_generations(
-        current_user.id, offset, limit, generation_type
+        current_user.id, offset, limit, generation_type, cursor=cursor
     )
     
     from src.modules.generation.repository import GenerationRepository
@@ -171,5 +257,65 @@ async def get_generations(
             for g in generations
         ],
         total=total,
+        next_cursor=Cursor.next_page(generations, limit),
     )
 
+
+
+@router.post("/callback/{provider}", response_model=MessageResponse)
+async def provider_callback(
+    provider: str,
+    request: Request,
+    session: SessionDep,
+    generation_id: UUID | None = None,
+    token: str | None = None,
+) -> MessageResponse:
+    """Receive task completion callback from a generation provider."""
+    if provider not in PROVIDERS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Unknown provider",
+        )
+
+    if not verify_callback_token(provider, generation_id, token):
+        logger.warning(f"Callback with invalid token | provider={provider}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid callback token",
+        )
+
+    try:
+        payload = await request.json()
+        task = PROVIDERS[provider].parse_callback(payload)
+    except (ExternalAPIError, NotImplementedError, ValueError, AttributeError) as e:
+        logger.warning(f"Invalid callback payload | provider={provider}, error={e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid callback payload",
+        )
+
+    logger.info(
+        f"Provider callback | provider={provider}, task_id={task.task_id}, status={task.status}"
+    )
+
+    if task.status not in ("success", "failed"):
+        return MessageResponse(message="ignored")
+
+    service = GenerationService(session)
+    resolved = await service.resolve_callback(provider, generation_id, task)
+    if resolved:
+        generation, telegram_id = resolved
+        if queue_enabled():
+            await enqueue_download(generation.id, task, provider, telegram_id)
+            # Only once the download is queued: a failed enqueue leaves the
+            # poll job to pick the result up
+            await cancel_poll(generation.id)
+        else:
+            generation_poller.complete_in_background(
+                generation.id,
+                task,
+                provider_name=provider,
+                telegram_id=telegram_id,
+            )
+
+    return MessageResponse(message="ok")
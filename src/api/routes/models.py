@@ -1,9 +1,13 @@
 """AI Models routes."""
 
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Header, Response
 
 from src.api.dependencies import CurrentUser, SessionDep
+from src.api.etag import json_response, make_etag
 from src.api.schemas.model import AIModelResponse, AIModelsGroupedResponse
+from src.modules.ai_models.catalog import CatalogSnapshot, model_catalog
 from src.modules.ai_models.service import AIModelService
 from src.shared.enums import GenerationType
 
@@ -22,20 +26,29 @@ async def get_models(
     return [AIModelResponse.model_validate(m) for m in models]
 
 
+def _grouped_payload(snapshot: CatalogSnapshot) -> tuple[bytes, str]:
+    grouped = {"image": [], "video": [], "faceswap": []}
+    for model in snapshot.enabled:
+        grouped[model.generation_type.value].append(AIModelResponse.model_validate(model))
+
+    payload = AIModelsGroupedResponse(**grouped).model_dump_json().encode()
+    return payload, make_etag(payload)
+
+
 @router.get("/grouped", response_model=AIModelsGroupedResponse)
 async def get_models_grouped(
     current_user: CurrentUser,
-    session: SessionDep,
-) -> AIModelsGroupedResponse:
-    """Get AI models grouped by type."""
-    service = AIModelService(session)
-    grouped = await service.get_models_grouped()
-    
-    return AIModelsGroupedResponse(
-        image=[AIModelResponse.model_validate(m) for m in grouped["image"]],
-        video=[AIModelResponse.model_validate(m) for m in grouped["video"]],
-        faceswap=[AIModelResponse.model_validate(m) for m in grouped["faceswap"]],
-    )
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """
+    Get AI models grouped by type.
+
+    The payload is serialized once per catalog version; send the ETag back
+    in If-None-Match to get 304 while the catalog is unchanged.
+    """
+    snapshot = await model_catalog.snapshot()
+    payload, etag = snapshot.memoize("grouped", _grouped_payload)
+    return json_response(payload, etag, if_none_match)
 
 
 @router.get("/{model_code}", response_model=AIModelResponse)
@@ -3,7 +3,8 @@
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, status
 
-from src.api.dependencies import CurrentUser, SessionDep
+from src.api.dependencies import CurrentUser, CursorDep, SessionDep
+from src.api.etag import conditional, make_etag
 from src.api.schemas.payment import (
     PaymentCreateRequest,
     PaymentCreateResponse,
@@ -14,13 +15,23 @@ from src.api.schemas.payment import (
     PaymentResponse,
 )
 from src.core.exceptions import PaymentError
+from src.core.pagination import Cursor
 from src.modules.payments.service import PaymentService
 from src.shared.constants import PAYMENT_PACKAGES_USD, PAYMENT_PACKAGES_RUB, PAYMENT_CURRENCY
 from src.shared.enums import PaymentStatus
 
 router = APIRouter()
 
+# Packages are constants: one version per deploy
+PACKAGES_VERSION = make_etag(repr(PAYMENT_PACKAGES_USD), repr(PAYMENT_PACKAGES_RUB))
+
+
+async def _packages_version() -> str:
+    return PACKAGES_VERSION
+
+
 @router.get("/packages", response_model=PaymentPackagesResponse)
+@conditional(_packages_version)
 async def get_payment_packages(currency: str = "USD") -> PaymentPackagesResponse:
     """Get available payment packages (public endpoint)."""
     packages = PAYMENT_PACKAGES_RUB if currency.upper() == "RUB" else PAYMENT_PACKAGES_USD
@@ -120,19 +131,17 @@ async def check_payment(
 async def get_payments(
     current_user: CurrentUser,
     session: SessionDep,
+    cursor: CursorDep,
     offset: int = 0,
     limit: int = 50,
 ) -> PaymentListResponse:
-    """Get user payment history."""
+    """Get user payment history (by `offset` or after `cursor`)."""
     service = PaymentService(session)
-    payments = await service.get_user_payments(current_user.id, offset, limit)
-
-    from src.modules.payments.repository import PaymentRepository
-    repo = PaymentRepository(session)
-    all_payments = await repo.get_user_payments(current_user.id, 0, 1000)
-    total = len(all_payments)
+    payments = await service.get_user_payments(current_user.id, offset, limit, cursor=cursor)
+    total = await service.count_user_payments(current_user.id)
 
     return PaymentListResponse(
         items=[PaymentResponse.model_validate(p) for p in payments],
         total=total,
+        next_cursor=Cursor.next_page(payments, limit),
     )
@@ -2,7 +2,8 @@
 
 from fastapi import APIRouter
 
-from src.api.dependencies import CurrentUser, SessionDep
+from src.api.dependencies import CurrentUser, IntCursorDep, SessionDep
+from src.api.etag import conditional
 from src.api.schemas.user import (
     BalanceHistoryItem,
     BalanceHistoryResponse,
@@ -11,6 +12,8 @@ from src.api.schemas.user import (
     UserResponse,
 )
 from src.bot.loader import bot
+from src.core.pagination import Cursor
+from src.modules.user.models import User
 from src.modules.user.service import UserService
 
 router = APIRouter()
@@ -22,7 +25,12 @@ async def get_me(current_user: CurrentUser) -> UserResponse:
     return current_user
 
 
+async def _balance_version(current_user: User) -> str:
+    return f"{current_user.id}:{current_user.balance}"
+
+
 @router.get("/balance", response_model=UserBalanceResponse)
+@conditional(_balance_version)
 async def get_balance(current_user: CurrentUser) -> UserBalanceResponse:
     """Get current user balance."""
     return UserBalanceResponse(balance=current_user.balance)
@@ -32,14 +40,15 @@ async def get_balance(current_user: CurrentUser) -> UserBalanceResponse:
 async def get_balance_history(
     current_user: CurrentUser,
     session: SessionDep,
+    cursor: IntCursorDep,
     offset: int = 0,
     limit: int = 50,
 ) -> BalanceHistoryResponse:
-    """Get user balance history."""
+    """Get user balance history (by `offset` or after `cursor`)."""
     user_service = UserService(session)
     
     history = await user_service.get_balance_history(
-        current_user.id, offset, limit
+        current_user.id, offset, limit, cursor=cursor
     )
     
     from src.modules.payments.repository import BalanceHistoryRepository
@@ -49,6 +58,7 @@ async def get_balance_history(
     return BalanceHistoryResponse(
         items=[BalanceHistoryItem.model_validate(h) for h in history],
         total=total,
+        next_cursor=Cursor.next_page(history, limit),
     )
 
 
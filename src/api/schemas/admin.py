@@ -1,5 +1,8 @@
 """Admin schemas."""
 
+from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel
 from src.api.schemas.user import UserResponse
 from src.api.schemas.payment import PaymentResponse
@@ -12,11 +15,50 @@ class AdminStatsResponse(BaseModel):
     generations: dict
 
 
+class StatsSeriesPoint(BaseModel):
+    """Counters of one hour or day."""
+    bucket: datetime
+    counters: dict[str, int]
+
+
+class GenerationSeriesPoint(BaseModel):
+    """Completed generations of one bucket (and group)."""
+    bucket: datetime
+    group: str | None = None
+    total: int
+    success: int
+    failed: int
+    failure_rate: float
+    tokens_spent: int
+    avg_duration: float | None = None
+
+
+class RevenueSeriesPoint(BaseModel):
+    """Successful payments of one bucket and currency."""
+    bucket: datetime
+    currency: str
+    payments: int
+    amount: int
+    tokens: int
+
+
+class BalanceSeriesPoint(BaseModel):
+    """Balance operations of one bucket and type."""
+    bucket: datetime
+    operation_type: str
+    operations: int
+    amount: int
+
+
+AdminUserSort = Literal["created_at", "balance", "total_generations", "total_spent", "last_activity_at"]
+
+
 class AdminUserResponse(UserResponse):
     """Admin user response with extra fields."""
     is_banned: bool
     total_generations: int = 0
     total_spent: int = 0
+    last_activity_at: datetime | None = None
 
 
 class AdminUserListResponse(BaseModel):
@@ -35,6 +77,65 @@ class AdminPaymentListResponse(BaseModel):
     """Admin payment list response."""
     items: list[PaymentResponse]
     total: int
+    total_is_estimate: bool = False
+    next_cursor: str | None = None
+
+
+class ProviderHealthResponse(BaseModel):
+    """Circuit breaker state of a provider or provider model."""
+    key: str
+    state: str
+    calls: int
+    error_rate: float
+    p95_latency: float
+    health: float
+    open_for: float | None = None
+
+
+class DatabasePoolResponse(BaseModel):
+    """Connection pool of an engine (interactive, background, replica)."""
+    name: str
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_avg: float
+    wait_max: float
+
+
+class PollerProviderStats(BaseModel):
+    """Provider tasks tracked by the status poller of this process."""
+    provider: str
+    tracked: int
+    in_flight: int
+    oldest_age: float
+
+
+class PollerStatsResponse(BaseModel):
+    """Status poller of this process; unused when workers poll (queue_mode)."""
+    queue_mode: bool
+    providers: list[PollerProviderStats]
+
+
+class QueueStatsResponse(BaseModel):
+    """Job counts of a queue, including dead-lettered jobs."""
+    name: str
+    ready: int
+    delayed: int
+    inflight: int
+    dead: int
+
+
+class DownloadStatsResponse(BaseModel):
+    """Result download counters of this process."""
+    files: int
+    bytes: int
+    seconds: float
+    bytes_per_sec: float
+    resumes: int
+    failures: int
 
 
 class LogEntry(BaseModel):
@@ -25,6 +25,7 @@ class GalleryListResponse(BaseModel):
     """Gallery list response."""
     items: list[GalleryItemResponse]
     total: int
+    next_cursor: str | None = None
 
 
 class GalleryToggleFavoriteResponse(BaseModel):
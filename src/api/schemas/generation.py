@@ -2,7 +2,8 @@
 
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from src.shared.constants import GENERATION_MAX_BATCH_SIZE
 from src.shared.enums import GenerationStatus, GenerationType
 
 
@@ -17,6 +18,11 @@ class GenerationCreateRequest(BaseModel):
     extra_params: dict | None = None
 
 
+class GenerationBatchCreateRequest(GenerationCreateRequest):
+    """Create batch of generation variants request."""
+    count: int = Field(ge=1, le=GENERATION_MAX_BATCH_SIZE)
+
+
 class GenerationResponse(BaseModel):
     """Generation response."""
     id: UUID
@@ -36,10 +42,17 @@ class GenerationResponse(BaseModel):
         from_attributes = True
 
 
+class GenerationBatchResponse(BaseModel):
+    """Batch of generations response."""
+    batch_id: UUID
+    items: list[GenerationResponse]
+
+
 class GenerationListResponse(BaseModel):
     """List of generations response."""
     items: list[GenerationResponse]
     total: int
+    next_cursor: str | None = None
 
 
 class GenerationStatusResponse(BaseModel):
@@ -42,6 +42,7 @@ class PaymentCheckResponse(BaseModel):
 class PaymentResponse(BaseModel):
     id: UUID
     amount: int
+    currency: str
     tokens: int
     status: PaymentStatus
     created_at: datetime
@@ -54,4 +55,5 @@ class PaymentResponse(BaseModel):
 class PaymentListResponse(BaseModel):
     items: list[PaymentResponse]
     total: int
+    next_cursor: str | None = None
 
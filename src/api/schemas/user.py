@@ -41,6 +41,7 @@ class BalanceHistoryResponse(BaseModel):
     """Balance history response."""
     items: list[BalanceHistoryItem]
     total: int
+    next_cursor: str | None = None
 
 
 class ReferralStatsResponse(BaseModel):
@@ -0,0 +1,89 @@
+"""WebSocket handler for generation status updates."""
+
+import asyncio
+
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect
+
+from src.core.database import async_session_maker
+from src.core.security import validate_telegram_webapp_data
+from src.modules.generation.events import latest_event_id, read_status_events
+from src.modules.user.repository import UserRepository
+from src.shared.logger import logger
+
+router = APIRouter()
+
+# Blocking read window; a ping is sent when nothing happened
+READ_BLOCK_MS = 20_000
+
+
+@router.websocket("/ws/generation")
+async def websocket_generation(
+    websocket: WebSocket,
+    init_data: str = Query(...),
+    last_event_id: str | None = Query(None),
+):
+    """
+    Push generation status changes of the current user.
+
+    Each message carries an event `id`. After a reconnect, pass the last
+    received one as `last_event_id` to get the events missed meanwhile.
+    """
+    try:
+        data = validate_telegram_webapp_data(init_data)
+        telegram_id = data["user"]["id"]
+
+        async with async_session_maker() as session:
+            user = await UserRepository(session).get_by_telegram_id(telegram_id)
+
+        if not user or user.is_banned:
+            await websocket.close(code=4003, reason="Access denied")
+            return
+
+        await websocket.accept()
+        logger.debug(f"Generation WebSocket connected | user_id={user.id}")
+
+        cursor = last_event_id or await latest_event_id(user.id)
+        receiver = asyncio.create_task(_drain_client(websocket))
+
+        try:
+            while not receiver.done():
+                reader = asyncio.create_task(
+                    read_status_events(user.id, cursor, block_ms=READ_BLOCK_MS)
+                )
+                done, _ = await asyncio.wait(
+                    {reader, receiver}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if receiver in done:
+                    reader.cancel()
+                    break
+
+                entries = reader.result()
+                if not entries:
+                    await websocket.send_json({"type": "ping"})
+                    continue
+
+                for event_id, fields in entries:
+                    await websocket.send_json({"type": "generation.status", "id": event_id, **fields})
+                    cursor = event_id
+
+        except WebSocketDisconnect:
+            pass
+        finally:
+            receiver.cancel()
+            logger.debug(f"Generation WebSocket disconnected | user_id={user.id}")
+
+    except Exception as e:
+        logger.error(f"Generation WebSocket error | error={e}")
+        try:
+            await websocket.close(code=4000, reason=str(e))
+        except Exception:
+            pass
+
+
+async def _drain_client(websocket: WebSocket) -> None:
+    """Read (and ignore) client messages until it disconnects."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
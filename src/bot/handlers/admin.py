@@ -16,6 +16,7 @@ from src.bot.keyboards.inline import (
     get_broadcast_filter_keyboard,
 )
 from src.bot.loader import bot
+from src.modules.admin.stats import get_dashboard_stats
 from src.modules.payments.repository import PaymentRepository
 from src.modules.user.models import User
 from src.modules.user.repository import UserRepository
@@ -57,11 +58,9 @@ async def callback_admin_stats(
     await callback.answer()
     logger.info(f"Admin stats requested | admin_id={db_user.telegram_id}")
     
-    user_service = UserService(session)
-    payment_repo = PaymentRepository(session)
-    
-    user_stats = await user_service.get_stats()
-    payment_stats = await payment_repo.get_stats()
+    stats = await get_dashboard_stats(session)
+    user_stats = stats["users"]
+    payment_stats = stats["payments"]
     
     text = (
         "📊 <b>Статистика</b>\n\n"
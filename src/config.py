@@ -29,6 +29,24 @@ class Settings(BaseSettings):
         default="postgresql+asyncpg://postgres:password@db:5432/aibot"
     )
     DATABASE_URL_DEV: str = Field(default="sqlite+aiosqlite:///./data/dev.db")
+    DATABASE_REPLICA_URL: str | None = Field(
+        default=None, description="Read replica for admin lists and analytics; primary if unset"
+    )
+
+    # === Database pools ===
+    DB_POOL_SIZE: int = Field(default=10, description="Persistent connections for API requests and bot updates")
+    DB_MAX_OVERFLOW: int = Field(default=20, description="Extra connections opened under bursts")
+    DB_BACKGROUND_POOL_SIZE: int = Field(
+        default=5, description="Persistent connections for pollers, queue jobs and periodic tasks"
+    )
+    DB_BACKGROUND_MAX_OVERFLOW: int = Field(default=5)
+    DB_POOL_TIMEOUT: float = Field(
+        default=30.0, description="Seconds to wait for a free connection before failing"
+    )
+    DB_POOL_RECYCLE: int = Field(
+        default=1800, description="Seconds after which a connection is replaced"
+    )
+    DB_POOL_PRE_PING: bool = Field(default=True, description="Check connections on checkout")
 
     # === Redis ===
     REDIS_URL: str = Field(default="redis://localhost:6379/0")
@@ -41,6 +59,103 @@ class Settings(BaseSettings):
     POYO_API_KEY: SecretStr = Field(default="")
     POYO_API_URL: str = Field(default="https://api.poyo.ai")
 
+    # === Provider rate limits ===
+    PROVIDER_RATE_LIMITS: dict[str, float] = Field(
+        default={"kie.ai": 10.0, "kie.ai:veo": 2.0, "poyo.ai": 5.0},
+        description="Requests per second by provider or provider:endpoint",
+    )
+    PROVIDER_RATE_BURST_SECONDS: float = Field(
+        default=2.0, description="Token bucket size in seconds of the rate"
+    )
+    PROVIDER_MAX_CONCURRENCY: dict[str, int] = Field(
+        default={"kie.ai": 20, "poyo.ai": 10},
+        description="Concurrent requests per provider per process",
+    )
+    PROVIDER_DEFAULT_CONCURRENCY: int = Field(default=10)
+    PROVIDER_USER_MAX_CONCURRENCY: int = Field(
+        default=2, description="Concurrent create requests per user per provider"
+    )
+    PROVIDER_RATE_LIMIT_MAX_WAIT: float = Field(
+        default=30.0, description="Max seconds to wait for a rate limit token"
+    )
+
+    # === Provider circuit breakers ===
+    CIRCUIT_WINDOW_SECONDS: float = Field(default=120.0, description="Outcome window")
+    CIRCUIT_MIN_CALLS: int = Field(default=10, description="Min calls in window to open")
+    CIRCUIT_FAILURE_RATE: float = Field(default=0.5, description="Failure rate that opens circuit")
+    CIRCUIT_COOLDOWN_SECONDS: float = Field(default=60.0, description="Open state duration")
+    CIRCUIT_SLOW_CALL_SECONDS: float = Field(
+        default=20.0, description="p95 latency that halves the health score"
+    )
+    CIRCUIT_OPEN_POLL_INTERVAL: float = Field(
+        default=60.0, description="Min polling interval while circuit is open"
+    )
+
+    # === HTTP clients ===
+    HTTP_TIMEOUT: float = Field(default=60.0, description="Default request timeout, seconds")
+    HTTP_CONNECT_TIMEOUT: float = Field(default=10.0, description="Connect timeout, seconds")
+    HTTP_MAX_CONNECTIONS: int = Field(default=100, description="Max connections per upstream")
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(default=20, description="Idle keep-alive connections per upstream")
+    HTTP_KEEPALIVE_EXPIRY: float = Field(default=30.0, description="Idle connection lifetime, seconds")
+    HTTP2_ENABLED: bool = Field(default=True, description="Use HTTP/2 when the h2 package is installed")
+
+    # === Generation polling ===
+    GENERATION_POLL_TICK: float = Field(default=1.0, description="Poller wakeup period, seconds")
+    GENERATION_POLL_CONCURRENCY: int = Field(
+        default=20, description="Max concurrent provider status requests per process"
+    )
+
+    # === Generation callbacks ===
+    GENERATION_CALLBACK_BASE_URL: str = Field(
+        default="", description="Public base URL for provider callbacks, empty disables them"
+    )
+    GENERATION_CALLBACK_SECRET: SecretStr = Field(
+        default="", description="Callback token secret, SECRET_KEY is used when empty"
+    )
+    GENERATION_CALLBACK_FALLBACK_INTERVAL: float = Field(
+        default=60.0, description="Fallback polling interval while callbacks are enabled"
+    )
+
+    # === Generation worker queue ===
+    GENERATION_QUEUE_ENABLED: bool = Field(
+        default=False, description="Run generation work in separate worker processes"
+    )
+    GENERATION_QUEUE_VISIBILITY_TIMEOUT: float = Field(
+        default=300.0, description="Seconds before an unacknowledged job is redelivered"
+    )
+    GENERATION_WORKER_CONCURRENCY: int = Field(
+        default=10, description="Concurrent jobs per worker process"
+    )
+
+    # === Generation downloads ===
+    GENERATION_DOWNLOAD_MAX_SIZE_MB: int = Field(
+        default=500, description="Max size of a downloaded generation result"
+    )
+    GENERATION_DOWNLOAD_ATTEMPTS: int = Field(
+        default=3, description="Download attempts, interrupted transfers resume with Range"
+    )
+
+    # === Auth cache ===
+    AUTH_CACHE_TTL: int = Field(
+        default=60, description="Seconds an authenticated user is served from cache"
+    )
+    AUTH_CACHE_MAX_SIZE: int = Field(
+        default=10000, description="Cached users per process"
+    )
+
+    # === Admin stats ===
+    STATS_RECONCILE_INTERVAL: int = Field(
+        default=3600, description="Seconds between recomputing dashboard totals from the database"
+    )
+
+    # === Analytics rollups ===
+    ANALYTICS_ROLLUP_INTERVAL: int = Field(
+        default=300, description="Seconds between rollup runs"
+    )
+    ANALYTICS_ROLLUP_LAG: int = Field(
+        default=300, description="Rows newer than this are left to the next run, so late commits are not skipped"
+    )
+
     # === Lava.top ===
     LAVA_API_KEY: SecretStr = Field(default="", description="Lava.top API key")
     LAVA_API_URL: str = Field(default="https://gate.lava.top", description="Lava.top API base URL")
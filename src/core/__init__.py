@@ -1,6 +1,13 @@
 """Core infrastructure."""
 
-from src.core.database import Base, async_session_maker, get_session, get_session_context
+from src.core.database import (
+    Base,
+    async_session_maker,
+    background_session_maker,
+    get_session,
+    get_session_context,
+    replica_session_maker,
+)
 from src.core.exceptions import (
     AppException,
     AuthenticationError,
@@ -18,6 +25,8 @@ from src.core.security import generate_file_hash, generate_short_id, validate_te
 __all__ = [
     "Base",
     "async_session_maker",
+    "background_session_maker",
+    "replica_session_maker",
     "get_session",
     "get_session_context",
     "get_redis",
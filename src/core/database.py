@@ -1,15 +1,18 @@
 """Database configuration and session management."""
 
+import time
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
-from sqlalchemy import event, text
+from sqlalchemy import event, exc, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.config import settings
 from src.shared.logger import logger
@@ -17,41 +20,134 @@ from src.shared.logger import logger
 
 class Base(DeclarativeBase):
     """Base class for all models."""
-    pass
-
-
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    **(
-        {}
-        if settings.is_sqlite
-        else {
-            "pool_size": 10,
-            "max_overflow": 20,
-        }
-    ),
-)
 
-# Session factory
-async_session_maker = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
+    # Server-generated columns (created_at, updated_at) come back in the
+    # RETURNING of the flush's INSERT/UPDATE, no refresh needed
+    __mapper_args__ = {"eager_defaults": True}
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+
+def _create_engine(url: str, pool_size: int, max_overflow: int) -> AsyncEngine:
+    created = create_async_engine(
+        url,
+        echo=False,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        **(
+            {}
+            if settings.is_sqlite
+            else {
+                "poolclass": InstrumentedPool,
+                "pool_size": pool_size,
+                "max_overflow": max_overflow,
+                "pool_timeout": settings.DB_POOL_TIMEOUT,
+                "pool_recycle": settings.DB_POOL_RECYCLE,
+            }
+        ),
+    )
+
+    # Enable foreign keys for SQLite
+    if settings.is_sqlite:
+        @event.listens_for(created.sync_engine, "connect")
+        def set_sqlite_pragma(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA foreign_keys=ON")
+            cursor.close()
+
+    return created
+
+
+# Interactive traffic: API requests and bot updates
+engine = _create_engine(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+
+# Pollers, queue jobs and periodic tasks get their own pool, so a burst of
+# them waits for its own connections instead of starving user requests.
+# SQLite has a single writer, a second engine would only add lock errors
+background_engine = (
+    engine
+    if settings.is_sqlite
+    else _create_engine(
+        settings.DATABASE_URL,
+        settings.DB_BACKGROUND_POOL_SIZE,
+        settings.DB_BACKGROUND_MAX_OVERFLOW,
+    )
 )
 
+# Read-only queries that tolerate replication lag
+replica_engine = (
+    _create_engine(settings.DATABASE_REPLICA_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+    if settings.DATABASE_REPLICA_URL
+    else engine
+)
 
-# Enable foreign keys for SQLite
-if settings.is_sqlite:
-    @event.listens_for(engine.sync_engine, "connect")
-    def set_sqlite_pragma(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("PRAGMA foreign_keys=ON")
-        cursor.close()
+ENGINES = {
+    "interactive": engine,
+    "background": background_engine,
+    "replica": replica_engine,
+}
+
+
+def _session_maker(bind: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# Session factories
+async_session_maker = _session_maker(engine)
+background_session_maker = _session_maker(background_engine)
+replica_session_maker = _session_maker(replica_engine)
+
+
+def pool_stats() -> list[dict]:
+    """Connection pool state of each engine; shared engines are listed once."""
+    stats = []
+    seen = set()
+    for name, item in ENGINES.items():
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+
+        pool = item.pool
+        checkouts = getattr(pool, "checkouts", 0)
+        stats.append({
+            "name": name,
+            "size": pool.size() if hasattr(pool, "size") else 0,
+            "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else 0,
+            "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else 0,
+            "overflow": max(pool.overflow(), 0) if hasattr(pool, "overflow") else 0,
+            "checkouts": checkouts,
+            "timeouts": getattr(pool, "timeouts", 0),
+            "wait_avg": round(getattr(pool, "wait_total", 0.0) / checkouts, 4) if checkouts else 0.0,
+            "wait_max": round(getattr(pool, "wait_max", 0.0), 4),
+        })
+    return stats
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
@@ -103,6 +199,7 @@ async def check_db_connection() -> bool:
 
 
 async def close_db() -> None:
-    """Close database connection."""
-    await engine.dispose()
+    """Close database connections of all engines."""
+    for item in {id(item): item for item in ENGINES.values()}.values():
+        await item.dispose()
     logger.info("Database connection closed")
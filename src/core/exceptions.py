@@ -63,6 +63,16 @@ class ExternalAPIError(AppException):
         self.status_code = status_code
 
 
+class ProviderUnavailableError(AppException):
+    """Generation provider is temporarily unavailable."""
+
+    def __init__(self, model_name: str):
+        super().__init__(
+            message=f"Модель {model_name} временно недоступна, попробуйте позже",
+            code="PROVIDER_UNAVAILABLE",
+        )
+
+
 class PaymentError(AppException):
     """Payment processing error."""
 
@@ -0,0 +1,61 @@
+"""Side effects deferred until a database session commits."""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from typing import Any, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+T = TypeVar("T")
+
+_HOOKS_KEY = "on_commit_hooks"
+_tasks: set[asyncio.Task] = set()
+
+
+def _no_state() -> None:
+    return None
+
+
+def on_commit(
+    session: Session,
+    key: str,
+    coro_factory: Callable[[T], Coroutine[Any, Any, None]],
+    state: Callable[[], T] = _no_state,
+) -> T:
+    """
+    Run `coro_factory(state)` in a background task once `session` commits.
+
+    The hook is registered once per `key` and session: callers collect
+    what it should act on in the returned state, created by `state` on
+    the first call. A rollback drops the hook along with its state.
+    """
+    hooks = session.info.setdefault(_HOOKS_KEY, {})
+    if key not in hooks:
+        hooks[key] = (coro_factory, state())
+    return hooks[key][1]
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session: Session) -> None:
+    hooks = session.info.pop(_HOOKS_KEY, None)
+    if not hooks:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    for coro_factory, state in hooks.values():
+        coro = coro_factory(state)
+        if loop is None:
+            coro.close()
+            continue
+        task = loop.create_task(coro)
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_rollback(session: Session) -> None:
+    session.info.pop(_HOOKS_KEY, None)
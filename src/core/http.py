@@ -0,0 +1,90 @@
+"""Shared pooled HTTP clients."""
+
+import importlib.util
+
+import httpx
+
+from src.config import settings
+from src.shared.logger import logger
+
+# Per-client overrides on top of the pool settings
+CLIENT_PROFILES: dict[str, dict] = {
+    "kie.ai": {"timeout": 60.0},
+    "poyo.ai": {"timeout": 60.0},
+    "lava.top": {"timeout": 30.0},
+    "downloads": {"timeout": 120.0, "follow_redirects": True},
+}
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package."""
+    return importlib.util.find_spec("h2") is not None
+
+
+class HttpClientRegistry:
+    """Long-lived httpx clients with keep-alive pools, one per upstream."""
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _build(self, name: str) -> httpx.AsyncClient:
+        profile = CLIENT_PROFILES.get(name, {})
+        http2 = settings.HTTP2_ENABLED and _http2_available()
+
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                profile.get("timeout", settings.HTTP_TIMEOUT),
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            http2=http2,
+            follow_redirects=profile.get("follow_redirects", False),
+        )
+        logger.debug(f"HTTP client created | name={name}, http2={http2}")
+        return client
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        """Get shared client, creating it on first use."""
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._build(name)
+            self._clients[name] = client
+        return client
+
+    def init(self) -> None:
+        """Create clients for all known upstreams."""
+        for name in CLIENT_PROFILES:
+            self.get(name)
+        logger.info(f"HTTP clients initialized | names={list(self._clients)}")
+
+    async def close(self) -> None:
+        """Close all clients and their connection pools."""
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Failed to close HTTP client | name={name}, error={e}")
+        self._clients.clear()
+        logger.info("HTTP clients closed")
+
+
+http_clients = HttpClientRegistry()
+
+
+def get_http_client(name: str) -> httpx.AsyncClient:
+    """Get shared HTTP client for an upstream."""
+    return http_clients.get(name)
+
+
+def init_http_clients() -> None:
+    """Create shared HTTP clients."""
+    http_clients.init()
+
+
+async def close_http_clients() -> None:
+    """Close shared HTTP clients."""
+    await http_clients.close()
@@ -0,0 +1,77 @@
+"""Keyset (cursor) pagination over (created_at, id)."""
+
+import base64
+import json
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, literal, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.core.exceptions import ValidationError
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Position after the last row of a page, newest first."""
+    created_at: datetime
+    id: Any
+
+    def encode(self) -> str:
+        row_id = self.id if isinstance(self.id, int) else str(self.id)
+        raw = json.dumps([self.created_at.isoformat(), row_id])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str, id_type: type = uuid.UUID) -> "Cursor":
+        """Parse an opaque cursor from a client, for a list with `id_type` IDs."""
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+            if not isinstance(row_id, int):
+                row_id = uuid.UUID(row_id)
+            # E.g. a balance history cursor sent to the generation list
+            if type(row_id) is not id_type:
+                raise TypeError(f"Expected {id_type.__name__} ID")
+            return cls(created_at=datetime.fromisoformat(created_at), id=row_id)
+        except Exception:
+            raise ValidationError("Некорректный курсор", field="cursor")
+
+    @classmethod
+    def decode_optional(cls, value: str | None, id_type: type = uuid.UUID) -> "Cursor | None":
+        return cls.decode(value, id_type) if value else None
+
+    @classmethod
+    def next_page(cls, rows: list, limit: int) -> str | None:
+        """Cursor of the page after `rows`, None on the last page."""
+        if not rows or len(rows) < limit:
+            return None
+        last = rows[-1]
+        return cls(created_at=last.created_at, id=last.id).encode()
+
+
+def paginate(
+    query: Select,
+    created_at: InstrumentedAttribute,
+    row_id: InstrumentedAttribute,
+    limit: int,
+    offset: int = 0,
+    cursor: Cursor | None = None,
+) -> Select:
+    """
+    Order newest first and select one page.
+
+    With a cursor the page starts right after it (keyset), so deep pages
+    cost the same as the first one; otherwise `offset` is used.
+    """
+    if cursor is not None:
+        query = query.where(
+            tuple_(created_at, row_id)
+            < tuple_(literal(cursor.created_at, created_at.type), literal(cursor.id, row_id.type))
+        )
+    elif offset:
+        query = query.offset(offset)
+
+    return query.order_by(created_at.desc(), row_id.desc()).limit(limit)
@@ -0,0 +1,255 @@
+"""Durable Redis-backed job queue."""
+
+import json
+import uuid
+from dataclasses import dataclass, field
+
+from src.core.redis import get_redis
+from src.shared.logger import logger
+
+# Move due delayed and expired in-flight jobs to the ready list, then claim one.
+# Claiming adds the job to the in-flight set with a visibility deadline.
+_DEQUEUE_SCRIPT = """
+local ready, inflight, delayed, jobs, deliveries = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local visibility = tonumber(ARGV[1])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', delayed, '-inf', now, 'LIMIT', 0, 100)) do
+    redis.call('ZREM', delayed, id)
+    redis.call('LPUSH', ready, id)
+end
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', inflight, '-inf', now, 'LIMIT', 0, 100)) do
+    redis.call('ZREM', inflight, id)
+    redis.call('RPUSH', ready, id)
+end
+
+while true do
+    local id = redis.call('RPOP', ready)
+    if not id then
+        return false
+    end
+    local body = redis.call('HGET', jobs, id)
+    if body then
+        redis.call('ZADD', inflight, now + visibility, id)
+        local attempt = redis.call('HINCRBY', deliveries, id, 1)
+        return {id, body, attempt}
+    end
+end
+"""
+
+# Add job unless a job with the same ID is already queued
+_ENQUEUE_SCRIPT = """
+local ready, delayed, jobs = KEYS[1], KEYS[2], KEYS[3]
+local id, body, delay = ARGV[1], ARGV[2], tonumber(ARGV[3])
+if redis.call('HSETNX', jobs, id, body) == 0 then
+    return 0
+end
+if delay > 0 then
+    local t = redis.call('TIME')
+    redis.call('ZADD', delayed, tonumber(t[1]) + delay, id)
+else
+    redis.call('LPUSH', ready, id)
+end
+return 1
+"""
+
+# Move an in-flight job back to the delayed set, unless it was cancelled meanwhile
+_RESCHEDULE_SCRIPT = """
+local inflight, delayed, jobs, deliveries = KEYS[1], KEYS[2], KEYS[3], KEYS[4]
+local id, body, delay, reset = ARGV[1], ARGV[2], tonumber(ARGV[3]), ARGV[4]
+redis.call('ZREM', inflight, id)
+if redis.call('HEXISTS', jobs, id) == 0 then
+    return 0
+end
+local t = redis.call('TIME')
+redis.call('HSET', jobs, id, body)
+redis.call('ZADD', delayed, tonumber(t[1]) + delay, id)
+if reset == '1' then
+    redis.call('HDEL', deliveries, id)
+end
+return 1
+"""
+
+
+@dataclass
+class Job:
+    """Queued unit of work."""
+    kind: str
+    payload: dict
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    max_attempts: int = 5
+    attempt: int = 0
+
+    @property
+    def exhausted(self) -> bool:
+        """Delivered more often than allowed, e.g. redelivered after a crash."""
+        return self.attempt > self.max_attempts
+
+    def dumps(self) -> str:
+        return json.dumps(
+            {"kind": self.kind, "payload": self.payload, "max_attempts": self.max_attempts},
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def loads(cls, job_id: str, body: str, attempt: int = 0) -> "Job":
+        data = json.loads(body)
+        return cls(
+            id=job_id,
+            kind=data["kind"],
+            payload=data["payload"],
+            max_attempts=data.get("max_attempts", 5),
+            attempt=attempt,
+        )
+
+
+class JobQueue:
+    """
+    Reliable queue with acknowledgements.
+
+    A dequeued job stays in the in-flight set until it is acknowledged.
+    If the worker dies, the job becomes visible again once its visibility
+    timeout expires. Failed jobs are retried with backoff and moved to
+    the dead-letter hash after `max_attempts` deliveries. A job redelivered
+    more often than that (worker crashes, shutdown) is `exhausted` and
+    must be dead-lettered by the consumer instead of run.
+    """
+
+    def __init__(self, name: str, visibility_timeout: float = 300.0, retry_delay: float = 5.0):
+        self.name = name
+        self.visibility_timeout = visibility_timeout
+        self.retry_delay = retry_delay
+        self.ready_key = f"queue:{name}:ready"
+        self.inflight_key = f"queue:{name}:inflight"
+        self.delayed_key = f"queue:{name}:delayed"
+        self.jobs_key = f"queue:{name}:jobs"
+        self.deliveries_key = f"queue:{name}:deliveries"
+        self.dead_key = f"queue:{name}:dead"
+
+    async def enqueue(self, job: Job, delay: float = 0.0) -> bool:
+        """Add job. Returns False if a job with the same ID is already queued."""
+        client = await get_redis()
+        added = await client.eval(
+            _ENQUEUE_SCRIPT,
+            3,
+            self.ready_key,
+            self.delayed_key,
+            self.jobs_key,
+            job.id,
+            job.dumps(),
+            delay,
+        )
+        if added:
+            logger.debug(f"Job enqueued | queue={self.name}, kind={job.kind}, id={job.id}")
+        return bool(added)
+
+    async def dequeue(self) -> Job | None:
+        """Claim the next ready job, None if the queue is empty."""
+        client = await get_redis()
+        result = await client.eval(
+            _DEQUEUE_SCRIPT,
+            5,
+            self.ready_key,
+            self.inflight_key,
+            self.delayed_key,
+            self.jobs_key,
+            self.deliveries_key,
+            self.visibility_timeout,
+        )
+        if not result:
+            return None
+        job_id, body, attempt = result
+        return Job.loads(job_id, body, attempt=int(attempt))
+
+    async def ack(self, job: Job) -> None:
+        """Mark job as done."""
+        client = await get_redis()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.inflight_key, job.id)
+            pipe.hdel(self.jobs_key, job.id)
+            pipe.hdel(self.deliveries_key, job.id)
+            await pipe.execute()
+
+    async def extend(self, job: Job, seconds: float | None = None) -> None:
+        """Push back the visibility deadline of a running job."""
+        client = await get_redis()
+        now = await client.time()
+        deadline = now[0] + now[1] / 1_000_000 + (seconds or self.visibility_timeout)
+        await client.zadd(self.inflight_key, {job.id: deadline}, xx=True)
+
+    async def reschedule(self, job: Job, delay: float) -> bool:
+        """
+        Run the job again after `delay` seconds, e.g. the next step of a poll.
+
+        Delivery count is reset, so rescheduling is not treated as a failure.
+        """
+        return await self._delay(job, delay, reset=True)
+
+    async def retry(self, job: Job, error: str) -> None:
+        """Handle a failed delivery: retry with backoff or dead-letter."""
+        if job.attempt >= job.max_attempts:
+            await self.dead_letter(job, error)
+            return
+
+        delay = self.retry_delay * 2 ** (job.attempt - 1)
+        await self._delay(job, delay, reset=False)
+        logger.warning(
+            f"Job retry scheduled | queue={self.name}, kind={job.kind}, id={job.id}, "
+            f"attempt={job.attempt}, delay={delay:.0f}s, error={error}"
+        )
+
+    async def dead_letter(self, job: Job, error: str) -> None:
+        """Remove the job from the queue and keep it in the dead-letter hash."""
+        client = await get_redis()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.zrem(self.inflight_key, job.id)
+            pipe.hdel(self.jobs_key, job.id)
+            pipe.hdel(self.deliveries_key, job.id)
+            pipe.hset(self.dead_key, job.id, json.dumps(
+                {"kind": job.kind, "payload": job.payload, "error": error},
+                ensure_ascii=False,
+            ))
+            await pipe.execute()
+        logger.error(
+            f"Job dead-lettered | queue={self.name}, kind={job.kind}, "
+            f"id={job.id}, attempts={job.attempt}, error={error}"
+        )
+
+    async def cancel(self, job_id: str) -> bool:
+        """Remove a queued job. Returns True if it existed."""
+        client = await get_redis()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hdel(self.jobs_key, job_id)
+            pipe.zrem(self.delayed_key, job_id)
+            pipe.zrem(self.inflight_key, job_id)
+            pipe.lrem(self.ready_key, 0, job_id)
+            pipe.hdel(self.deliveries_key, job_id)
+            removed, *_ = await pipe.execute()
+        return bool(removed)
+
+    async def stats(self) -> dict:
+        """Queue sizes."""
+        client = await get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.llen(self.ready_key)
+            pipe.zcard(self.delayed_key)
+            pipe.zcard(self.inflight_key)
+            pipe.hlen(self.dead_key)
+            ready, delayed, inflight, dead = await pipe.execute()
+        return {"ready": ready, "delayed": delayed, "inflight": inflight, "dead": dead}
+
+    async def _delay(self, job: Job, delay: float, reset: bool) -> bool:
+        client = await get_redis()
+        return bool(await client.eval(
+            _RESCHEDULE_SCRIPT,
+            4,
+            self.inflight_key,
+            self.delayed_key,
+            self.jobs_key,
+            self.deliveries_key,
+            job.id,
+            job.dumps(),
+            delay,
+            "1" if reset else "0",
+        ))
@@ -69,6 +69,11 @@ class RedisCache:
         client = await get_redis()
         await client.delete(self._key(key))
 
+    async def incr(self, key: str) -> int:
+        """Increment counter in cache."""
+        client = await get_redis()
+        return await client.incr(self._key(key))
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
         client = await get_redis()
@@ -7,50 +7,126 @@ import time
 from urllib.parse import parse_qsl, unquote
 
 from src.config import settings
+from src.core.cache import LocalCache
 from src.core.exceptions import AuthenticationError
 from src.shared.logger import logger
 
-import time as _time
+# initData is accepted for 24 hours after auth_date
+INIT_DATA_MAX_AGE = 86400
+# Verified initData kept per process
+INIT_DATA_CACHE_SIZE = 10000
+
+
+class WebAppAuthValidator:
+    """
+    Telegram WebApp authentication with keys derived once.
+
+    HMAC keys are derived from the bot token at construction and copied
+    per call. Successfully verified initData is remembered by digest until
+    it expires, so repeated requests skip parsing and verification.
+    """
+
+    def __init__(
+        self,
+        bot_token: str,
+        max_age: int = INIT_DATA_MAX_AGE,
+        cache_size: int = INIT_DATA_CACHE_SIZE,
+    ):
+        secret_key = hmac.new(b"WebAppData", bot_token.encode(), hashlib.sha256).digest()
+        self._init_data_mac = hmac.new(secret_key, digestmod=hashlib.sha256)
+        self._token_mac = hmac.new(bot_token.encode(), digestmod=hashlib.sha256)
+        self.max_age = max_age
+        self._verified = LocalCache(cache_size, ttl=max_age)
+
+    def _token_signature(self, payload: str) -> str:
+        mac = self._token_mac.copy()
+        mac.update(payload.encode())
+        return mac.hexdigest()[:32]
+
+    def generate_token(self, telegram_id: int) -> str:
+        """Generate HMAC token for webapp auth without initData."""
+        timestamp = int(time.time())
+        return f"{timestamp}:{self._token_signature(f'{telegram_id}:{timestamp}')}"
+
+    def validate_token(self, telegram_id: int, token: str) -> bool:
+        """Validate webapp token. Returns True if valid."""
+        try:
+            timestamp, received_signature = token.split(":")
+            expected_signature = self._token_signature(f"{telegram_id}:{int(timestamp)}")
+            return hmac.compare_digest(received_signature, expected_signature)
+        except Exception:
+            return False
+
+    def validate_init_data(self, init_data: str) -> dict:
+        """Validate init data and return user info. See validate_telegram_webapp_data."""
+        digest = hashlib.sha256(init_data.encode()).digest()
+        cached = self._verified.get(digest)
+        if cached is not None:
+            return cached
+
+        try:
+            parsed_data = dict(parse_qsl(init_data, keep_blank_values=True))
+
+            received_hash = parsed_data.pop("hash", None)
+            if not received_hash:
+                raise AuthenticationError("Missing hash in init data")
+
+            # Check auth_date (optional, but recommended)
+            now = int(time.time())
+            auth_date = parsed_data.get("auth_date")
+            expires_in = self.max_age
+            if auth_date:
+                expires_in = int(auth_date) + self.max_age - now
+                if expires_in < 0:
+                    raise AuthenticationError("Init data expired")
+
+            data_check_string = "\n".join(
+                f"{k}={v}" for k, v in sorted(parsed_data.items())
+            )
+            mac = self._init_data_mac.copy()
+            mac.update(data_check_string.encode())
+
+            if not hmac.compare_digest(mac.hexdigest(), received_hash):
+                raise AuthenticationError("Invalid hash")
+
+            user_data_raw = parsed_data.get("user")
+            if not user_data_raw:
+                raise AuthenticationError("Missing user data")
+
+            user_data = json.loads(unquote(user_data_raw))
+
+            logger.debug(f"WebApp auth success | user_id={user_data.get('id')}")
+
+            result = {
+                "user": user_data,
+                "auth_date": auth_date,
+                "query_id": parsed_data.get("query_id"),
+                "chat_type": parsed_data.get("chat_type"),
+                "chat_instance": parsed_data.get("chat_instance"),
+            }
+
+        except AuthenticationError:
+            raise
+        except Exception as e:
+            logger.error(f"WebApp auth failed | error={e}")
+            raise AuthenticationError(f"Failed to validate init data: {e}")
+
+        # Cached entry expires together with the init data
+        self._verified.set(digest, result, ttl=expires_in)
+        return result
+
+
+webapp_validator = WebAppAuthValidator(settings.BOT_TOKEN.get_secret_value())
 
 
 def generate_webapp_token(telegram_id: int) -> str:
     """Generate HMAC token for webapp auth without initData."""
-    timestamp = int(_time.time())
-    payload = f"{telegram_id}:{timestamp}"
-    bot_token = settings.BOT_TOKEN.get_secret_value()
-    
-    signature = hmac.new(
-        bot_token.encode(),
-        payload.encode(),
-        hashlib.sha256,
-    ).hexdigest()[:32]
-    
-    return f"{timestamp}:{signature}"
+    return webapp_validator.generate_token(telegram_id)
 
 
 def validate_webapp_token(telegram_id: int, token: str) -> bool:
     """Validate webapp token. Returns True if valid."""
-    try:
-        parts = token.split(":")
-        if len(parts) != 2:
-            return False
-        
-        timestamp = int(parts[0])
-        received_signature = parts[1]
-        
-        payload = f"{telegram_id}:{timestamp}"
-        bot_token = settings.BOT_TOKEN.get_secret_value()
-        
-        expected_signature = hmac.new(
-            bot_token.encode(),
-            payload.encode(),
-            hashlib.sha256,
-        ).hexdigest()[:32]
-        
-        return hmac.compare_digest(received_signature, expected_signature)
-        
-    except Exception:
-        return False
+    return webapp_validator.validate_token(telegram_id, token)
 
 
 def validate_telegram_webapp_data(init_data: str) -> dict:
@@ -66,71 +142,7 @@ def validate_telegram_webapp_data(init_data: str) -> dict:
     Raises:
         AuthenticationError: If validation fails
     """
-    try:
-        # Parse init data
-        parsed_data = dict(parse_qsl(init_data, keep_blank_values=True))
-        
-        # Extract hash
-        received_hash = parsed_data.pop("hash", None)
-        if not received_hash:
-            raise AuthenticationError("Missing hash in init data")
-        
-        # Check auth_date (optional, but recommended)
-        auth_date = parsed_data.get("auth_date")
-        if auth_date:
-            auth_timestamp = int(auth_date)
-            current_timestamp = int(time.time())
-            # Allow 24 hours window
-            if current_timestamp - auth_timestamp > 86400:
-                raise AuthenticationError("Init data expired")
-        
-        # Build data check string
-        data_check_arr = sorted(
-            [f"{k}={v}" for k, v in parsed_data.items()]
-        )
-        data_check_string = "\n".join(data_check_arr)
-        
-        # Calculate secret key
-        bot_token = settings.BOT_TOKEN.get_secret_value()
-        secret_key = hmac.new(
-            b"WebAppData",
-            bot_token.encode(),
-            hashlib.sha256,
-        ).digest()
-        
-        # Calculate hash
-        calculated_hash = hmac.new(
-            secret_key,
-            data_check_string.encode(),
-            hashlib.sha256,
-        ).hexdigest()
-        
-        # Validate hash
-        if not hmac.compare_digest(calculated_hash, received_hash):
-            raise AuthenticationError("Invalid hash")
-        
-        # Parse user data
-        user_data_raw = parsed_data.get("user")
-        if not user_data_raw:
-            raise AuthenticationError("Missing user data")
-        
-        user_data = json.loads(unquote(user_data_raw))
-        
-        logger.debug(f"WebApp auth success | user_id={user_data.get('id')}")
-        
-        return {
-            "user": user_data,
-            "auth_date": auth_date,
-            "query_id": parsed_data.get("query_id"),
-            "chat_type": parsed_data.get("chat_type"),
-            "chat_instance": parsed_data.get("chat_instance"),
-        }
-        
-    except AuthenticationError:
-        raise
-    except Exception as e:
-        logger.error(f"WebApp auth failed | error={e}")
-        raise AuthenticationError(f"Failed to validate init data: {e}")
+    return webapp_validator.validate_init_data(init_data)
 
 
 def generate_file_hash(content: bytes) -> str:
@@ -0,0 +1,49 @@
+"""Version stamps of mutable data, for conditional requests."""
+
+import uuid
+
+from sqlalchemy.orm import Session
+
+from src.core.hooks import on_commit
+from src.core.redis import get_redis
+from src.shared.logger import logger
+
+# Unused stamps expire; a new random one is issued on the next read
+VERSION_TTL = 7 * 24 * 60 * 60
+
+_PENDING_KEY = "version_bumps"
+
+
+def _key(name: str) -> str:
+    return f"version:{name}"
+
+
+async def get_version(name: str) -> str | None:
+    """Current stamp of `name`, None if Redis is unavailable."""
+    try:
+        client = await get_redis()
+        stamp = await client.get(_key(name))
+        if stamp is None:
+            await client.set(_key(name), uuid.uuid4().hex, ex=VERSION_TTL, nx=True)
+            stamp = await client.get(_key(name))
+        return stamp
+    except Exception as e:
+        logger.warning(f"Version lookup failed | name={name}, error={e}")
+        return None
+
+
+async def bump_versions(names: set[str]) -> None:
+    """Issue new stamps. Random, so an expired stamp can never come back."""
+    try:
+        client = await get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.set(_key(name), uuid.uuid4().hex, ex=VERSION_TTL)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Version bump failed | names={names}, error={e}")
+
+
+def bump_version_on_commit(session: Session, name: str) -> None:
+    """Bump the stamp of `name` once the session commits its change."""
+    on_commit(session, _PENDING_KEY, bump_versions, set).add(name)
@@ -17,6 +17,7 @@ from src.bot.middlewares import (
 )
 from src.config import settings
 from src.core.database import async_session_maker, check_db_connection, close_db, init_db
+from src.core.http import close_http_clients
 from src.core.redis import check_redis_connection, close_redis
 from src.modules.ai_models.service import seed_default_models
 from src.shared.logger import enable_telegram_logging, logger
@@ -92,6 +93,7 @@ async def on_shutdown() -> None:
     """Application shutdown tasks."""
     logger.info("Shutting down...")
     
+    await close_http_clients()
     await close_db()
     await close_redis()
     await bot.session.close()
@@ -0,0 +1,240 @@
+"""
+Admin statistics maintained incrementally.
+
+Repositories record counter deltas on the state transitions they perform
+(`track_on_commit`). Once the session commits, the deltas are added to a
+Redis hash of totals and to hourly/daily series buckets, so the dashboard
+reads a few hashes instead of aggregating whole tables. A periodic
+reconciliation recomputes the totals from the database to correct drift
+(lost increments, Redis restarts).
+"""
+
+import asyncio
+from collections import Counter
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.database import background_session_maker
+from src.core.hooks import on_commit
+from src.core.redis import get_redis
+from src.shared.logger import logger
+
+TOTALS_KEY = "stats:totals"
+RECONCILE_LOCK_KEY = "stats:reconcile"
+
+# Series buckets: strftime format, bucket length, retention
+RESOLUTIONS = {
+    "hour": ("%Y%m%d%H", timedelta(hours=1), 8 * 24 * 60 * 60),
+    "day": ("%Y%m%d", timedelta(days=1), 400 * 24 * 60 * 60),
+}
+
+_PENDING_KEY = "stats_deltas"
+
+
+def _series_key(resolution: str, bucket: datetime) -> str:
+    return f"stats:{resolution}:{bucket.strftime(RESOLUTIONS[resolution][0])}"
+
+
+def track_on_commit(
+    session: Session,
+    totals: dict[str, int] | None = None,
+    events: dict[str, int] | None = None,
+    model_id: int | None = None,
+    provider: str | None = None,
+) -> None:
+    """
+    Count a state transition once the session commits.
+
+    `totals` adjust the running totals (e.g. pending generations),
+    `events` are added to the current hour and day buckets, broken down
+    by model and provider when given.
+    """
+    pending = on_commit(
+        session,
+        _PENDING_KEY,
+        _apply_pending,
+        lambda: {"totals": Counter(), "series": Counter()},
+    )
+    pending["totals"].update(totals or {})
+    for name, amount in (events or {}).items():
+        pending["series"][name] += amount
+        if model_id is not None:
+            pending["series"][f"{name}:model:{model_id}"] += amount
+        if provider:
+            pending["series"][f"{name}:provider:{provider}"] += amount
+
+
+def _apply_pending(pending: dict[str, Counter]):
+    return apply_deltas(pending["totals"], pending["series"], datetime.now(UTC))
+
+
+async def apply_deltas(totals: Counter, series: Counter, at: datetime) -> None:
+    """Add counter deltas to Redis."""
+    try:
+        client = await get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            for name, amount in totals.items():
+                if amount:
+                    pipe.hincrby(TOTALS_KEY, name, amount)
+            if series:
+                for resolution, (_, _, ttl) in RESOLUTIONS.items():
+                    key = _series_key(resolution, at)
+                    for name, amount in series.items():
+                        pipe.hincrby(key, name, amount)
+                    pipe.expire(key, ttl)
+            await pipe.execute()
+    except Exception as e:
+        # The next reconciliation restores the totals
+        logger.warning(f"Stats update failed | totals={dict(totals)}, error={e}")
+
+
+async def compute_totals(session: AsyncSession) -> dict[str, int]:
+    """Totals from full-table aggregates: the reconciliation source of truth."""
+    from src.modules.generation.repository import GenerationRepository
+    from src.modules.payments.repository import PaymentRepository
+    from src.modules.user.repository import UserRepository
+
+    users = await UserRepository(session).get_stats()
+    payments = await PaymentRepository(session).get_stats()
+    generations = await GenerationRepository(session).get_stats()
+    return {
+        "users.total": users["total_users"],
+        "users.banned": users["banned_users"],
+        "users.balance": users["total_balance"],
+        "payments.success": payments["total_payments"],
+        "payments.success_amount": payments["total_amount"],
+        "payments.pending": payments["pending_payments"],
+        "generations.total": generations["total"],
+        "generations.success": generations["success"],
+        "generations.failed": generations["failed"],
+        "generations.pending": generations["pending"],
+        "generations.tokens_spent": generations["tokens_spent"],
+    }
+
+
+def _dashboard(totals: dict[str, int]) -> dict:
+    """Totals in the shape of the admin stats response."""
+    return {
+        "users": {
+            "total_users": totals.get("users.total", 0),
+            "banned_users": totals.get("users.banned", 0),
+            "total_balance": totals.get("users.balance", 0),
+        },
+        "payments": {
+            "total_payments": totals.get("payments.success", 0),
+            "total_amount": totals.get("payments.success_amount", 0),
+            "pending_payments": totals.get("payments.pending", 0),
+        },
+        "generations": {
+            "total": totals.get("generations.total", 0),
+            "success": totals.get("generations.success", 0),
+            "failed": totals.get("generations.failed", 0),
+            "pending": totals.get("generations.pending", 0),
+            "tokens_spent": totals.get("generations.tokens_spent", 0),
+        },
+    }
+
+
+async def get_dashboard_stats(session: AsyncSession) -> dict:
+    """
+    Dashboard statistics with `users`, `payments` and `generations` sections.
+
+    Served from the Redis totals; aggregated from the database (and
+    stored) only if they are missing.
+    """
+    try:
+        client = await get_redis()
+        raw = await client.hgetall(TOTALS_KEY)
+        if raw:
+            return _dashboard({name: int(value) for name, value in raw.items()})
+    except Exception as e:
+        logger.warning(f"Stats read failed, aggregating | error={e}")
+        return _dashboard(await compute_totals(session))
+
+    return _dashboard(await stats_reconciler.reconcile(session))
+
+
+async def get_series(resolution: str, periods: int) -> list[tuple[datetime, dict[str, int]]]:
+    """Counters of the last `periods` hour or day buckets, oldest first."""
+    step = RESOLUTIONS[resolution][1]
+    now = datetime.now(UTC)
+    if resolution == "hour":
+        now = now.replace(minute=0, second=0, microsecond=0)
+    else:
+        now = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    buckets = [now - step * i for i in reversed(range(periods))]
+
+    client = await get_redis()
+    async with client.pipeline(transaction=False) as pipe:
+        for bucket in buckets:
+            pipe.hgetall(_series_key(resolution, bucket))
+        values = await pipe.execute()
+
+    return [
+        (bucket, {name: int(value) for name, value in raw.items()})
+        for bucket, raw in zip(buckets, values)
+    ]
+
+
+class StatsReconciler:
+    """
+    Periodically recompute the totals from the database.
+
+    Increments committed while the aggregates run may be counted twice or
+    not at all; the error is bounded by one interval of traffic and fixed
+    by the next run. A Redis lock keeps one process reconciling at a time.
+    """
+
+    def __init__(self, interval: int | None = None):
+        self.interval = interval or settings.STATS_RECONCILE_INTERVAL
+        self._task: asyncio.Task | None = None
+
+    async def reconcile(self, session: AsyncSession | None = None) -> dict[str, int]:
+        """Overwrite the Redis totals with fresh aggregates."""
+        if session is None:
+            async with background_session_maker() as session:
+                totals = await compute_totals(session)
+        else:
+            totals = await compute_totals(session)
+
+        client = await get_redis()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.delete(TOTALS_KEY)
+            pipe.hset(TOTALS_KEY, mapping=totals)
+            await pipe.execute()
+
+        logger.info(f"Stats reconciled | totals={totals}")
+        return totals
+
+    async def start(self) -> None:
+        """Start the reconciliation loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="stats-reconciler")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                client = await get_redis()
+                # Runs at most once per interval across processes
+                if await client.set(RECONCILE_LOCK_KEY, "1", ex=self.interval, nx=True):
+                    await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Stats reconciliation failed | error={e}")
+            await asyncio.sleep(self.interval)
+
+
+stats_reconciler = StatsReconciler()
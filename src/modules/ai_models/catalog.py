@@ -0,0 +1,177 @@
+"""In-memory catalog of AI models."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from src.core.database import background_session_maker
+from src.core.hooks import on_commit
+from src.core.redis import get_redis, models_cache
+from src.modules.ai_models.models import AIModel
+from src.modules.ai_models.repository import AIModelRepository
+from src.shared.enums import GenerationType
+from src.shared.logger import logger
+
+# Catalog changes are announced here, replicas reload on the next request
+INVALIDATE_CHANNEL = "models:invalidate"
+
+# Version stamp is re-read this often, in case an announcement was missed
+REVALIDATE_INTERVAL = 30.0
+
+_PENDING_KEY = "model_catalog_invalidate"
+
+
+@dataclass
+class CatalogSnapshot:
+    """AI models as of one catalog version. Models are detached, read-only."""
+    version: str
+    models: list[AIModel]
+    by_code: dict[str, AIModel]
+    _memo: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def enabled(self) -> list[AIModel]:
+        return [m for m in self.models if m.is_enabled]
+
+    def memoize(self, name: str, build: Callable[["CatalogSnapshot"], Any]) -> Any:
+        """Value derived from this snapshot (e.g. a serialized payload), built once."""
+        if name not in self._memo:
+            self._memo[name] = build(self)
+        return self._memo[name]
+
+
+class ModelCatalog:
+    """
+    AI model list and code→model map kept in process memory.
+
+    A version stamp in Redis is bumped on every committed model change and
+    announced over pub/sub, so all replicas drop their snapshot and reload
+    it from the database on the next request.
+    """
+
+    def __init__(self):
+        self._snapshot: CatalogSnapshot | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._listener: asyncio.Task | None = None
+
+    async def snapshot(self) -> CatalogSnapshot:
+        """Current catalog, reloaded if stale."""
+        snapshot = self._snapshot
+        if snapshot and time.monotonic() - self._checked_at < REVALIDATE_INTERVAL:
+            return snapshot
+
+        version = await self.version()
+        if snapshot and snapshot.version == version:
+            self._checked_at = time.monotonic()
+            return snapshot
+
+        async with self._lock:
+            current = self._snapshot
+            if current and current.version == version:
+                # Reloaded by a concurrent request meanwhile
+                return current
+            # Own session: models are shared between requests and must not be
+            # the instances a caller's session holds. Closing detaches them
+            async with background_session_maker() as session:
+                models = await AIModelRepository(session).get_all(enabled_only=False)
+            self._snapshot = CatalogSnapshot(
+                version=version,
+                models=models,
+                by_code={m.code: m for m in models},
+            )
+            self._checked_at = time.monotonic()
+            logger.debug(f"Model catalog loaded | version={version}, models={len(models)}")
+            return self._snapshot
+
+    async def get_available_models(
+        self,
+        generation_type: GenerationType | None = None,
+    ) -> list[AIModel]:
+        """Enabled models in display order."""
+        snapshot = await self.snapshot()
+        return [
+            m for m in snapshot.enabled
+            if generation_type is None or m.generation_type == generation_type
+        ]
+
+    async def get_model_by_code(self, code: str) -> AIModel | None:
+        """Model by code, enabled or not."""
+        snapshot = await self.snapshot()
+        return snapshot.by_code.get(code)
+
+    def drop(self) -> None:
+        self._snapshot = None
+
+    async def invalidate(self) -> None:
+        """Bump the catalog version and tell all replicas."""
+        self.drop()
+        try:
+            client = await get_redis()
+            await models_cache.incr("version")
+            await client.publish(INVALIDATE_CHANNEL, "1")
+        except Exception as e:
+            logger.warning(f"Model catalog invalidation failed | error={e}")
+
+    async def version(self) -> str:
+        """Catalog version stamp from Redis."""
+        try:
+            return await models_cache.get("version") or "0"
+        except Exception as e:
+            # Without Redis, reload on every revalidation
+            logger.warning(f"Model catalog version lookup failed | error={e}")
+            return f"local:{time.monotonic()}"
+
+    async def start(self) -> None:
+        """Start listening for catalog changes of other processes."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                client = await get_redis()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.drop()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Model catalog listener failed, retrying | error={e}")
+                self.drop()
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+
+def invalidate_catalog_on_commit(session: Session) -> None:
+    """Invalidate the catalog once the session commits its model changes."""
+    on_commit(session, _PENDING_KEY, _invalidate_catalog)
+
+
+def _invalidate_catalog(_: None):
+    model_catalog.drop()
+    return model_catalog.invalidate()
+
+
+model_catalog = ModelCatalog()
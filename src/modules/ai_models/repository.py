@@ -1,6 +1,6 @@
 """AI Models repository."""
 
-from sqlalchemy import func, select, update
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.modules.ai_models.models import AIModel
@@ -79,11 +79,20 @@ class AIModelRepository:
         )
         self.session.add(model)
         await self.session.flush()
-        await self.session.refresh(model)
         
         logger.info(f"AI model created | code={code}, type={generation_type}")
         return model
 
+    async def create_many(self, rows: list[dict]) -> list[AIModel]:
+        """Create AI models in a single INSERT."""
+        if not rows:
+            return []
+        result = await self.session.scalars(insert(AIModel).returning(AIModel), rows)
+        models = list(result.all())
+
+        logger.info(f"AI models created | count={len(models)}")
+        return models
+
     async def update(self, model: AIModel, **kwargs) -> AIModel:
         """Update model fields."""
         for key, value in kwargs.items():
@@ -91,7 +100,6 @@ class AIModelRepository:
                 setattr(model, key, value)
         
         await self.session.flush()
-        await self.session.refresh(model)
         
         logger.info(f"AI model updated | code={model.code}")
         return model
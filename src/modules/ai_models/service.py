@@ -3,6 +3,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import NotFoundError, ValidationError
+from src.modules.ai_models.catalog import invalidate_catalog_on_commit, model_catalog
 from src.modules.ai_models.models import AIModel
 from src.modules.ai_models.repository import AIModelRepository
 from src.shared.enums import GenerationType
@@ -24,8 +25,8 @@ class AIModelService:
         return model
 
     async def get_model_by_code(self, code: str) -> AIModel:
-        """Get model by code."""
-        model = await self.repo.get_by_code(code)
+        """Get model by code (from the catalog, read-only)."""
+        model = await model_catalog.get_model_by_code(code)
         if not model:
             raise NotFoundError("Модель", code)
         return model
@@ -34,11 +35,8 @@ class AIModelService:
         self,
         generation_type: GenerationType | None = None,
     ) -> list[AIModel]:
-        """Get all enabled models for users."""
-        return await self.repo.get_all(
-            enabled_only=True,
-            generation_type=generation_type,
-        )
+        """Get all enabled models for users (from the catalog, read-only)."""
+        return await model_catalog.get_available_models(generation_type)
 
     async def get_all_models(
         self,
@@ -66,6 +64,7 @@ class AIModelService:
         if existing:
             raise ValidationError(f"Модель с кодом {code} уже существует")
 
+        invalidate_catalog_on_commit(self.session.sync_session)
         return await self.repo.create(
             code=code,
             name=name,
@@ -84,6 +83,7 @@ class AIModelService:
     ) -> AIModel:
         """Update model."""
         model = await self.get_model(model_id)
+        invalidate_catalog_on_commit(self.session.sync_session)
         return await self.repo.update(model, **kwargs)
 
     async def toggle_model(self, model_id: int) -> bool:
@@ -91,6 +91,7 @@ class AIModelService:
         model = await self.get_model(model_id)
         new_status = not model.is_enabled
         await self.repo.set_enabled(model_id, new_status)
+        invalidate_catalog_on_commit(self.session.sync_session)
         return new_status
 
     async def set_price(self, model_id: int, price_tokens: float) -> None:
@@ -100,11 +101,13 @@ class AIModelService:
 
         await self.get_model(model_id)
         await self.repo.update_price(model_id, price_tokens)
+        invalidate_catalog_on_commit(self.session.sync_session)
 
     async def delete_model(self, model_id: int) -> None:
         """Delete model."""
         await self.get_model(model_id)
         await self.repo.delete(model_id)
+        invalidate_catalog_on_commit(self.session.sync_session)
 
     async def get_models_grouped(self) -> dict[str, list[AIModel]]:
         """Get models grouped by type for frontend."""
@@ -596,14 +599,14 @@ async def seed_default_models(session: AsyncSession) -> None:
     repo = AIModelRepository(session)
 
     known_codes = {m["code"] for m in DEFAULT_MODELS}
+    all_models = await repo.get_all(enabled_only=False)
+    existing_by_code = {model.code: model for model in all_models}
 
+    missing = []
     for i, model_data in enumerate(DEFAULT_MODELS):
-        existing = await repo.get_by_code(model_data["code"])
+        existing = existing_by_code.get(model_data["code"])
         if not existing:
-            await repo.create(
-                **model_data,
-                sort_order=i,
-            )
+            missing.append({**model_data, "sort_order": i})
             logger.info(f"Seeded model | code={model_data['code']}, provider={model_data['provider']}")
         else:
             # Update technical fields (provider, provider_model, name, description, config, icon, sort_order)
@@ -629,18 +632,20 @@ async def seed_default_models(session: AsyncSession) -> None:
                 existing.sort_order = i
                 changed = True
             if changed:
-                await session.flush()
                 logger.info(
                     f"Updated model | code={model_data['code']}, "
                     f"provider={model_data['provider']}, provider_model={model_data['provider_model']}"
                 )
 
+    # New models in one INSERT, changed ones with the commit's flush
+    await repo.create_many(missing)
+
     # Disable models that are no longer in DEFAULT_MODELS
-    all_models = await repo.get_all(enabled_only=False)
     for model in all_models:
         if model.code not in known_codes and model.is_enabled:
             await repo.set_enabled(model.id, False)
             logger.info(f"Disabled obsolete model | code={model.code}")
 
+    invalidate_catalog_on_commit(session.sync_session)
     await session.commit()
 
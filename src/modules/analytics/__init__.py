@@ -0,0 +1,20 @@
+"""Analytics module."""
+
+from src.modules.analytics.models import (
+    BalanceRollup,
+    GenerationRollup,
+    RevenueRollup,
+    RollupWatermark,
+)
+from src.modules.analytics.repository import AnalyticsRepository
+from src.modules.analytics.rollup import RollupJob, rollup_job
+
+__all__ = [
+    "AnalyticsRepository",
+    "BalanceRollup",
+    "GenerationRollup",
+    "RevenueRollup",
+    "RollupJob",
+    "RollupWatermark",
+    "rollup_job",
+]
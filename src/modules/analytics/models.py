@@ -0,0 +1,77 @@
+"""Analytics rollup models."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class GenerationRollup(Base):
+    """Completed generations per hour/day bucket."""
+
+    __tablename__ = "generation_rollups"
+
+    resolution: Mapped[str] = mapped_column(String(8), primary_key=True)  # hour, day
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    # 0 / "" when the model was deleted or the provider is unknown
+    model_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    provider: Mapped[str] = mapped_column(String(50), primary_key=True)
+    generation_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+    count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    tokens_spent: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    duration_seconds: Mapped[float] = mapped_column(Float, default=0, nullable=False)  # сумма
+
+    def __repr__(self) -> str:
+        return f"<GenerationRollup({self.resolution}, bucket={self.bucket_start}, status={self.status})>"
+
+
+class RevenueRollup(Base):
+    """Successful payments per hour/day bucket."""
+
+    __tablename__ = "revenue_rollups"
+
+    resolution: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    currency: Mapped[str] = mapped_column(String(3), primary_key=True)
+
+    payments: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    amount: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    tokens: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RevenueRollup({self.resolution}, bucket={self.bucket_start}, currency={self.currency})>"
+
+
+class BalanceRollup(Base):
+    """Balance operations (spend, deposits, refunds) per hour/day bucket."""
+
+    __tablename__ = "balance_rollups"
+
+    resolution: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    operation_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+
+    operations: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    amount: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)  # + или -
+
+    def __repr__(self) -> str:
+        return f"<BalanceRollup({self.resolution}, bucket={self.bucket_start}, type={self.operation_type})>"
+
+
+class RollupWatermark(Base):
+    """High-water mark of a rollup: rows before `position` are aggregated."""
+
+    __tablename__ = "rollup_watermarks"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    position: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<RollupWatermark(name={self.name}, position={self.position})>"
@@ -0,0 +1,107 @@
+"""Analytics repository: reads the rollup tables only."""
+
+from datetime import datetime
+
+from sqlalchemy import Row, case, func, null, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.modules.analytics.models import BalanceRollup, GenerationRollup, RevenueRollup
+from src.shared.enums import GenerationStatus
+
+
+class AnalyticsRepository:
+    """Repository for time series over the rollup tables."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_generation_series(
+        self,
+        resolution: str,
+        since: datetime,
+        until: datetime,
+        group_by: str | None = None,
+        model_id: int | None = None,
+        provider: str | None = None,
+        generation_type: str | None = None,
+    ) -> list[Row]:
+        """
+        Completed generations per bucket, optionally split by a dimension.
+
+        Rows carry `bucket_start`, `group`, `total`, `success`, `failed`,
+        `tokens_spent` and `success_seconds` (summed duration of successes).
+        """
+        success = GenerationRollup.status == GenerationStatus.SUCCESS.value
+        failed = GenerationRollup.status == GenerationStatus.FAILED.value
+        group = getattr(GenerationRollup, group_by) if group_by else None
+
+        query = (
+            select(
+                GenerationRollup.bucket_start,
+                (group if group is not None else null()).label("group"),
+                func.sum(GenerationRollup.count).label("total"),
+                func.sum(case((success, GenerationRollup.count), else_=0)).label("success"),
+                func.sum(case((failed, GenerationRollup.count), else_=0)).label("failed"),
+                func.sum(GenerationRollup.tokens_spent).label("tokens_spent"),
+                func.sum(
+                    case((success, GenerationRollup.duration_seconds), else_=0.0)
+                ).label("success_seconds"),
+            )
+            .where(
+                GenerationRollup.resolution == resolution,
+                GenerationRollup.bucket_start >= since,
+                GenerationRollup.bucket_start < until,
+            )
+        )
+        if model_id is not None:
+            query = query.where(GenerationRollup.model_id == model_id)
+        if provider is not None:
+            query = query.where(GenerationRollup.provider == provider)
+        if generation_type is not None:
+            query = query.where(GenerationRollup.generation_type == generation_type)
+
+        keys = [GenerationRollup.bucket_start] + ([group] if group is not None else [])
+        query = query.group_by(*keys).order_by(*keys)
+
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def get_revenue_series(
+        self,
+        resolution: str,
+        since: datetime,
+        until: datetime,
+        currency: str | None = None,
+    ) -> list[RevenueRollup]:
+        """Successful payments per bucket and currency."""
+        query = select(RevenueRollup).where(
+            RevenueRollup.resolution == resolution,
+            RevenueRollup.bucket_start >= since,
+            RevenueRollup.bucket_start < until,
+        )
+        if currency:
+            query = query.where(RevenueRollup.currency == currency)
+
+        query = query.order_by(RevenueRollup.bucket_start, RevenueRollup.currency)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_balance_series(
+        self,
+        resolution: str,
+        since: datetime,
+        until: datetime,
+        operation_type: str | None = None,
+    ) -> list[BalanceRollup]:
+        """Balance operations per bucket and operation type."""
+        query = select(BalanceRollup).where(
+            BalanceRollup.resolution == resolution,
+            BalanceRollup.bucket_start >= since,
+            BalanceRollup.bucket_start < until,
+        )
+        if operation_type:
+            query = query.where(BalanceRollup.operation_type == operation_type)
+
+        query = query.order_by(BalanceRollup.bucket_start, BalanceRollup.operation_type)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
@@ -0,0 +1,287 @@
+"""
+Incremental hourly/daily rollups of completed rows.
+
+Each source aggregates the rows completed in [watermark, upper) per hour
+and adds them to its rollup table, hour and day buckets alike, in the
+same transaction that advances the watermark. `upper` trails the clock by
+ANALYTICS_ROLLUP_LAG, so rows whose transactions were still open when
+their timestamp was taken are not skipped.
+"""
+
+import asyncio
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from enum import Enum
+
+from sqlalchemy import ColumnElement, func, literal_column, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.core.database import background_session_maker
+from src.core.redis import get_redis
+from src.modules.analytics.models import (
+    BalanceRollup,
+    GenerationRollup,
+    RevenueRollup,
+    RollupWatermark,
+)
+from src.modules.generation.models import Generation
+from src.modules.payments.models import BalanceHistory, Payment
+from src.shared.enums import GenerationStatus, PaymentStatus
+from src.shared.logger import logger
+
+# Largest window per transaction, keeps a backfill from one huge statement
+MAX_WINDOW = timedelta(days=1)
+
+LOCK_KEY = "analytics:rollup"
+
+
+def _hour(column: ColumnElement) -> ColumnElement:
+    """Start of the UTC hour of a timestamp."""
+    if settings.is_sqlite:
+        return func.strftime("%Y-%m-%d %H:00:00", column)
+    return func.date_trunc("hour", func.timezone("UTC", column))
+
+
+def _seconds_between(start: ColumnElement, end: ColumnElement) -> ColumnElement:
+    if settings.is_sqlite:
+        return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.extract("epoch", end - start)
+
+
+def _utc(value: datetime | str) -> datetime:
+    """Aware UTC datetime; SQLite returns strings, completed_at is written naive."""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=UTC)
+    return value.astimezone(UTC)
+
+
+def _plain(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+@dataclass(frozen=True)
+class RollupSource:
+    """
+    Rows of a table folded into a rollup table.
+
+    `dimensions` and `measures` map rollup columns to source expressions;
+    the first measure counts the rows.
+    """
+    name: str
+    rollup: type
+    completed_at: ColumnElement
+    dimensions: dict[str, ColumnElement]
+    measures: dict[str, ColumnElement]
+    where: tuple = field(default=())
+
+
+SOURCES = [
+    RollupSource(
+        name="generations",
+        rollup=GenerationRollup,
+        completed_at=Generation.completed_at,
+        dimensions={
+            "model_id": func.coalesce(Generation.model_id, 0),
+            "provider": func.coalesce(Generation.params["_provider"].as_string(), ""),
+            "generation_type": Generation.generation_type,
+            "status": Generation.status,
+        },
+        measures={
+            "count": func.count(),
+            "tokens_spent": func.sum(Generation.tokens_spent),
+            "duration_seconds": func.sum(
+                _seconds_between(Generation.created_at, Generation.completed_at)
+            ),
+        },
+        where=(Generation.status.in_([
+            GenerationStatus.SUCCESS,
+            GenerationStatus.FAILED,
+            GenerationStatus.CANCELLED,
+        ]),),
+    ),
+    RollupSource(
+        name="revenue",
+        rollup=RevenueRollup,
+        completed_at=Payment.paid_at,
+        dimensions={"currency": Payment.currency},
+        measures={
+            "payments": func.count(),
+            "amount": func.sum(Payment.amount),
+            "tokens": func.sum(Payment.tokens),
+        },
+        where=(Payment.status == PaymentStatus.SUCCESS,),
+    ),
+    RollupSource(
+        name="balance",
+        rollup=BalanceRollup,
+        completed_at=BalanceHistory.created_at,
+        dimensions={"operation_type": BalanceHistory.operation_type},
+        measures={
+            "operations": func.count(),
+            "amount": func.sum(BalanceHistory.amount),
+        },
+    ),
+]
+
+
+async def aggregate(
+    session: AsyncSession,
+    source: RollupSource,
+    lower: datetime,
+    upper: datetime,
+) -> int:
+    """Add rows completed in [lower, upper) to the rollup. Returns the row count."""
+    # Dimensions are grouped by label: repeating the expressions would
+    # repeat their bind parameters, which PostgreSQL does not match up
+    dimension_labels = [f"dim_{name}" for name in source.dimensions]
+    query = (
+        select(
+            _hour(source.completed_at).label("bucket"),
+            *[expr.label(f"dim_{name}") for name, expr in source.dimensions.items()],
+            *[expr.label(name) for name, expr in source.measures.items()],
+        )
+        .where(source.completed_at >= lower, source.completed_at < upper, *source.where)
+        .group_by(*[literal_column(label) for label in ["bucket", *dimension_labels]])
+    )
+    result = await session.execute(query)
+
+    table = source.rollup.__table__
+    buckets: dict[tuple, dict[str, float]] = defaultdict(lambda: defaultdict(int))
+    rows = 0
+    for row in result.mappings():
+        hour = _utc(row["bucket"])
+        dimensions = tuple(_plain(row[label]) for label in dimension_labels)
+        for resolution, start in (("hour", hour), ("day", hour.replace(hour=0))):
+            totals = buckets[(resolution, start, *dimensions)]
+            for name in source.measures:
+                totals[name] += table.c[name].type.python_type(row[name] or 0)
+        rows += row[next(iter(source.measures))]
+
+    if not buckets:
+        return 0
+
+    values = [
+        {
+            "resolution": key[0],
+            "bucket_start": key[1],
+            **dict(zip(source.dimensions, key[2:])),
+            **totals,
+        }
+        for key, totals in buckets.items()
+    ]
+    insert = sqlite.insert if settings.is_sqlite else postgresql.insert
+    statement = insert(table).values(values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[column.name for column in table.primary_key],
+        set_={
+            name: table.c[name] + getattr(statement.excluded, name)
+            for name in source.measures
+        },
+    )
+    await session.execute(statement)
+    return rows
+
+
+class RollupJob:
+    """
+    Periodically fold completed rows into the rollup tables.
+
+    Each source advances its own watermark, at most MAX_WINDOW per
+    transaction. The watermark row is locked while a window is
+    aggregated and a Redis lock keeps one process rolling up at a time.
+    """
+
+    def __init__(self, interval: int | None = None, lag: int | None = None):
+        self.interval = interval or settings.ANALYTICS_ROLLUP_INTERVAL
+        self.lag = timedelta(seconds=lag or settings.ANALYTICS_ROLLUP_LAG)
+        self._task: asyncio.Task | None = None
+
+    async def step(
+        self,
+        session: AsyncSession,
+        source: RollupSource,
+        horizon: datetime,
+    ) -> int | None:
+        """Aggregate the next window up to `horizon`. Returns None once caught up."""
+        result = await session.execute(
+            select(RollupWatermark.position)
+            .where(RollupWatermark.name == source.name)
+            .with_for_update()
+        )
+        position = result.scalar_one_or_none()
+        if position is None:
+            first = await session.scalar(
+                select(func.min(source.completed_at)).where(*source.where)
+            )
+            if first is None:
+                return None
+            position = _utc(first).replace(minute=0, second=0, microsecond=0)
+            session.add(RollupWatermark(name=source.name, position=position))
+            await session.flush()
+        position = _utc(position)
+
+        if position >= horizon:
+            return None
+
+        upper = min(horizon, position + MAX_WINDOW)
+        rows = await aggregate(session, source, position, upper)
+        await session.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.name == source.name)
+            .values(position=upper)
+        )
+        return rows
+
+    async def run(self) -> dict[str, int]:
+        """Catch every source up to the horizon. Returns rows aggregated per source."""
+        # Fixed for the whole run: a horizon that follows the clock would
+        # always be a few milliseconds ahead of the watermark
+        horizon = datetime.now(UTC) - self.lag
+        aggregated = {}
+        for source in SOURCES:
+            aggregated[source.name] = 0
+            while True:
+                async with background_session_maker() as session:
+                    rows = await self.step(session, source, horizon)
+                    await session.commit()
+                if rows is None:
+                    break
+                aggregated[source.name] += rows
+
+        if any(aggregated.values()):
+            logger.info(f"Analytics rolled up | rows={aggregated}")
+        return aggregated
+
+    async def start(self) -> None:
+        """Start the rollup loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="analytics-rollup")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                client = await get_redis()
+                if await client.set(LOCK_KEY, "1", ex=self.interval, nx=True):
+                    await self.run()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Analytics rollup failed | error={e}")
+            await asyncio.sleep(self.interval)
+
+
+rollup_job = RollupJob()
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,22 @@ class GalleryItem(Base):
     """Gallery item model."""
 
     __tablename__ = "gallery_items"
+    __table_args__ = (
+        # Keyset pagination of user gallery
+        Index("ix_gallery_items_user_id_created_at", "user_id", "created_at", "id"),
+        # Gallery filtered by file type
+        Index(
+            "ix_gallery_items_user_id_file_type_created_at",
+            "user_id", "file_type", "created_at", "id",
+        ),
+        # Favorites tab
+        Index(
+            "ix_gallery_items_favorites",
+            "user_id", "created_at", "id",
+            postgresql_where=text("is_favorite"),
+            sqlite_where=text("is_favorite"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
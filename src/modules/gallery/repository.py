@@ -6,10 +6,17 @@ from sqlalchemy import delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.pagination import Cursor, paginate
+from src.core.versions import bump_version_on_commit
 from src.modules.gallery.models import GalleryItem
 from src.shared.logger import logger
 
 
+def gallery_version_name(user_id: int) -> str:
+    """Version stamp of a user's gallery, bumped on every change."""
+    return f"gallery:{user_id}"
+
+
 class GalleryRepository:
     """Repository for GalleryItem database operations."""
 
@@ -24,8 +31,9 @@ class GalleryRepository:
         file_type: str,
         thumbnail_path: str | None = None,
     ) -> GalleryItem:
-        """Create gallery item."""
+        """Create gallery item; it is written with the session's next flush."""
         item = GalleryItem(
+            id=uuid.uuid4(),
             user_id=user_id,
             generation_id=generation_id,
             file_path=file_path,
@@ -33,8 +41,7 @@ class GalleryRepository:
             thumbnail_path=thumbnail_path,
         )
         self.session.add(item)
-        await self.session.flush()
-        await self.session.refresh(item)
+        bump_version_on_commit(self.session.sync_session, gallery_version_name(user_id))
         
         logger.debug(f"Gallery item created | id={item.id}, user_id={user_id}")
         return item
@@ -55,8 +62,9 @@ class GalleryRepository:
         limit: int = 50,
         file_type: str | None = None,
         favorites_only: bool = False,
+        cursor: Cursor | None = None,
     ) -> list[GalleryItem]:
-        """Get user's gallery items."""
+        """Get user's gallery items, newest first (by offset or after a cursor)."""
         query = select(GalleryItem).where(GalleryItem.user_id == user_id)
         
         if file_type:
@@ -65,13 +73,9 @@ class GalleryRepository:
         if favorites_only:
             query = query.where(GalleryItem.is_favorite == True)
         
-        query = (
-            query
-            .order_by(GalleryItem.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .options(selectinload(GalleryItem.generation))
-        )
+        query = paginate(
+            query, GalleryItem.created_at, GalleryItem.id, limit, offset, cursor
+        ).options(selectinload(GalleryItem.generation))
         
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -103,18 +107,35 @@ class GalleryRepository:
             .values(is_favorite=new_status)
         )
         await self.session.flush()
+        bump_version_on_commit(self.session.sync_session, gallery_version_name(item.user_id))
         
         return new_status
 
+    async def set_thumbnail(self, generation_id: uuid.UUID, thumbnail_path: str) -> None:
+        """Set thumbnail of a generation's gallery item."""
+        result = await self.session.execute(
+            update(GalleryItem)
+            .where(GalleryItem.generation_id == generation_id)
+            .values(thumbnail_path=thumbnail_path)
+            .returning(GalleryItem.user_id)
+        )
+        await self.session.flush()
+        for user_id in result.scalars().all():
+            bump_version_on_commit(self.session.sync_session, gallery_version_name(user_id))
+
     async def delete(self, item_id: uuid.UUID) -> bool:
         """Delete gallery item."""
         result = await self.session.execute(
-            delete(GalleryItem).where(GalleryItem.id == item_id)
+            delete(GalleryItem)
+            .where(GalleryItem.id == item_id)
+            .returning(GalleryItem.user_id)
         )
         await self.session.flush()
         
-        deleted = result.rowcount > 0
+        user_id = result.scalar_one_or_none()
+        deleted = user_id is not None
         if deleted:
+            bump_version_on_commit(self.session.sync_session, gallery_version_name(user_id))
             logger.debug(f"Gallery item deleted | id={item_id}")
         
         return deleted
@@ -125,6 +146,7 @@ class GalleryRepository:
             delete(GalleryItem).where(GalleryItem.user_id == user_id)
         )
         await self.session.flush()
+        bump_version_on_commit(self.session.sync_session, gallery_version_name(user_id))
         
         logger.info(f"User gallery cleared | user_id={user_id}, count={result.rowcount}")
         return result.rowcount
@@ -6,6 +6,7 @@ from pathlib import Path
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.exceptions import NotFoundError
+from src.core.pagination import Cursor
 from src.modules.gallery.models import GalleryItem
 from src.modules.gallery.repository import GalleryRepository
 from src.shared.logger import logger
@@ -37,10 +38,11 @@ class GalleryService:
         limit: int = 50,
         file_type: str | None = None,
         favorites_only: bool = False,
+        cursor: Cursor | None = None,
     ) -> tuple[list[GalleryItem], int]:
         """Get user's gallery with total count."""
         items = await self.repo.get_user_gallery(
-            user_id, offset, limit, file_type, favorites_only
+            user_id, offset, limit, file_type, favorites_only, cursor=cursor
         )
         total = await self.repo.count_user_gallery(user_id, file_type)
         
@@ -0,0 +1,47 @@
+"""Completion tracking of generation batches."""
+
+import uuid
+
+from src.core.redis import get_redis
+from src.shared.logger import logger
+
+# Batches older than this are not tracked anymore
+BATCH_TTL = 24 * 60 * 60
+
+
+def _key(batch_id: uuid.UUID) -> str:
+    return f"generation_batch:{batch_id}"
+
+
+async def start_batch(batch_id: uuid.UUID, count: int) -> None:
+    """
+    Start counting unfinished generations of a batch.
+
+    Failures are only logged: members then fall back to counting the
+    batch in the database (see `finish_batch_member`).
+    """
+    try:
+        client = await get_redis()
+        await client.set(_key(batch_id), count, ex=BATCH_TTL)
+    except Exception as e:
+        logger.warning(f"Batch counter start failed | batch_id={batch_id}, error={e}")
+
+
+async def finish_batch_member(batch_id: uuid.UUID) -> bool | None:
+    """
+    Count a finished generation. Returns True for the last one of the batch.
+
+    None means the counter is unavailable (Redis error, counter never
+    started or expired) and the caller has to check the database.
+    """
+    try:
+        client = await get_redis()
+        remaining = await client.decr(_key(batch_id))
+        if remaining <= 0:
+            await client.delete(_key(batch_id))
+    except Exception as e:
+        logger.warning(f"Batch counter update failed | batch_id={batch_id}, error={e}")
+        return None
+
+    # A missing counter goes negative
+    return remaining == 0 if remaining >= 0 else None
@@ -0,0 +1,53 @@
+"""Provider callback URLs and verification."""
+
+import hashlib
+import hmac
+import uuid
+
+from src.config import settings
+
+
+def callbacks_enabled() -> bool:
+    """Check if providers should report completion via callbacks."""
+    return bool(settings.GENERATION_CALLBACK_BASE_URL)
+
+
+def _callback_secret() -> bytes:
+    secret = settings.GENERATION_CALLBACK_SECRET.get_secret_value()
+    return (secret or settings.SECRET_KEY.get_secret_value()).encode()
+
+
+def callback_token(provider_name: str, generation_id: uuid.UUID | str) -> str:
+    """HMAC token that authenticates callbacks for one generation of a provider."""
+    return hmac.new(
+        _callback_secret(),
+        f"{provider_name}:{generation_id}".encode(),
+        hashlib.sha256,
+    ).hexdigest()[:32]
+
+
+def verify_callback_token(
+    provider_name: str,
+    generation_id: uuid.UUID | str | None,
+    token: str | None,
+) -> bool:
+    """Validate callback token. Returns True if valid."""
+    if not token or not generation_id:
+        return False
+    return hmac.compare_digest(token, callback_token(provider_name, generation_id))
+
+
+def build_callback_url(provider_name: str, generation_id: uuid.UUID) -> str | None:
+    """
+    Public callback URL for a generation, None when callbacks are disabled.
+
+    The token is bound to the generation, so a leaked URL cannot complete
+    other generations.
+    """
+    if not callbacks_enabled():
+        return None
+    base_url = settings.GENERATION_CALLBACK_BASE_URL.rstrip("/")
+    return (
+        f"{base_url}/api/v1/generation/callback/{provider_name}"
+        f"?generation_id={generation_id}&token={callback_token(provider_name, generation_id)}"
+    )
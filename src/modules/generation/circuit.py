@@ -0,0 +1,309 @@
+"""Circuit breakers and health scores of generation providers."""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from src.config import settings
+from src.core.exceptions import ExternalAPIError
+from src.core.redis import get_redis
+from src.shared.logger import logger
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class CallOutcome:
+    """Result of one provider call."""
+    at: float
+    ok: bool
+    latency: float
+
+
+def is_provider_failure(error: Exception) -> bool:
+    """Errors that indicate provider trouble, not a bad request."""
+    if isinstance(error, ExternalAPIError):
+        return error.status_code is None or error.status_code >= 500 or error.status_code == 429
+    return True
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker over a sliding window of call outcomes.
+
+    Opens when the failure rate within the window reaches the threshold.
+    After the cooldown it is half-open: a single probe submission is
+    admitted and the next call outcome either closes it (with a fresh
+    window) or opens it again. A probe that never reports back is given
+    up after another cooldown.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        window: float,
+        min_calls: int,
+        failure_rate: float,
+        cooldown: float,
+    ):
+        self.key = key
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.opened_at: float | None = None
+        self._probe_at: float | None = None
+        self._outcomes: deque[CallOutcome] = deque()
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0].at > self.window:
+            self._outcomes.popleft()
+
+    def record(self, ok: bool, latency: float) -> None:
+        """Register outcome of a call."""
+        now = time.monotonic()
+        self._outcomes.append(CallOutcome(at=now, ok=ok, latency=latency))
+        self._trim(now)
+        self._refresh_state(now)
+
+        if self.state == HALF_OPEN:
+            # Outcome of the first call after cooldown decides
+            if ok:
+                self._close()
+            else:
+                self._open(now)
+            return
+
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            if self.error_rate >= self.failure_rate:
+                self._open(now)
+
+    def allow(self) -> bool:
+        """Check if new submissions may go through now."""
+        now = time.monotonic()
+        self._refresh_state(now)
+        if self.state == HALF_OPEN:
+            return self._probe_at is None or now - self._probe_at >= self.cooldown
+        return self.state == CLOSED
+
+    def admit(self) -> bool:
+        """Like `allow`, but takes the probe slot of a half-open circuit."""
+        if not self.allow():
+            return False
+        if self.state == HALF_OPEN:
+            self._probe_at = time.monotonic()
+        return True
+
+    @property
+    def current_state(self) -> str:
+        self._refresh_state(time.monotonic())
+        return self.state
+
+    def _refresh_state(self, now: float) -> None:
+        if self.state == OPEN and now - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            logger.info(f"Circuit half-open | key={self.key}")
+
+    def reset(self) -> None:
+        self._close()
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self.opened_at = now
+        self._probe_at = None
+        logger.warning(
+            f"Circuit opened | key={self.key}, error_rate={self.error_rate:.2f}, "
+            f"calls={len(self._outcomes)}"
+        )
+
+    def _close(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"Circuit closed | key={self.key}")
+        self.state = CLOSED
+        self.opened_at = None
+        self._probe_at = None
+        # The failures that opened the circuit would reopen it right away
+        self._outcomes.clear()
+
+    @property
+    def is_open(self) -> bool:
+        return self.current_state == OPEN
+
+    @property
+    def calls(self) -> int:
+        return len(self._outcomes)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for o in self._outcomes if not o.ok) / len(self._outcomes)
+
+    @property
+    def p95_latency(self) -> float:
+        latencies = sorted(o.latency for o in self._outcomes)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+    @property
+    def health(self) -> float:
+        """Health score 0..1: success rate, penalized for slow responses."""
+        if self.state == OPEN:
+            return 0.0
+        latency_penalty = min(1.0, self.p95_latency / settings.CIRCUIT_SLOW_CALL_SECONDS)
+        return max(0.0, (1.0 - self.error_rate) * (1.0 - 0.5 * latency_penalty))
+
+    def snapshot(self) -> dict:
+        self._refresh_state(time.monotonic())
+        return {
+            "key": self.key,
+            "state": self.state,
+            "calls": self.calls,
+            "error_rate": round(self.error_rate, 3),
+            "p95_latency": round(self.p95_latency, 3),
+            "health": round(self.health, 3),
+            "open_for": (
+                round(time.monotonic() - self.opened_at, 1) if self.opened_at else None
+            ),
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    Breakers per provider and per provider model.
+
+    Open circuits are mirrored to Redis so that processes which do not
+    call the provider themselves (e.g. API replicas with queue workers)
+    fast-fail submissions too.
+    """
+
+    def __init__(self):
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    @staticmethod
+    def key(provider_name: str, model: str | None = None) -> str:
+        return f"{provider_name}:{model}" if model else provider_name
+
+    def get(self, provider_name: str, model: str | None = None) -> CircuitBreaker:
+        key = self.key(provider_name, model)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                key,
+                window=settings.CIRCUIT_WINDOW_SECONDS,
+                min_calls=settings.CIRCUIT_MIN_CALLS,
+                failure_rate=settings.CIRCUIT_FAILURE_RATE,
+                cooldown=settings.CIRCUIT_COOLDOWN_SECONDS,
+            )
+            self._breakers[key] = breaker
+        return breaker
+
+    async def record(
+        self,
+        provider_name: str,
+        model: str | None,
+        ok: bool,
+        latency: float,
+    ) -> None:
+        """Register call outcome for the provider and, if given, its model."""
+        breakers = [self.get(provider_name)]
+        if model:
+            breakers.append(self.get(provider_name, model))
+
+        for breaker in breakers:
+            previous = breaker.current_state
+            breaker.record(ok, latency)
+            if breaker.state == OPEN and previous != OPEN:
+                await self._publish_open(breaker)
+            elif breaker.state == CLOSED and previous != CLOSED:
+                await self._publish_closed(breaker)
+
+    async def is_available(self, provider_name: str, model: str | None = None) -> bool:
+        """
+        Check if new submissions to the provider model should be accepted.
+
+        Only checks: the submission that is actually sent `admit`s itself.
+        """
+        keys = [self.key(provider_name)]
+        if model:
+            keys.append(self.key(provider_name, model))
+
+        breakers = [self._breakers.get(key) for key in keys]
+        if any(breaker and not breaker.allow() for breaker in breakers):
+            return False
+
+        try:
+            client = await get_redis()
+            if await client.exists(*[f"circuit:{key}" for key in keys]):
+                return False
+        except Exception as e:
+            logger.warning(f"Circuit state lookup failed | error={e}")
+
+        return True
+
+    def admit(self, provider_name: str, model: str | None = None) -> bool:
+        """
+        Admit a submission to the provider model. Returns False if it must fast-fail.
+
+        A submission to a half-open circuit is its probe; further ones are
+        refused until the probe reports back.
+        """
+        keys = [self.key(provider_name)]
+        if model:
+            keys.append(self.key(provider_name, model))
+        breakers = [breaker for key in keys if (breaker := self._breakers.get(key))]
+
+        # Checked first: a probe slot taken on one breaker and then refused
+        # by the other would block the circuit for a cooldown
+        if not all(breaker.allow() for breaker in breakers):
+            return False
+        for breaker in breakers:
+            breaker.admit()
+        return True
+
+    def poll_delay(self, provider_name: str, delay: float) -> float:
+        """Stretch polling interval while the provider circuit is open."""
+        breaker = self._breakers.get(self.key(provider_name))
+        if breaker and breaker.is_open:
+            return max(delay, settings.CIRCUIT_OPEN_POLL_INTERVAL)
+        return delay
+
+    async def reset(self, key: str) -> bool:
+        """Force-close a circuit. Returns False if it is unknown."""
+        breaker = self._breakers.get(key)
+        if breaker:
+            breaker.reset()
+        try:
+            client = await get_redis()
+            deleted = await client.delete(f"circuit:{key}")
+        except Exception:
+            deleted = 0
+        return bool(breaker or deleted)
+
+    def snapshot(self) -> list[dict]:
+        return [breaker.snapshot() for breaker in self._breakers.values()]
+
+    async def _publish_open(self, breaker: CircuitBreaker) -> None:
+        try:
+            client = await get_redis()
+            await client.set(
+                f"circuit:{breaker.key}",
+                breaker.state,
+                ex=int(breaker.cooldown),
+            )
+        except Exception as e:
+            logger.warning(f"Circuit state publish failed | key={breaker.key}, error={e}")
+
+    async def _publish_closed(self, breaker: CircuitBreaker) -> None:
+        try:
+            client = await get_redis()
+            await client.delete(f"circuit:{breaker.key}")
+        except Exception as e:
+            logger.warning(f"Circuit state publish failed | key={breaker.key}, error={e}")
+
+
+circuit_breakers = CircuitBreakerRegistry()
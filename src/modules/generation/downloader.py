@@ -0,0 +1,211 @@
+"""Streaming download of provider results to local storage."""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+import httpx
+
+from src.config import settings
+from src.core.exceptions import ExternalAPIError
+from src.core.http import get_http_client
+from src.shared.logger import logger
+
+MB = 1024 * 1024
+
+
+@dataclass
+class DownloadResult:
+    """Downloaded file with transfer metrics."""
+    path: Path
+    size: int
+    elapsed: float
+    attempts: int
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.size / self.elapsed if self.elapsed > 0 else float(self.size)
+
+
+@dataclass
+class DownloadStats:
+    """Aggregate transfer metrics of the process."""
+    files: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    resumes: int = 0
+    failures: int = 0
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes / self.seconds if self.seconds > 0 else 0.0
+
+    def snapshot(self) -> dict:
+        """Counters with the average transfer rate, for the admin API."""
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "bytes_per_sec": round(self.bytes_per_sec, 1),
+            "resumes": self.resumes,
+            "failures": self.failures,
+        }
+
+
+def guess_extension(url: str, content_type: str = "") -> str:
+    """File extension by result URL, falling back to the response content type."""
+    url_lower = url.lower().split("?")[0]
+    if url_lower.endswith(".mp4") or "video" in url_lower:
+        return ".mp4"
+    if url_lower.endswith(".webp"):
+        return ".webp"
+    if url_lower.endswith(".jpg") or url_lower.endswith(".jpeg"):
+        return ".jpg"
+    if url_lower.endswith(".gif"):
+        return ".gif"
+    if url_lower.endswith(".webm"):
+        return ".webm"
+
+    if "video" in content_type:
+        return ".mp4"
+    if "jpeg" in content_type:
+        return ".jpg"
+    return ".png"
+
+
+class _RetryableDownloadError(Exception):
+    """Transfer interrupted, the partial file can be resumed."""
+
+
+class ResultDownloader:
+    """
+    Stream provider results into storage.
+
+    Chunks are written to a `.part` file in a worker thread, so memory use
+    does not depend on the file size and the event loop never blocks on disk.
+    Interrupted transfers are resumed with an HTTP Range request, and the
+    finished file is atomically moved into place.
+    """
+
+    CHUNK_SIZE = 256 * 1024
+
+    def __init__(
+        self,
+        max_size: int | None = None,
+        max_attempts: int | None = None,
+        retry_delay: float = 1.0,
+    ):
+        self.max_size = max_size or settings.GENERATION_DOWNLOAD_MAX_SIZE_MB * MB
+        self.max_attempts = max_attempts or settings.GENERATION_DOWNLOAD_ATTEMPTS
+        self.retry_delay = retry_delay
+        self.stats = DownloadStats()
+
+    async def download(self, url: str, dest_dir: Path, stem: str) -> DownloadResult:
+        """Download URL to `dest_dir/<stem><ext>`."""
+        await asyncio.to_thread(dest_dir.mkdir, parents=True, exist_ok=True)
+        part_path = dest_dir / f"{stem}.part"
+        ext = guess_extension(url)
+        started = time.monotonic()
+
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                try:
+                    ext = await self._transfer(url, part_path, ext)
+                    break
+                except _RetryableDownloadError as e:
+                    if attempt == self.max_attempts:
+                        raise ExternalAPIError(service="download", message=str(e)) from e
+                    self.stats.resumes += 1
+                    logger.warning(
+                        f"Download interrupted, retrying | url={url}, "
+                        f"attempt={attempt}, error={e}"
+                    )
+                    await asyncio.sleep(self.retry_delay * attempt)
+
+            file_path = dest_dir / f"{stem}{ext}"
+            await asyncio.to_thread(os.replace, part_path, file_path)
+            size = (await asyncio.to_thread(file_path.stat)).st_size
+
+        except asyncio.CancelledError:
+            # Worker shutdown: the redelivered job resumes from the part file
+            raise
+        except BaseException:
+            # The generation is failed and refunded, nothing would resume the part file
+            self.stats.failures += 1
+            await asyncio.to_thread(part_path.unlink, missing_ok=True)
+            raise
+
+        result = DownloadResult(
+            path=file_path,
+            size=size,
+            elapsed=time.monotonic() - started,
+            attempts=attempt,
+        )
+        self.stats.files += 1
+        self.stats.bytes += result.size
+        self.stats.seconds += result.elapsed
+
+        logger.debug(
+            f"Result downloaded | path={file_path}, size={result.size}, "
+            f"elapsed={result.elapsed:.2f}s, rate={result.bytes_per_sec / MB:.2f}MB/s, "
+            f"attempts={attempt}"
+        )
+        return result
+
+    async def _transfer(self, url: str, part_path: Path, ext: str) -> str:
+        """Stream one attempt into the part file. Returns the resolved extension."""
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        client = get_http_client("downloads")
+
+        try:
+            async with client.stream("GET", url, headers=headers) as response:
+                if offset and response.status_code == 416:
+                    # Range starts at the end of the file: previous attempt got everything
+                    return ext
+
+                if response.status_code >= 500 or response.status_code == 429:
+                    raise _RetryableDownloadError(f"HTTP {response.status_code}")
+                response.raise_for_status()
+
+                if response.status_code != 206:
+                    # Server ignored Range, start over
+                    offset = 0
+
+                content_length = response.headers.get("content-length")
+                if content_length and offset + int(content_length) > self.max_size:
+                    raise ExternalAPIError(
+                        service="download",
+                        message=f"файл больше {self.max_size // MB} МБ",
+                    )
+
+                if ext == ".png":
+                    ext = guess_extension(url, response.headers.get("content-type", ""))
+
+                file = await asyncio.to_thread(open, part_path, "ab" if offset else "wb")
+                try:
+                    await self._write_stream(response, file, offset)
+                finally:
+                    await asyncio.to_thread(file.close)
+
+        except httpx.TransportError as e:
+            raise _RetryableDownloadError(str(e) or type(e).__name__) from e
+
+        return ext
+
+    async def _write_stream(self, response: httpx.Response, file: BinaryIO, offset: int) -> None:
+        written = offset
+        async for chunk in response.aiter_bytes(self.CHUNK_SIZE):
+            written += len(chunk)
+            if written > self.max_size:
+                raise ExternalAPIError(
+                    service="download",
+                    message=f"файл больше {self.max_size // MB} МБ",
+                )
+            await asyncio.to_thread(file.write, chunk)
+
+
+result_downloader = ResultDownloader()
@@ -0,0 +1,169 @@
+"""Generation status events for push channels."""
+
+import asyncio
+import json
+import uuid
+
+from sqlalchemy.orm import Session
+
+from src.config import settings
+from src.core.hooks import on_commit
+from src.core.redis import get_redis
+from src.shared.enums import GenerationStatus
+from src.shared.logger import logger
+
+# Per-user event stream, trimmed to the last events; clients resume from an event ID
+STREAM_MAXLEN = 100
+STREAM_TTL = 24 * 60 * 60
+
+# Latest status of a generation, for long-poll requests
+STATUS_TTL = 60 * 60
+
+# Statuses only move forward; a lower one is a stale or reordered publish
+STATUS_ORDER = {
+    GenerationStatus.PENDING.value: 0,
+    GenerationStatus.PROCESSING.value: 1,
+    GenerationStatus.SUCCESS.value: 2,
+    GenerationStatus.FAILED.value: 2,
+    GenerationStatus.CANCELLED.value: 2,
+}
+
+_PENDING_KEY = "generation_events"
+
+
+def stream_key(user_id: int) -> str:
+    return f"generation_events:{user_id}"
+
+
+def status_key(generation_id: uuid.UUID | str) -> str:
+    return f"generation_status:{generation_id}"
+
+
+def result_file_url(result_file_path: str | None) -> str | None:
+    """Public URL of a downloaded result."""
+    if not result_file_path:
+        return None
+    file_name = result_file_path.split("/")[-1]
+    return f"{settings.WEBAPP_URL}/static/generations/{file_name}"
+
+
+def queue_status_event(
+    session: Session,
+    user_id: int,
+    generation_id: uuid.UUID,
+    status: GenerationStatus,
+    result_url: str | None = None,
+    result_file_path: str | None = None,
+    error_message: str | None = None,
+) -> None:
+    """
+    Queue a status change to publish once the session commits.
+
+    Events of rolled back transactions are dropped, so subscribers never
+    see a status the database does not have.
+    """
+    on_commit(session, _PENDING_KEY, publish_status_events, list).append({
+        "user_id": user_id,
+        "generation_id": str(generation_id),
+        "status": status.value,
+        "result_url": result_url,
+        "result_file_url": result_file_url(result_file_path),
+        "error_message": error_message,
+    })
+
+
+async def publish_status_events(events: list[dict]) -> None:
+    """Append events to the users' streams."""
+    try:
+        client = await get_redis()
+        async with client.pipeline(transaction=False) as pipe:
+            for item in events:
+                key = stream_key(item["user_id"])
+                fields = {k: v for k, v in item.items() if v is not None and k != "user_id"}
+                pipe.xadd(key, fields, maxlen=STREAM_MAXLEN, approximate=True)
+                pipe.expire(key, STREAM_TTL)
+
+                snapshot = json.dumps(item)
+                pipe.set(status_key(item["generation_id"]), snapshot, ex=STATUS_TTL)
+                pipe.publish(status_key(item["generation_id"]), snapshot)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to publish generation events | count={len(events)}, error={e}")
+
+
+async def read_status_events(
+    user_id: int,
+    last_event_id: str,
+    block_ms: int,
+) -> list[tuple[str, dict]]:
+    """Read events after `last_event_id`, waiting up to `block_ms` for new ones."""
+    client = await get_redis()
+    response = await client.xread({stream_key(user_id): last_event_id}, block=block_ms, count=50)
+    if not response:
+        return []
+    _, entries = response[0]
+    return entries
+
+
+async def latest_event_id(user_id: int) -> str:
+    """ID of the newest event in the user's stream, "0" if empty."""
+    client = await get_redis()
+    entries = await client.xrevrange(stream_key(user_id), count=1)
+    return entries[0][0] if entries else "0"
+
+
+async def get_status_snapshot(generation_id: uuid.UUID) -> dict | None:
+    """Latest published status of a generation, None if unknown."""
+    client = await get_redis()
+    value = await client.get(status_key(generation_id))
+    return json.loads(value) if value else None
+
+
+async def wait_status_change(
+    generation_id: uuid.UUID,
+    current_status: str,
+    timeout: float,
+) -> dict | None:
+    """
+    Wait until the generation advances past `current_status`.
+
+    Returns the new status snapshot, or None on timeout or Redis errors.
+    Uses only Redis.
+    Snapshots that are not ahead of `current_status` (failed or reordered
+    publishes) are ignored.
+    """
+    current_rank = STATUS_ORDER[current_status]
+    pubsub = None
+    try:
+        client = await get_redis()
+        pubsub = client.pubsub()
+        # Subscribe before reading the snapshot, so a change in between is not lost
+        await pubsub.subscribe(status_key(generation_id))
+
+        snapshot = await get_status_snapshot(generation_id)
+        if snapshot and STATUS_ORDER[snapshot["status"]] > current_rank:
+            return snapshot
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            message = await pubsub.get_message(
+                ignore_subscribe_messages=True, timeout=remaining
+            )
+            if message and message["type"] == "message":
+                snapshot = json.loads(message["data"])
+                if STATUS_ORDER[snapshot["status"]] > current_rank:
+                    return snapshot
+        return None
+    except Exception as e:
+        # The caller already has the current status, answer with it
+        logger.warning(f"Status wait failed | id={generation_id}, error={e}")
+        return None
+    finally:
+        if pubsub is not None:
+            try:
+                await pubsub.unsubscribe()
+                await pubsub.aclose()
+            except Exception as e:
+                logger.debug(f"Status pubsub cleanup failed | id={generation_id}, error={e}")
+
@@ -0,0 +1,282 @@
+"""Generation jobs for the durable worker queue."""
+
+import time
+import uuid
+from dataclasses import asdict
+
+from sqlalchemy import select
+
+from src.config import settings
+from src.core.database import background_session_maker
+from src.core.queue import Job, JobQueue
+from src.modules.generation.circuit import circuit_breakers
+from src.modules.generation.providers import GenerationTask
+from src.modules.generation.schedule import polling_schedule
+from src.shared.constants import GENERATION_MAX_POLL_ATTEMPTS, GENERATION_POLL_INTERVAL
+from src.shared.enums import GenerationType
+from src.shared.logger import logger
+
+JOB_CREATE = "generation.create"
+JOB_POLL = "generation.poll"
+JOB_DOWNLOAD = "generation.download"
+JOB_THUMBNAIL = "generation.thumbnail"
+
+POLL_TIMEOUT = GENERATION_POLL_INTERVAL * GENERATION_MAX_POLL_ATTEMPTS
+
+generation_queue = JobQueue(
+    "generation",
+    visibility_timeout=settings.GENERATION_QUEUE_VISIBILITY_TIMEOUT,
+)
+
+
+def queue_enabled() -> bool:
+    """Check if generation work runs in worker processes."""
+    return settings.GENERATION_QUEUE_ENABLED
+
+
+def poll_job_id(generation_id: uuid.UUID) -> str:
+    """Poll job ID is stable, so a generation has at most one poll job."""
+    return f"poll:{generation_id}"
+
+
+# === Enqueue ===
+
+async def enqueue_create(
+    generation_id: uuid.UUID,
+    provider_model: str,
+    provider_name: str,
+    telegram_id: int | None = None,
+    model_code: str | None = None,
+) -> None:
+    """Submit generation to the provider in a worker."""
+    await generation_queue.enqueue(Job(
+        id=f"create:{generation_id}",
+        kind=JOB_CREATE,
+        payload={
+            "generation_id": str(generation_id),
+            "provider_model": provider_model,
+            "provider_name": provider_name,
+            "telegram_id": telegram_id,
+            "model_code": model_code,
+        },
+        # Submitting twice would charge the provider twice
+        max_attempts=1,
+    ))
+
+
+async def enqueue_poll(
+    generation_id: uuid.UUID,
+    task_id: str,
+    provider_name: str,
+    telegram_id: int | None = None,
+    model_code: str | None = None,
+    generation_type: GenerationType | None = None,
+    started_at: float | None = None,
+) -> None:
+    """Track provider task status in workers."""
+    await generation_queue.enqueue(
+        Job(
+            id=poll_job_id(generation_id),
+            kind=JOB_POLL,
+            payload={
+                "generation_id": str(generation_id),
+                "task_id": task_id,
+                "provider_name": provider_name,
+                "telegram_id": telegram_id,
+                "model_code": model_code,
+                "generation_type": generation_type.value if generation_type else None,
+                "started_at": started_at or time.time(),
+            },
+        ),
+        delay=polling_schedule.next_delay(0.0, model_code, generation_type),
+    )
+
+
+async def enqueue_download(
+    generation_id: uuid.UUID,
+    task: GenerationTask,
+    provider_name: str,
+    telegram_id: int | None = None,
+) -> None:
+    """Download and save a terminal task result in a worker."""
+    await generation_queue.enqueue(Job(
+        id=f"download:{generation_id}",
+        kind=JOB_DOWNLOAD,
+        payload={
+            "generation_id": str(generation_id),
+            "task": asdict(task),
+            "provider_name": provider_name,
+            "telegram_id": telegram_id,
+        },
+    ))
+
+
+async def enqueue_thumbnail(generation_id: uuid.UUID, file_path: str) -> None:
+    """Extract video thumbnail in a worker."""
+    await generation_queue.enqueue(Job(
+        id=f"thumbnail:{generation_id}",
+        kind=JOB_THUMBNAIL,
+        payload={"generation_id": str(generation_id), "file_path": file_path},
+    ))
+
+
+async def cancel_poll(generation_id: uuid.UUID) -> None:
+    """Stop polling a generation that completed via callback."""
+    await generation_queue.cancel(poll_job_id(generation_id))
+
+
+async def resume_pending(limit: int = 1000) -> int:
+    """Enqueue poll jobs for pending generations. Existing jobs are kept."""
+    from src.modules.generation.repository import GenerationRepository
+    from src.modules.user.models import User
+
+    async with background_session_maker() as session:
+        repo = GenerationRepository(session)
+        generations = await repo.get_pending_generations(limit=limit)
+
+        user_ids = {gen.user_id for gen in generations}
+        telegram_ids: dict[int, int] = {}
+        if user_ids:
+            result = await session.execute(
+                select(User.id, User.telegram_id).where(User.id.in_(user_ids))
+            )
+            telegram_ids = dict(result.all())
+
+    for gen in generations:
+        await enqueue_poll(
+            gen.id,
+            gen.kie_task_id,
+            provider_name=gen.params.get("_provider", "kie.ai"),
+            telegram_id=telegram_ids.get(gen.user_id),
+            model_code=gen.model.code if gen.model else None,
+            generation_type=gen.generation_type,
+            started_at=gen.created_at.timestamp() if gen.created_at else None,
+        )
+
+    logger.info(f"Pending generations queued for polling | count={len(generations)}")
+    return len(generations)
+
+
+# === Handlers ===
+# A handler returns True when it rescheduled the job itself, so it must not be acked.
+
+async def handle_create(job: Job) -> None:
+    from src.modules.generation.service import GenerationService
+
+    payload = job.payload
+    async with background_session_maker() as session:
+        service = GenerationService(session)
+        generation = await service.generation_repo.get_by_id(uuid.UUID(payload["generation_id"]))
+        if not generation or generation.is_completed or generation.kie_task_id:
+            return
+        await service._process_generation(
+            generation,
+            payload["provider_model"],
+            payload["provider_name"],
+            payload["telegram_id"],
+            model_code=payload["model_code"],
+        )
+
+
+async def handle_poll(job: Job) -> bool:
+    """Check task status once. Returns True if the job was rescheduled."""
+    from src.modules.generation.service import GenerationService, get_provider
+
+    payload = job.payload
+    generation_id = uuid.UUID(payload["generation_id"])
+    provider_name = payload["provider_name"]
+    generation_type = (
+        GenerationType(payload["generation_type"]) if payload.get("generation_type") else None
+    )
+
+    task: GenerationTask | None = None
+    try:
+        task = await get_provider(provider_name).get_task_status(payload["task_id"])
+    except Exception as e:
+        logger.error(
+            f"Polling error | id={generation_id}, provider={provider_name}, error={e}"
+        )
+
+    if task and task.status in ("success", "failed"):
+        await enqueue_download(generation_id, task, provider_name, payload["telegram_id"])
+        return False
+
+    elapsed = time.time() - payload["started_at"]
+    timeout = polling_schedule.timeout_for(POLL_TIMEOUT, payload["model_code"], generation_type)
+    if elapsed >= timeout:
+        async with background_session_maker() as session:
+            await GenerationService(session).fail_generation(
+                generation_id,
+                error_message="Timeout: превышено время ожидания",
+                telegram_id=payload["telegram_id"],
+                notice="❌ Генерация не удалась (timeout). Токены возвращены на баланс.",
+            )
+        return False
+
+    delay = polling_schedule.next_delay(elapsed, payload["model_code"], generation_type)
+    await generation_queue.reschedule(job, circuit_breakers.poll_delay(provider_name, delay))
+    return True
+
+
+async def handle_download(job: Job) -> None:
+    from src.modules.generation.service import GenerationService
+
+    payload = job.payload
+    async with background_session_maker() as session:
+        await GenerationService(session).handle_task_result(
+            uuid.UUID(payload["generation_id"]),
+            GenerationTask(**payload["task"]),
+            provider_name=payload["provider_name"],
+            telegram_id=payload["telegram_id"],
+        )
+
+
+async def handle_thumbnail(job: Job) -> None:
+    from src.modules.gallery.repository import GalleryRepository
+    from src.modules.generation.service import GenerationService
+
+    payload = job.payload
+    async with background_session_maker() as session:
+        thumbnail_path = await GenerationService(session)._generate_video_thumbnail(
+            payload["file_path"]
+        )
+        if thumbnail_path:
+            await GalleryRepository(session).set_thumbnail(
+                uuid.UUID(payload["generation_id"]), thumbnail_path
+            )
+            await session.commit()
+
+
+async def abandon_create(job: Job) -> None:
+    """
+    Fail the generation of an interrupted submission instead of submitting again.
+
+    The provider may have been called already, but without a task ID
+    the result can never be tracked, so the user gets the tokens back.
+    """
+    from src.modules.generation.service import GenerationService
+
+    payload = job.payload
+    async with background_session_maker() as session:
+        service = GenerationService(session)
+        generation = await service.generation_repo.get_by_id(uuid.UUID(payload["generation_id"]))
+        if not generation or generation.is_completed or generation.kie_task_id:
+            return
+        await service.fail_generation(
+            generation.id,
+            error_message="Отправка прервана",
+            telegram_id=payload["telegram_id"],
+        )
+
+
+HANDLERS = {
+    JOB_CREATE: handle_create,
+    JOB_POLL: handle_poll,
+    JOB_DOWNLOAD: handle_download,
+    JOB_THUMBNAIL: handle_thumbnail,
+}
+
+# Run instead of the handler for jobs redelivered past their max_attempts
+ABANDON_HANDLERS = {
+    JOB_CREATE: abandon_create,
+}
@@ -3,18 +3,49 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    func,
+    text,
+)
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
 from src.shared.enums import GenerationStatus, GenerationType
 
+ACTIVE_GENERATIONS = "status IN ('PENDING', 'PROCESSING') AND kie_task_id IS NOT NULL"
+
 
 class Generation(Base):
     """Generation task model."""
 
     __tablename__ = "generations"
+    __table_args__ = (
+        # Keyset pagination of user history
+        Index("ix_generations_user_id_created_at", "user_id", "created_at", "id"),
+        # User history filtered by type
+        Index(
+            "ix_generations_user_id_type_created_at",
+            "user_id", "generation_type", "created_at", "id",
+        ),
+        # Completion times per model (ETA estimates)
+        Index("ix_generations_model_id_status_created_at", "model_id", "status", "created_at"),
+        # Generations being polled: a small slice of the table
+        Index(
+            "ix_generations_active",
+            "created_at",
+            postgresql_where=text(ACTIVE_GENERATIONS),
+            sqlite_where=text(ACTIVE_GENERATIONS),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -45,6 +76,11 @@ class Generation(Base):
     result_file_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
     result_url: Mapped[str | None] = mapped_column(Text, nullable=True)  # Temporary kie.ai URL
     
+    # Variants created together share a batch
+    batch_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), nullable=True, index=True
+    )
+
     # Provider data
     kie_task_id: Mapped[str | None] = mapped_column(String(255), nullable=True, index=True)
     
@@ -62,7 +98,7 @@ class Generation(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
-    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="generations")
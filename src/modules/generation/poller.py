@@ -0,0 +1,318 @@
+"""Centralized status poller for in-flight provider tasks."""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+
+from sqlalchemy import select
+
+from src.config import settings
+from src.core.database import background_session_maker
+from src.modules.generation.callbacks import callbacks_enabled
+from src.modules.generation.circuit import circuit_breakers
+from src.modules.generation.providers import GenerationTask
+from src.modules.generation.schedule import PollingSchedule, polling_schedule
+from src.shared.constants import GENERATION_MAX_POLL_ATTEMPTS, GENERATION_POLL_INTERVAL
+from src.shared.enums import GenerationType
+from src.shared.logger import logger
+
+
+@dataclass
+class PollEntry:
+    """In-flight provider task tracked by the poller."""
+    generation_id: uuid.UUID
+    task_id: str
+    provider_name: str
+    telegram_id: int | None = None
+    model_code: str | None = None
+    generation_type: GenerationType | None = None
+    attempts: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    next_poll_at: float = 0.0
+    timeout: float = 0.0
+    in_flight: bool = False
+
+
+class GenerationPoller:
+    """
+    Single per-process poller for all in-flight generations.
+
+    Keeps a registry of provider task IDs grouped by provider, wakes up
+    once per tick, checks every due task with bounded concurrency and
+    hands terminal results over to GenerationService handlers. When each
+    task is checked next is decided by the polling schedule.
+    """
+
+    def __init__(
+        self,
+        schedule: PollingSchedule = polling_schedule,
+        timeout: float = GENERATION_POLL_INTERVAL * GENERATION_MAX_POLL_ATTEMPTS,
+        tick: float | None = None,
+        concurrency: int | None = None,
+    ):
+        self.schedule = schedule
+        self.timeout = timeout
+        self.tick = tick or settings.GENERATION_POLL_TICK
+        self.concurrency = concurrency or settings.GENERATION_POLL_CONCURRENCY
+        self._registry: dict[str, dict[str, PollEntry]] = {}
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._loop_task: asyncio.Task | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    # === Registry ===
+
+    def register(
+        self,
+        generation_id: uuid.UUID,
+        task_id: str,
+        provider_name: str,
+        telegram_id: int | None = None,
+        model_code: str | None = None,
+        generation_type: GenerationType | None = None,
+    ) -> PollEntry:
+        """Start tracking a provider task."""
+        entry = PollEntry(
+            generation_id=generation_id,
+            task_id=task_id,
+            provider_name=provider_name,
+            telegram_id=telegram_id,
+            model_code=model_code,
+            generation_type=generation_type,
+        )
+        entry.next_poll_at = entry.started_at + self._next_delay(entry, 0.0)
+        entry.timeout = self.schedule.timeout_for(self.timeout, model_code, generation_type)
+        self._registry.setdefault(provider_name, {})[task_id] = entry
+        logger.debug(
+            f"Poller registered | generation_id={generation_id}, "
+            f"task_id={task_id}, provider={provider_name}"
+        )
+        return entry
+
+    def unregister(self, provider_name: str, task_id: str) -> PollEntry | None:
+        """Stop tracking a provider task. Returns the entry if it was tracked."""
+        return self._registry.get(provider_name, {}).pop(task_id, None)
+
+    def get(self, provider_name: str, task_id: str) -> PollEntry | None:
+        """Get tracked entry."""
+        return self._registry.get(provider_name, {}).get(task_id)
+
+    @property
+    def size(self) -> int:
+        """Number of tracked tasks."""
+        return sum(len(entries) for entries in self._registry.values())
+
+    def stats(self) -> list[dict]:
+        """Tracked tasks per provider, with the age of the oldest one."""
+        now = time.monotonic()
+        return [
+            {
+                "provider": provider_name,
+                "tracked": len(entries),
+                "in_flight": sum(entry.in_flight for entry in entries.values()),
+                "oldest_age": round(
+                    max((now - entry.started_at for entry in entries.values()), default=0.0), 1
+                ),
+            }
+            for provider_name, entries in self._registry.items()
+        ]
+
+    async def load_pending(self, limit: int = 1000) -> int:
+        """Reload registry from pending/processing generations in the database."""
+        from src.modules.generation.repository import GenerationRepository
+        from src.modules.user.models import User
+
+        async with background_session_maker() as session:
+            repo = GenerationRepository(session)
+            generations = await repo.get_pending_generations(limit=limit)
+
+            user_ids = {gen.user_id for gen in generations}
+            telegram_ids: dict[int, int] = {}
+            if user_ids:
+                result = await session.execute(
+                    select(User.id, User.telegram_id).where(User.id.in_(user_ids))
+                )
+                telegram_ids = dict(result.all())
+
+        for gen in generations:
+            if self.get(gen.params.get("_provider", "kie.ai"), gen.kie_task_id):
+                continue
+            self.register(
+                gen.id,
+                gen.kie_task_id,
+                provider_name=gen.params.get("_provider", "kie.ai"),
+                telegram_id=telegram_ids.get(gen.user_id),
+                model_code=gen.model.code if gen.model else None,
+                generation_type=gen.generation_type,
+            )
+
+        if generations:
+            logger.info(f"Poller resumed {len(generations)} pending generations")
+        else:
+            logger.info("No pending generations to resume")
+        return len(generations)
+
+    # === Lifecycle ===
+
+    async def start(self) -> None:
+        """Start the polling loop."""
+        if self._loop_task and not self._loop_task.done():
+            return
+        self._loop_task = asyncio.create_task(self._run(), name="generation-poller")
+        logger.info(
+            f"Generation poller started | tick={self.tick}s, concurrency={self.concurrency}"
+        )
+
+    async def stop(self) -> None:
+        """Stop the polling loop and cancel in-flight checks."""
+        if self._loop_task:
+            self._loop_task.cancel()
+            await asyncio.gather(self._loop_task, return_exceptions=True)
+            self._loop_task = None
+
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        logger.info(f"Generation poller stopped | tracked={self.size}")
+
+    async def _run(self) -> None:
+        """Main loop: one wakeup per tick for all tracked tasks."""
+        while True:
+            await asyncio.sleep(self.tick)
+            try:
+                self._poll_due()
+            except Exception as e:
+                logger.exception(f"Poller tick failed | error={e}")
+
+    def _poll_due(self) -> None:
+        """Spawn checks for all entries that are due."""
+        now = time.monotonic()
+        for entries in self._registry.values():
+            for entry in list(entries.values()):
+                if entry.in_flight or entry.next_poll_at > now:
+                    continue
+                entry.in_flight = True
+                self._spawn(self._check(entry))
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    # === Checks ===
+
+    async def _check(self, entry: PollEntry) -> None:
+        """Check one task status and dispatch terminal results."""
+        from src.modules.generation.service import get_provider
+
+        provider = get_provider(entry.provider_name)
+        entry.attempts += 1
+        task: GenerationTask | None = None
+
+        try:
+            async with self._semaphore:
+                task = await provider.get_task_status(entry.task_id)
+        except Exception as e:
+            logger.error(
+                f"Polling error | id={entry.generation_id}, attempt={entry.attempts}, "
+                f"provider={entry.provider_name}, error={e}"
+            )
+        finally:
+            entry.in_flight = False
+
+        if task and task.status in ("success", "failed"):
+            await self.dispatch(entry.provider_name, entry.task_id, task)
+            return
+
+        elapsed = time.monotonic() - entry.started_at
+        if elapsed >= entry.timeout:
+            await self.dispatch_timeout(entry)
+            return
+
+        if task and entry.attempts % 10 == 1:
+            logger.debug(
+                f"Generation polling | id={entry.generation_id}, "
+                f"attempt={entry.attempts}, status={task.status}, "
+                f"provider={entry.provider_name}"
+            )
+
+        entry.next_poll_at = time.monotonic() + self._next_delay(entry, elapsed)
+
+    def _next_delay(self, entry: PollEntry, elapsed: float) -> float:
+        delay = self.schedule.next_delay(elapsed, entry.model_code, entry.generation_type)
+        if callbacks_enabled():
+            # Providers report completion via callbacks, polling is only a slow sweep
+            delay = max(delay, settings.GENERATION_CALLBACK_FALLBACK_INTERVAL)
+        return circuit_breakers.poll_delay(entry.provider_name, delay)
+
+    async def dispatch(
+        self,
+        provider_name: str,
+        task_id: str,
+        task: GenerationTask,
+    ) -> None:
+        """Hand a terminal task result over to the generation handlers."""
+        entry = self.unregister(provider_name, task_id)
+        if not entry:
+            return
+
+        await self.complete(
+            entry.generation_id,
+            task,
+            provider_name=provider_name,
+            telegram_id=entry.telegram_id,
+        )
+
+    async def complete(
+        self,
+        generation_id: uuid.UUID,
+        task: GenerationTask,
+        provider_name: str,
+        telegram_id: int | None = None,
+    ) -> None:
+        """Run completion handlers for a terminal task in a fresh session."""
+        from src.modules.generation.service import GenerationService
+
+        try:
+            async with background_session_maker() as session:
+                service = GenerationService(session)
+                await service.handle_task_result(
+                    generation_id,
+                    task,
+                    provider_name=provider_name,
+                    telegram_id=telegram_id,
+                )
+        except Exception as e:
+            logger.exception(f"Generation completion failed | id={generation_id}, error={e}")
+
+    def complete_in_background(
+        self,
+        generation_id: uuid.UUID,
+        task: GenerationTask,
+        provider_name: str,
+        telegram_id: int | None = None,
+    ) -> None:
+        """Schedule completion handlers without blocking the caller (e.g. a callback)."""
+        self._spawn(self.complete(generation_id, task, provider_name, telegram_id))
+
+    async def dispatch_timeout(self, entry: PollEntry) -> None:
+        """Fail a task that exceeded the polling timeout."""
+        from src.modules.generation.service import GenerationService
+
+        if not self.unregister(entry.provider_name, entry.task_id):
+            return
+
+        async with background_session_maker() as session:
+            service = GenerationService(session)
+            await service.fail_generation(
+                entry.generation_id,
+                error_message="Timeout: превышено время ожидания",
+                telegram_id=entry.telegram_id,
+                notice="❌ Генерация не удалась (timeout). Токены возвращены на баланс.",
+            )
+
+
+# Per-process poller instance
+generation_poller = GenerationPoller()
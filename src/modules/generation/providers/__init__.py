@@ -6,6 +6,7 @@ from src.modules.generation.providers.base import (
     GenerationTask,
 )
 from src.modules.generation.providers.kie import KieProvider, kie_provider
+from src.modules.generation.providers.limiter import RateLimitedProvider
 from src.modules.generation.providers.poyo import PoyoProvider, poyo_provider
 
 __all__ = [
@@ -16,5 +17,6 @@ __all__ = [
     "kie_provider",
     "PoyoProvider",
     "poyo_provider",
+    "RateLimitedProvider",
 ]
 
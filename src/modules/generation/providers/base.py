@@ -28,6 +28,8 @@ class GenerationRequest:
     duration: int | None = None
     output_format: str = "png"
     extra_params: dict | None = None
+    callback_url: str | None = None
+    user_id: int | None = None          # for per-user fairness in rate limiting
 
 
 class BaseGenerationProvider(ABC):
@@ -48,3 +50,15 @@ class BaseGenerationProvider(ABC):
         """Cancel a generation task."""
         pass
 
+    def endpoint_for_request(self, request: GenerationRequest) -> str:
+        """Rate limit bucket of a create request."""
+        return "jobs"
+
+    def endpoint_for_task(self, task_id: str) -> str:
+        """Rate limit bucket of a task status request."""
+        return "jobs"
+
+    def parse_callback(self, payload: dict) -> GenerationTask:
+        """Parse task completion callback sent by the provider."""
+        raise NotImplementedError(f"{type(self).__name__} does not support callbacks")
+
@@ -6,6 +6,7 @@ from typing import Any
 
 from src.config import settings
 from src.core.exceptions import ExternalAPIError
+from src.core.http import get_http_client
 from src.modules.generation.providers.base import (
     BaseGenerationProvider,
     GenerationRequest,
@@ -36,45 +37,55 @@ class KieProvider(BaseGenerationProvider):
         """Make HTTP request to kie.ai API."""
         url = f"{self.BASE_URL}{endpoint}"
         
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=self.headers,
-                    json=json_data,
-                    params=params,
-                )
-                
-                data = response.json()
-                
-                logger.debug(
-                    f"kie.ai response | endpoint={endpoint}, "
-                    f"status={response.status_code}, code={data.get('code')}"
+        client = get_http_client("kie.ai")
+        try:
+            response = await client.request(
+                method=method,
+                url=url,
+                headers=self.headers,
+                json=json_data,
+                params=params,
+            )
+            
+            data = response.json()
+            
+            logger.debug(
+                f"kie.ai response | endpoint={endpoint}, "
+                f"status={response.status_code}, code={data.get('code')}"
+            )
+            
+            if response.status_code != 200:
+                raise ExternalAPIError(
+                    service="kie.ai",
+                    message=data.get("msg", "Unknown error"),
+                    status_code=response.status_code,
                 )
-                
-                if response.status_code != 200:
-                    raise ExternalAPIError(
-                        service="kie.ai",
-                        message=data.get("msg", "Unknown error"),
-                        status_code=response.status_code,
-                    )
-                
-                if data.get("code") != 200:
-                    raise ExternalAPIError(
-                        service="kie.ai",
-                        message=data.get("msg", "API error"),
-                        status_code=data.get("code"),
-                    )
-                
-                return data
-                
-            except httpx.RequestError as e:
-                logger.error(f"kie.ai request failed | error={e}")
+            
+            if data.get("code") != 200:
                 raise ExternalAPIError(
                     service="kie.ai",
-                    message=str(e),
+                    message=data.get("msg", "API error"),
+                    status_code=data.get("code"),
                 )
+            
+            return data
+            
+        except httpx.RequestError as e:
+            logger.error(f"kie.ai request failed | error={e}")
+            raise ExternalAPIError(
+                service="kie.ai",
+                message=str(e),
+            )
+
+    # Map kie.ai states to our states
+    _STATUS_MAP = {
+        "waiting": "pending",
+        "queuing": "pending",
+        "generating": "processing",
+        "success": "success",
+        "fail": "failed",
+        "failed": "failed",
+    }
 
     # Veo-модели используют отдельные эндпоинты
     _VEO_MODELS = {"veo3", "veo3_fast"}
@@ -82,6 +93,12 @@ class KieProvider(BaseGenerationProvider):
     def _is_veo(self, model: str) -> bool:
         return model in self._VEO_MODELS
 
+    def endpoint_for_request(self, request: GenerationRequest) -> str:
+        return "veo" if self._is_veo(request.model) else "jobs"
+
+    def endpoint_for_task(self, task_id: str) -> str:
+        return "veo" if task_id.startswith("veo_") else "jobs"
+
     async def _create_veo_task(self, request: GenerationRequest) -> GenerationTask:
         """Создать задачу через veo-эндпоинт /api/v1/veo/generate."""
         # Определяем тип генерации
@@ -101,6 +118,9 @@ class KieProvider(BaseGenerationProvider):
             elif request.image_url:
                 payload["imageUrls"] = [request.image_url]
 
+        if request.callback_url:
+            payload["callBackUrl"] = request.callback_url
+
         logger.info(f"Creating kie.ai veo task | model={request.model}, generationType={generation_type}")
         logger.debug(f"kie.ai veo payload | {payload}")
 
@@ -136,18 +156,17 @@ class KieProvider(BaseGenerationProvider):
             params={"taskId": real_task_id},
         )
 
-        data = response.get("data", {})
-        state = data.get("state", "unknown")
+        task = self._parse_veo_record(task_id, response.get("data", {}), response)
+        logger.debug(
+            f"kie.ai veo task status | task_id={task_id}, "
+            f"status={task.status}, result_url={task.result_url}"
+        )
+        return task
 
-        status_map = {
-            "waiting": "pending",
-            "queuing": "pending",
-            "generating": "processing",
-            "success": "success",
-            "fail": "failed",
-            "failed": "failed",
-        }
-        status = status_map.get(state, state)
+    def _parse_veo_record(self, task_id: str, data: dict, response: dict) -> GenerationTask:
+        """Map veo record-info data to GenerationTask."""
+        state = data.get("state", "unknown")
+        status = self._STATUS_MAP.get(state, state)
 
         result_url = None
         error = None
@@ -161,8 +180,6 @@ class KieProvider(BaseGenerationProvider):
         elif status == "failed":
             error = data.get("errorMessage") or data.get("failMsg") or "Generation failed"
 
-        logger.debug(f"kie.ai veo task status | task_id={task_id}, status={status}, result_url={result_url}")
-
         return GenerationTask(
             task_id=task_id,
             status=status,
@@ -228,6 +245,8 @@ class KieProvider(BaseGenerationProvider):
             "model": request.model,
             "input": input_data,
         }
+        if request.callback_url:
+            payload["callBackUrl"] = request.callback_url
         
         logger.info(f"Creating kie.ai task | model={request.model}, motion_control={is_motion_control}")
         logger.debug(f"kie.ai payload | {payload}")
@@ -266,21 +285,18 @@ class KieProvider(BaseGenerationProvider):
             endpoint="/jobs/recordInfo",
             params={"taskId": task_id},
         )
-        
-        data = response.get("data", {})
+
+        task = self._parse_job_record(task_id, response.get("data", {}), response)
+        logger.debug(
+            f"kie.ai task status | task_id={task_id}, "
+            f"status={task.status}, result_url={task.result_url}"
+        )
+        return task
+
+    def _parse_job_record(self, task_id: str, data: dict, response: dict) -> GenerationTask:
+        """Map jobs recordInfo data to GenerationTask."""
         state = data.get("state", "unknown")
-        
-        # Map kie.ai states to our states
-        status_map = {
-            "waiting": "pending",
-            "queuing": "pending",
-            "generating": "processing",
-            "success": "success",
-            "fail": "failed",
-            "failed": "failed",
-        }
-        
-        status = status_map.get(state, state)
+        status = self._STATUS_MAP.get(state, state)
         
         result_url = None
         error = None
@@ -308,9 +324,7 @@ class KieProvider(BaseGenerationProvider):
         
         elif status == "failed":
             error = data.get("errorMessage") or data.get("error") or data.get("failMsg") or "Generation failed"
-        
-        logger.debug(f"kie.ai task status | task_id={task_id}, status={status}, result_url={result_url}")
-        
+
         return GenerationTask(
             task_id=task_id,
             status=status,
@@ -319,6 +333,44 @@ class KieProvider(BaseGenerationProvider):
             raw_response=response,
         )
 
+    def parse_callback(self, payload: dict) -> GenerationTask:
+        """
+        Parse kie.ai callback payload.
+
+        Jobs callbacks carry the same record as /jobs/recordInfo.
+        Veo callbacks carry {"code", "msg", "data": {"taskId", "info": {"resultUrls"}}}.
+        """
+        data = payload.get("data") or {}
+        task_id = data.get("taskId")
+        if not task_id:
+            raise ExternalAPIError(service="kie.ai", message="No taskId in callback")
+
+        if "state" in data:
+            return self._parse_job_record(task_id, data, payload)
+
+        # Veo callback
+        info = data.get("info") or {}
+        result_urls = info.get("resultUrls") or data.get("resultUrls") or []
+        if isinstance(result_urls, str):
+            try:
+                result_urls = json.loads(result_urls)
+            except json.JSONDecodeError:
+                result_urls = [result_urls]
+
+        if payload.get("code") == 200 and result_urls:
+            return GenerationTask(
+                task_id=f"veo_{task_id}",
+                status="success",
+                result_url=result_urls[0],
+                raw_response=payload,
+            )
+        return GenerationTask(
+            task_id=f"veo_{task_id}",
+            status="failed",
+            error=payload.get("msg") or "Generation failed",
+            raw_response=payload,
+        )
+
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a generation task (if supported)."""
         logger.debug(f"Task cancellation not supported | task_id={task_id}")
@@ -0,0 +1,176 @@
+"""Rate limiting wrapper for generation providers."""
+
+import asyncio
+import time
+
+from src.config import settings
+from src.core.exceptions import ExternalAPIError
+from src.core.redis import get_redis
+from src.modules.generation.circuit import circuit_breakers, is_provider_failure
+from src.modules.generation.providers.base import (
+    BaseGenerationProvider,
+    GenerationRequest,
+    GenerationTask,
+)
+from src.shared.logger import logger
+
+# Token bucket shared by all processes. Returns 0 if a token was taken,
+# otherwise the number of milliseconds until one is available.
+_TOKEN_BUCKET_SCRIPT = """
+local key = KEYS[1]
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', key, 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+redis.call('PEXPIRE', key, math.ceil(burst * 1000 / rate) + 1000)
+return wait
+"""
+
+
+class RateLimitedProvider(BaseGenerationProvider):
+    """
+    Keep provider calls under its rate and concurrency limits.
+
+    Every call takes a token from a Redis token bucket of its endpoint
+    (e.g. kie.ai Veo and jobs APIs are limited separately) and a slot of
+    the per-process concurrency semaphore. Create requests of a single
+    user are additionally capped, so one user's burst cannot take all
+    slots while others wait.
+    """
+
+    def __init__(self, name: str, provider: BaseGenerationProvider):
+        self.name = name
+        self.provider = provider
+        self._semaphore = asyncio.Semaphore(
+            settings.PROVIDER_MAX_CONCURRENCY.get(name, settings.PROVIDER_DEFAULT_CONCURRENCY)
+        )
+        self._user_semaphores: dict[int, asyncio.Semaphore] = {}
+        self._user_waiters: dict[int, int] = {}
+
+    def _rate_for(self, endpoint: str) -> float:
+        limits = settings.PROVIDER_RATE_LIMITS
+        return limits.get(f"{self.name}:{endpoint}") or limits.get(self.name) or 0.0
+
+    async def _acquire_token(self, endpoint: str) -> None:
+        """Wait for a token of the endpoint bucket."""
+        rate = self._rate_for(endpoint)
+        if rate <= 0:
+            return
+
+        burst = max(1.0, rate * settings.PROVIDER_RATE_BURST_SECONDS)
+        key = f"ratelimit:{self.name}:{endpoint}"
+        deadline = time.monotonic() + settings.PROVIDER_RATE_LIMIT_MAX_WAIT
+
+        while True:
+            try:
+                client = await get_redis()
+                wait_ms = int(await client.eval(_TOKEN_BUCKET_SCRIPT, 1, key, rate, burst))
+            except Exception as e:
+                # Limiter must not take the provider down with Redis
+                logger.warning(f"Rate limiter unavailable | provider={self.name}, error={e}")
+                return
+
+            if wait_ms <= 0:
+                return
+
+            wait = wait_ms / 1000
+            if time.monotonic() + wait > deadline:
+                raise ExternalAPIError(
+                    service=self.name,
+                    message="превышен лимит запросов к провайдеру",
+                    status_code=429,
+                )
+            await asyncio.sleep(wait)
+
+    def _user_semaphore(self, user_id: int) -> asyncio.Semaphore:
+        semaphore = self._user_semaphores.get(user_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(settings.PROVIDER_USER_MAX_CONCURRENCY)
+            self._user_semaphores[user_id] = semaphore
+        return semaphore
+
+    async def _create_for_user(self, user_id: int, request: GenerationRequest) -> GenerationTask:
+        self._user_waiters[user_id] = self._user_waiters.get(user_id, 0) + 1
+        try:
+            async with self._user_semaphore(user_id):
+                return await self._call(
+                    self.provider.endpoint_for_request(request),
+                    self.provider.create_task,
+                    request,
+                    model=request.model,
+                )
+        finally:
+            self._user_waiters[user_id] -= 1
+            if not self._user_waiters[user_id]:
+                del self._user_waiters[user_id]
+                self._user_semaphores.pop(user_id, None)
+
+    async def _call(self, endpoint: str, method, *args, model: str | None = None):
+        # Token first: a caller throttled on one endpoint must not hold a
+        # slot the other endpoints of the provider are waiting for
+        await self._acquire_token(endpoint)
+        async with self._semaphore:
+            started = time.monotonic()
+            try:
+                result = await method(*args)
+            except Exception as e:
+                await circuit_breakers.record(
+                    self.name, model, ok=not is_provider_failure(e),
+                    latency=time.monotonic() - started,
+                )
+                raise
+            await circuit_breakers.record(
+                self.name, model, ok=True, latency=time.monotonic() - started,
+            )
+            return result
+
+    async def create_task(self, request: GenerationRequest) -> GenerationTask:
+        if request.user_id is not None:
+            return await self._create_for_user(request.user_id, request)
+        return await self._call(
+            self.provider.endpoint_for_request(request),
+            self.provider.create_task,
+            request,
+            model=request.model,
+        )
+
+    async def get_task_status(self, task_id: str) -> GenerationTask:
+        return await self._call(
+            self.provider.endpoint_for_task(task_id),
+            self.provider.get_task_status,
+            task_id,
+        )
+
+    async def cancel_task(self, task_id: str) -> bool:
+        return await self._call(
+            self.provider.endpoint_for_task(task_id),
+            self.provider.cancel_task,
+            task_id,
+        )
+
+    def endpoint_for_request(self, request: GenerationRequest) -> str:
+        return self.provider.endpoint_for_request(request)
+
+    def endpoint_for_task(self, task_id: str) -> str:
+        return self.provider.endpoint_for_task(task_id)
+
+    def parse_callback(self, payload: dict) -> GenerationTask:
+        return self.provider.parse_callback(payload)
+
+    def __getattr__(self, name: str):
+        # Provider-specific helpers (e.g. kie.ai get_credits) pass through unlimited
+        return getattr(self.provider, name)
@@ -4,6 +4,7 @@ import httpx
 
 from src.config import settings
 from src.core.exceptions import ExternalAPIError
+from src.core.http import get_http_client
 from src.modules.generation.providers.base import (
     BaseGenerationProvider,
     GenerationRequest,
@@ -34,42 +35,42 @@ class PoyoProvider(BaseGenerationProvider):
         """Make HTTP request to poyo.ai API."""
         url = f"{self.BASE_URL}{endpoint}"
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            try:
-                response = await client.request(
-                    method=method,
-                    url=url,
-                    headers=self.headers,
-                    json=json_data,
-                    params=params,
-                )
-
-                data = response.json()
-
-                logger.debug(
-                    f"poyo.ai response | endpoint={endpoint}, "
-                    f"status={response.status_code}, body_keys={list(data.keys()) if isinstance(data, dict) else 'not_dict'}"
-                )
+        client = get_http_client("poyo.ai")
+        try:
+            response = await client.request(
+                method=method,
+                url=url,
+                headers=self.headers,
+                json=json_data,
+                params=params,
+            )
 
-                if response.status_code not in (200, 201):
-                    error_msg = "Unknown error"
-                    if isinstance(data, dict):
-                        error_msg = data.get("message") or data.get("error") or data.get("detail") or str(data)
-                    raise ExternalAPIError(
-                        service="poyo.ai",
-                        message=error_msg,
-                        status_code=response.status_code,
-                    )
+            data = response.json()
 
-                return data
+            logger.debug(
+                f"poyo.ai response | endpoint={endpoint}, "
+                f"status={response.status_code}, body_keys={list(data.keys()) if isinstance(data, dict) else 'not_dict'}"
+            )
 
-            except httpx.RequestError as e:
-                logger.error(f"poyo.ai request failed | error={e}")
+            if response.status_code not in (200, 201):
+                error_msg = "Unknown error"
+                if isinstance(data, dict):
+                    error_msg = data.get("message") or data.get("error") or data.get("detail") or str(data)
                 raise ExternalAPIError(
                     service="poyo.ai",
-                    message=str(e),
+                    message=error_msg,
+                    status_code=response.status_code,
                 )
 
+            return data
+
+        except httpx.RequestError as e:
+            logger.error(f"poyo.ai request failed | error={e}")
+            raise ExternalAPIError(
+                service="poyo.ai",
+                message=str(e),
+            )
+
     async def create_task(self, request: GenerationRequest) -> GenerationTask:
         """Create a new generation task on poyo.ai.
 
@@ -113,7 +114,7 @@ class PoyoProvider(BaseGenerationProvider):
 
         payload = {
             "model": request.model,
-            "callback_url": "",
+            "callback_url": request.callback_url or "",
             "input": input_data,
         }
 
@@ -169,6 +170,10 @@ class PoyoProvider(BaseGenerationProvider):
         if not isinstance(data, dict):
             data = {}
 
+        return self._parse_status(task_id, data, response)
+
+    def _parse_status(self, task_id: str, data: dict, response: dict) -> GenerationTask:
+        """Map poyo.ai status data to GenerationTask."""
         raw_status = data.get("status", "unknown")
 
         # Map poyo.ai statuses to our internal statuses
@@ -231,6 +236,18 @@ class PoyoProvider(BaseGenerationProvider):
             raw_response=response,
         )
 
+    def parse_callback(self, payload: dict) -> GenerationTask:
+        """Parse poyo.ai callback payload (same shape as the status response)."""
+        data = payload.get("data", payload)
+        if not isinstance(data, dict):
+            data = {}
+
+        task_id = data.get("task_id") or payload.get("task_id") or data.get("id")
+        if not task_id:
+            raise ExternalAPIError(service="poyo.ai", message="No task_id in callback")
+
+        return self._parse_status(str(task_id), data, payload)
+
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a generation task (poyo.ai may not support this)."""
         logger.debug(f"poyo.ai task cancellation not implemented | task_id={task_id}")
@@ -1,14 +1,21 @@
 """Generation repository."""
 
 import uuid
-from datetime import datetime
+from datetime import UTC, datetime
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Row, func, insert, literal, select, true, union_all, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import make_transient_to_detached, selectinload
 
+from src.config import settings
+from src.core.pagination import Cursor, paginate
+from src.modules.admin.stats import track_on_commit
+from src.modules.generation.events import queue_status_event
 from src.modules.generation.models import Generation
-from src.shared.enums import GenerationStatus, GenerationType
+from src.modules.payments.models import BalanceHistory
+from src.modules.user.cache import invalidate_user_on_commit
+from src.modules.user.models import User
+from src.shared.enums import BalanceOperationType, GenerationStatus, GenerationType
 from src.shared.logger import logger
 
 
@@ -43,7 +50,7 @@ class GenerationRepository:
         )
         self.session.add(generation)
         await self.session.flush()
-        await self.session.refresh(generation)
+        self._track_created(generation)
         
         logger.info(
             f"Generation created | id={generation.id}, "
@@ -51,6 +58,169 @@ class GenerationRepository:
         )
         return generation
 
+    async def create_charged(
+        self,
+        user_id: int,
+        amount: int,
+        rows: list[dict],
+        description: str,
+        reference_id: str,
+    ) -> tuple[list[Generation], int, int] | None:
+        """
+        Charge the user and create generations with their ledger row.
+
+        The balance is decremented only if it covers `amount`, so
+        concurrent submissions cannot overdraw it. On PostgreSQL the
+        charge, the generations and the balance history row are a single
+        statement of data-modifying CTEs.
+
+        Returns:
+            (generations, new balance, telegram ID), or None if the user
+            does not exist or the balance is insufficient
+        """
+        users = User.__table__
+        generations_table = Generation.__table__
+        ledger_table = BalanceHistory.__table__
+        values = [
+            {"id": uuid.uuid4(), "status": GenerationStatus.PENDING, **row}
+            for row in rows
+        ]
+        charge = (
+            update(users)
+            .where(users.c.id == user_id, users.c.balance >= amount)
+            .values(balance=users.c.balance - amount)
+            .returning(users.c.id, users.c.balance, users.c.telegram_id)
+        )
+        ledger = {
+            "amount": -amount,
+            "operation_type": BalanceOperationType.GENERATION,
+            "description": description,
+            "reference_id": reference_id,
+        }
+
+        if settings.is_sqlite:
+            # No DML in CTEs: same transaction, one statement per table
+            charged = (await self.session.execute(charge)).one_or_none()
+            if charged is None:
+                return None
+            result = await self.session.scalars(
+                insert(Generation).returning(Generation),
+                [{"user_id": user_id, **row} for row in values],
+            )
+            generations = list(result.all())
+            await self.session.execute(
+                insert(BalanceHistory).values(
+                    user_id=user_id, balance_after=charged.balance, **ledger
+                )
+            )
+        else:
+            charged = charge.cte("charged")
+            names = list(values[0])
+            selects = [
+                select(
+                    charged.c.id,
+                    *[literal(row[name], generations_table.c[name].type) for name in names],
+                )
+                for row in values
+            ]
+            created = (
+                insert(generations_table)
+                .from_select(
+                    ["user_id", *names],
+                    selects[0] if len(selects) == 1 else union_all(*selects),
+                )
+                .returning(*generations_table.c)
+                .cte("created")
+            )
+            ledger_insert = (
+                insert(ledger_table)
+                .from_select(
+                    ["user_id", "balance_after", *ledger],
+                    select(
+                        charged.c.id,
+                        charged.c.balance,
+                        *[literal(value, ledger_table.c[name].type) for name, value in ledger.items()],
+                    ),
+                )
+                .cte("ledger")
+            )
+            result = await self.session.execute(
+                select(charged.c.balance, charged.c.telegram_id, created)
+                .select_from(charged)
+                .join(created, true())
+                .add_cte(ledger_insert)
+            )
+            created_rows = result.all()
+            if not created_rows:
+                return None
+            charged = created_rows[0]
+            generations = []
+            for row in created_rows:
+                generation = Generation(
+                    **{column.name: row._mapping[created.c[column.name]] for column in generations_table.c}
+                )
+                # Columns come from RETURNING, nothing to load
+                make_transient_to_detached(generation)
+                self.session.add(generation)
+                generations.append(generation)
+
+        invalidate_user_on_commit(self.session.sync_session, user_id)
+        track_on_commit(self.session.sync_session, totals={"users.balance": -amount})
+        for generation in generations:
+            self._track_created(generation)
+
+        logger.info(
+            f"Generations charged | user_id={user_id}, count={len(generations)}, "
+            f"tokens={amount}, new_balance={charged.balance}"
+        )
+        return generations, charged.balance, charged.telegram_id
+
+    def _track_created(self, generation: Generation) -> None:
+        track_on_commit(
+            self.session.sync_session,
+            totals={"generations.total": 1, "generations.pending": 1},
+            events={"generations.created": 1, "generations.tokens_charged": generation.tokens_spent},
+            model_id=generation.model_id,
+            provider=(generation.params or {}).get("_provider"),
+        )
+
+    def _track_completed(self, row: Row, status: GenerationStatus) -> None:
+        """Count a transition out of pending/processing."""
+        if status == GenerationStatus.SUCCESS:
+            totals = {"generations.success": 1, "generations.tokens_spent": row.tokens_spent}
+            events = {"generations.success": 1, "generations.tokens_spent": row.tokens_spent}
+        else:
+            totals = {"generations.failed": 1}
+            events = {"generations.failed": 1}
+        track_on_commit(
+            self.session.sync_session,
+            totals={"generations.pending": -1, **totals},
+            events=events,
+            model_id=row.model_id,
+            provider=(row.params or {}).get("_provider"),
+        )
+
+    async def get_batch(self, batch_id: uuid.UUID) -> list[Generation]:
+        """Get all generations of a batch."""
+        result = await self.session.execute(
+            select(Generation)
+            .where(Generation.batch_id == batch_id)
+            .order_by(Generation.created_at)
+        )
+        return list(result.scalars().all())
+
+    async def count_unfinished_batch(self, batch_id: uuid.UUID) -> int:
+        """Count pending or processing generations of a batch."""
+        result = await self.session.execute(
+            select(func.count())
+            .select_from(Generation)
+            .where(
+                Generation.batch_id == batch_id,
+                Generation.status.in_([GenerationStatus.PENDING, GenerationStatus.PROCESSING]),
+            )
+        )
+        return result.scalar_one()
+
     async def get_by_id(self, generation_id: uuid.UUID) -> Generation | None:
         """Get generation by ID."""
         result = await self.session.execute(
@@ -76,25 +246,35 @@ class GenerationRepository:
                 setattr(generation, key, value)
         
         await self.session.flush()
-        await self.session.refresh(generation)
         return generation
 
     async def set_processing(
         self,
         generation_id: uuid.UUID,
         kie_task_id: str,
+        params: dict | None = None,
     ) -> None:
         """Set generation status to processing."""
-        await self.session.execute(
+        values = {
+            "status": GenerationStatus.PROCESSING,
+            "kie_task_id": kie_task_id,
+        }
+        if params is not None:
+            values["params"] = params
+        result = await self.session.execute(
             update(Generation)
             .where(Generation.id == generation_id)
-            .values(
-                status=GenerationStatus.PROCESSING,
-                kie_task_id=kie_task_id,
-            )
+            .values(**values)
+            .returning(Generation.user_id)
         )
+        user_id = result.scalar_one_or_none()
         await self.session.flush()
-        
+
+        if user_id is not None:
+            queue_status_event(
+                self.session.sync_session, user_id, generation_id, GenerationStatus.PROCESSING
+            )
+
         logger.debug(f"Generation processing | id={generation_id}, task_id={kie_task_id}")
 
     async def set_success(
@@ -102,40 +282,93 @@ class GenerationRepository:
         generation_id: uuid.UUID,
         result_url: str,
         result_file_path: str | None = None,
-    ) -> None:
-        """Set generation as successful."""
-        await self.session.execute(
+    ) -> bool:
+        """Set generation as successful. Returns False if it was already completed."""
+        result = await self.session.execute(
             update(Generation)
             .where(Generation.id == generation_id)
+            .where(Generation.status.in_([
+                GenerationStatus.PENDING,
+                GenerationStatus.PROCESSING,
+            ]))
             .values(
                 status=GenerationStatus.SUCCESS,
                 result_url=result_url,
                 result_file_path=result_file_path,
                 completed_at=datetime.utcnow(),
             )
+            .returning(
+                Generation.user_id,
+                Generation.model_id,
+                Generation.tokens_spent,
+                Generation.params,
+            )
         )
+        row = result.one_or_none()
         await self.session.flush()
-        
+
+        if row is None:
+            logger.debug(f"Generation already completed | id={generation_id}")
+            return False
+        user_id = row.user_id
+        self._track_completed(row, GenerationStatus.SUCCESS)
+
+        queue_status_event(
+            self.session.sync_session,
+            user_id,
+            generation_id,
+            GenerationStatus.SUCCESS,
+            result_url=result_url,
+            result_file_path=result_file_path,
+        )
+
         logger.info(f"Generation success | id={generation_id}")
+        return True
 
     async def set_failed(
         self,
         generation_id: uuid.UUID,
         error_message: str,
-    ) -> None:
-        """Set generation as failed."""
-        await self.session.execute(
+    ) -> bool:
+        """Set generation as failed. Returns False if it was already completed."""
+        result = await self.session.execute(
             update(Generation)
             .where(Generation.id == generation_id)
+            .where(Generation.status.in_([
+                GenerationStatus.PENDING,
+                GenerationStatus.PROCESSING,
+            ]))
             .values(
                 status=GenerationStatus.FAILED,
                 error_message=error_message,
                 completed_at=datetime.utcnow(),
             )
+            .returning(
+                Generation.user_id,
+                Generation.model_id,
+                Generation.tokens_spent,
+                Generation.params,
+            )
         )
+        row = result.one_or_none()
         await self.session.flush()
-        
+
+        if row is None:
+            logger.debug(f"Generation already completed | id={generation_id}")
+            return False
+        user_id = row.user_id
+        self._track_completed(row, GenerationStatus.FAILED)
+
+        queue_status_event(
+            self.session.sync_session,
+            user_id,
+            generation_id,
+            GenerationStatus.FAILED,
+            error_message=error_message,
+        )
+
         logger.warning(f"Generation failed | id={generation_id}, error={error_message}")
+        return True
 
     async def get_pending_generations(self, limit: int = 100) -> list[Generation]:
         """Get all pending/processing generations for polling."""
@@ -152,6 +385,35 @@ class GenerationRepository:
         )
         return list(result.scalars().all())
 
+    async def get_completion_durations(
+        self,
+        model_code: str,
+        limit: int = 200,
+    ) -> list[float]:
+        """Get completion times in seconds of recent successful generations for a model."""
+        from src.modules.ai_models.models import AIModel
+
+        result = await self.session.execute(
+            select(Generation.created_at, Generation.completed_at)
+            .join(AIModel, AIModel.id == Generation.model_id)
+            .where(AIModel.code == model_code)
+            .where(Generation.status == GenerationStatus.SUCCESS)
+            .where(Generation.completed_at.isnot(None))
+            .order_by(Generation.created_at.desc())
+            .limit(limit)
+        )
+        durations = []
+        for created_at, completed_at in result.all():
+            # completed_at is written as naive UTC, created_at may come back tz-aware
+            if created_at.tzinfo is not None:
+                created_at = created_at.astimezone(UTC).replace(tzinfo=None)
+            if completed_at.tzinfo is not None:
+                completed_at = completed_at.astimezone(UTC).replace(tzinfo=None)
+            seconds = (completed_at - created_at).total_seconds()
+            if seconds >= 0:
+                durations.append(seconds)
+        return durations
+
     async def get_user_generations(
         self,
         user_id: int,
@@ -159,8 +421,9 @@ class GenerationRepository:
         limit: int = 50,
         generation_type: GenerationType | None = None,
         status: GenerationStatus | None = None,
+        cursor: Cursor | None = None,
     ) -> list[Generation]:
-        """Get user's generations."""
+        """Get user's generations, newest first (by offset or after a cursor)."""
         query = select(Generation).where(Generation.user_id == user_id)
         
         if generation_type:
@@ -169,13 +432,9 @@ class GenerationRepository:
         if status:
             query = query.where(Generation.status == status)
         
-        query = (
-            query
-            .order_by(Generation.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .options(selectinload(Generation.model))
-        )
+        query = paginate(
+            query, Generation.created_at, Generation.id, limit, offset, cursor
+        ).options(selectinload(Generation.model))
         
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -0,0 +1,135 @@
+"""Routing of generation submissions across provider backends."""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+
+from src.core.exceptions import ProviderUnavailableError
+from src.modules.generation.circuit import circuit_breakers, is_provider_failure
+from src.modules.generation.providers import GenerationTask
+from src.shared.logger import logger
+
+
+@dataclass
+class Backend:
+    """Provider model that can serve an AI model."""
+    provider: str
+    provider_model: str
+    weight: float = 1.0
+    cost: float = 1.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def parse_backends(
+    provider: str,
+    provider_model: str,
+    config: dict | None,
+    known_providers: set[str],
+) -> list[Backend]:
+    """
+    Backends of an AI model: the primary provider plus `config["backends"]`.
+
+    Example config:
+        {"backends": [{"provider": "poyo.ai", "provider_model": "veo3-fast",
+                       "weight": 0.5, "cost": 1.2}]}
+    """
+    backends = [Backend(provider=provider, provider_model=provider_model)]
+    for item in (config or {}).get("backends", []):
+        try:
+            backend = Backend(
+                provider=item["provider"],
+                provider_model=item["provider_model"],
+                weight=float(item.get("weight", 1.0)),
+                cost=float(item.get("cost", 1.0)),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Invalid backend config skipped | backend={item}, error={e}")
+            continue
+        if (backend.provider, backend.provider_model) == (provider, provider_model):
+            backends[0] = backend
+        else:
+            backends.append(backend)
+
+    routable = [b for b in backends if b.provider in known_providers]
+    for backend in backends:
+        if backend.provider not in known_providers:
+            logger.warning(f"Unknown provider in model backends | provider={backend.provider}")
+    return routable
+
+
+class ProviderRouter:
+    """
+    Pick the best backend for a submission and fail over on provider errors.
+
+    Backends are ranked by weight * health / cost, where health comes from
+    the circuit breakers (error rate and latency). Backends with an open
+    circuit are not tried.
+    """
+
+    def score(self, backend: Backend) -> float:
+        health = circuit_breakers.get(backend.provider).health
+        model_breaker = circuit_breakers.get(backend.provider, backend.provider_model)
+        if model_breaker.calls:
+            health = min(health, model_breaker.health)
+        return backend.weight * health / max(backend.cost, 0.001)
+
+    def rank(self, backends: list[Backend]) -> list[Backend]:
+        def key(backend: Backend) -> tuple[bool, float]:
+            available = (
+                circuit_breakers.get(backend.provider).allow()
+                and circuit_breakers.get(backend.provider, backend.provider_model).allow()
+            )
+            return available, self.score(backend)
+
+        # Stable sort keeps the configured order on equal scores
+        return sorted(backends, key=key, reverse=True)
+
+    async def any_available(self, backends: list[Backend]) -> bool:
+        for backend in backends:
+            if await circuit_breakers.is_available(backend.provider, backend.provider_model):
+                return True
+        return False
+
+    async def submit(
+        self,
+        backends: list[Backend],
+        submit: Callable[[Backend], Awaitable[GenerationTask]],
+    ) -> tuple[GenerationTask, Backend]:
+        """
+        Submit to the best backend, failing over to the next on provider errors.
+
+        Backends whose circuit refuses the submission are skipped; with none
+        left to try, the last provider error or ProviderUnavailableError is raised.
+        """
+        ranked = self.rank(backends)
+        last_error: Exception | None = None
+
+        for backend in ranked:
+            if not circuit_breakers.admit(backend.provider, backend.provider_model):
+                logger.debug(
+                    f"Backend circuit open, skipped | provider={backend.provider}, "
+                    f"model={backend.provider_model}"
+                )
+                continue
+            try:
+                return await submit(backend), backend
+            except Exception as e:
+                if not is_provider_failure(e):
+                    # Request rejected as invalid: other backends would reject it too
+                    raise
+                last_error = e
+                logger.warning(
+                    f"Backend submit failed, failing over | provider={backend.provider}, "
+                    f"model={backend.provider_model}, error={e}"
+                )
+
+        if last_error:
+            raise last_error
+        if not backends:
+            raise RuntimeError("No provider backends configured")
+        # The primary backend names the model
+        raise ProviderUnavailableError(backends[0].provider_model)
+
+
+provider_router = ProviderRouter()
@@ -0,0 +1,168 @@
+"""Adaptive polling schedule based on per-model completion history."""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from src.core.database import background_session_maker
+from src.shared.enums import GenerationType
+from src.shared.logger import logger
+
+
+@dataclass
+class CompletionProfile:
+    """Completion time distribution of a model, seconds since submission."""
+    p10: float
+    p50: float
+    p90: float
+    samples: int = 0
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+# Used until a model has enough history
+DEFAULT_PROFILES: dict[GenerationType, CompletionProfile] = {
+    GenerationType.IMAGE: CompletionProfile(p10=5.0, p50=15.0, p90=40.0),
+    GenerationType.FACESWAP: CompletionProfile(p10=5.0, p50=15.0, p90=40.0),
+    GenerationType.VIDEO: CompletionProfile(p10=45.0, p50=120.0, p90=300.0),
+}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of a sorted list."""
+    index = min(len(values) - 1, max(0, int(round(q * (len(values) - 1)))))
+    return values[index]
+
+
+class PollingSchedule:
+    """
+    Decide when to poll a provider task next.
+
+    Polls sparsely before the model's typical completion window (p10),
+    densely inside it (p10..p90) and backs off exponentially afterwards.
+    """
+
+    MIN_INTERVAL = 1.0
+    MAX_INTERVAL = 60.0
+    MAX_DENSE_INTERVAL = 30.0
+    DENSE_STEPS = 10
+    BACKOFF_FACTOR = 0.5
+
+    def __init__(
+        self,
+        refresh_interval: float = 600.0,
+        min_samples: int = 10,
+        history_limit: int = 200,
+    ):
+        self.refresh_interval = refresh_interval
+        self.min_samples = min_samples
+        self.history_limit = history_limit
+        self._profiles: dict[str, CompletionProfile] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+
+    def get_profile(
+        self,
+        model_code: str | None,
+        generation_type: GenerationType | None = None,
+    ) -> CompletionProfile:
+        """Get cached profile for model, scheduling a refresh when stale."""
+        default = DEFAULT_PROFILES.get(generation_type, DEFAULT_PROFILES[GenerationType.IMAGE])
+        if not model_code:
+            return default
+
+        profile = self._profiles.get(model_code)
+        if profile is None or time.monotonic() - profile.loaded_at > self.refresh_interval:
+            self._schedule_refresh(model_code)
+
+        return profile if profile and profile.samples >= self.min_samples else default
+
+    def next_delay(
+        self,
+        elapsed: float,
+        model_code: str | None = None,
+        generation_type: GenerationType | None = None,
+    ) -> float:
+        """Seconds until the next status check for a task running `elapsed` seconds."""
+        profile = self.get_profile(model_code, generation_type)
+        dense = self._clamp(
+            (profile.p90 - profile.p10) / self.DENSE_STEPS,
+            self.MIN_INTERVAL,
+            self.MAX_DENSE_INTERVAL,
+        )
+
+        if elapsed < profile.p10:
+            # Sparse: wake up right at the start of the completion window
+            delay = profile.p10 - elapsed
+        elif elapsed < profile.p90:
+            delay = dense
+        else:
+            # Backoff: delay grows with overrun, so checks thin out exponentially
+            delay = max(dense, (elapsed - profile.p90) * self.BACKOFF_FACTOR)
+
+        return self._clamp(delay, self.MIN_INTERVAL, self.MAX_INTERVAL)
+
+    def timeout_for(
+        self,
+        default_timeout: float,
+        model_code: str | None = None,
+        generation_type: GenerationType | None = None,
+    ) -> float:
+        """Polling timeout, extended for models that are slow in practice."""
+        profile = self.get_profile(model_code, generation_type)
+        return max(default_timeout, profile.p90 * 4)
+
+    def _schedule_refresh(self, model_code: str) -> None:
+        if model_code in self._refreshing:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._refreshing[model_code] = loop.create_task(self.refresh(model_code))
+
+    async def refresh(self, model_code: str) -> CompletionProfile | None:
+        """Reload completion time distribution for a model from history."""
+        from src.modules.generation.repository import GenerationRepository
+
+        try:
+            async with background_session_maker() as session:
+                repo = GenerationRepository(session)
+                durations = await repo.get_completion_durations(
+                    model_code, limit=self.history_limit
+                )
+
+            durations.sort()
+            if durations:
+                profile = CompletionProfile(
+                    p10=_percentile(durations, 0.10),
+                    p50=_percentile(durations, 0.50),
+                    p90=_percentile(durations, 0.90),
+                    samples=len(durations),
+                )
+            else:
+                profile = CompletionProfile(p10=0.0, p50=0.0, p90=0.0, samples=0)
+
+            self._profiles[model_code] = profile
+            logger.debug(
+                f"Polling profile refreshed | model={model_code}, samples={profile.samples}, "
+                f"p10={profile.p10:.1f}s, p50={profile.p50:.1f}s, p90={profile.p90:.1f}s"
+            )
+            return profile
+
+        except Exception as e:
+            logger.warning(f"Polling profile refresh failed | model={model_code}, error={e}")
+            # Keep the previous profile (or defaults) until the next refresh window
+            stale = self._profiles.get(model_code)
+            if stale:
+                stale.loaded_at = time.monotonic()
+            else:
+                self._profiles[model_code] = CompletionProfile(p10=0.0, p50=0.0, p90=0.0)
+            return None
+        finally:
+            self._refreshing.pop(model_code, None)
+
+    @staticmethod
+    def _clamp(value: float, low: float, high: float) -> float:
+        return max(low, min(high, value))
+
+
+polling_schedule = PollingSchedule()
@@ -4,22 +4,67 @@ import asyncio
 import uuid
 from pathlib import Path
 
-import httpx
-
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 
 from src.config import STORAGE_DIR, settings
-from src.core.exceptions import InsufficientBalanceError, NotFoundError, ValidationError
-from src.modules.ai_models.repository import AIModelRepository
+from src.core.database import background_session_maker
+from src.core.exceptions import (
+    InsufficientBalanceError,
+    NotFoundError,
+    ProviderUnavailableError,
+    ValidationError,
+)
+from src.core.pagination import Cursor
+from src.modules.ai_models.catalog import model_catalog
+from src.modules.ai_models.models import AIModel
 from src.modules.gallery.repository import GalleryRepository
+from src.modules.generation.batches import finish_batch_member, start_batch
+from src.modules.generation.callbacks import build_callback_url
+from src.modules.generation.downloader import result_downloader
+from src.modules.generation.jobs import (
+    enqueue_create,
+    enqueue_poll,
+    enqueue_thumbnail,
+    queue_enabled,
+)
 from src.modules.generation.models import Generation
-from src.modules.generation.providers import GenerationRequest, kie_provider, poyo_provider
+from src.modules.generation.poller import generation_poller
+from src.modules.generation.providers import (
+    BaseGenerationProvider,
+    GenerationRequest,
+    GenerationTask,
+    RateLimitedProvider,
+    kie_provider,
+    poyo_provider,
+)
 from src.modules.generation.repository import GenerationRepository
+from src.modules.generation.routing import Backend, parse_backends, provider_router
 from src.modules.payments.repository import BalanceHistoryRepository
 from src.modules.user.repository import UserRepository
-from src.shared.enums import BalanceOperationType, GenerationStatus, GenerationType, PriceDisplayMode
+from src.shared.constants import GENERATION_MAX_BATCH_SIZE
+from src.shared.enums import (
+    BalanceOperationType,
+    GenerationStatus,
+    GenerationType,
+    PriceDisplayMode,
+)
 from src.shared.logger import logger
 
+PROVIDERS: dict[str, BaseGenerationProvider] = {
+    "kie.ai": RateLimitedProvider("kie.ai", kie_provider),
+    "poyo.ai": RateLimitedProvider("poyo.ai", poyo_provider),
+}
+
+
+def get_provider(provider_name: str) -> BaseGenerationProvider:
+    """Get provider instance by name."""
+    provider = PROVIDERS.get(provider_name)
+    if not provider:
+        logger.warning(f"Unknown provider '{provider_name}', falling back to kie.ai")
+        return PROVIDERS["kie.ai"]
+    return provider
+
 
 async def _notify_user(telegram_id: int, text: str, **kwargs) -> None:
     """Send notification to user in Telegram chat. Silently ignores errors."""
@@ -37,44 +82,35 @@ class GenerationService:
         self.session = session
         self.generation_repo = GenerationRepository(session)
         self.user_repo = UserRepository(session)
-        self.model_repo = AIModelRepository(session)
         self.gallery_repo = GalleryRepository(session)
         self.balance_history_repo = BalanceHistoryRepository(session)
-        self._providers = {
-            "kie.ai": kie_provider,
-            "poyo.ai": poyo_provider,
-        }
 
-    def _get_provider(self, provider_name: str):
+    def _get_provider(self, provider_name: str) -> BaseGenerationProvider:
         """Get provider instance by name."""
-        provider = self._providers.get(provider_name)
-        if not provider:
-            logger.warning(f"Unknown provider '{provider_name}', falling back to kie.ai")
-            return kie_provider
-        return provider
+        return get_provider(provider_name)
 
-    async def create_generation(
+    async def _prepare_generation(
         self,
-        user_id: int,
         model_code: str,
-        prompt: str | None = None,
         image_url: str | None = None,
         video_url: str | None = None,
-        aspect_ratio: str = "1:1",
         duration: int | None = None,
-        extra_params: dict | None = None,
-    ) -> Generation:
-        """
-        Create and start a new generation task.
-        """
+    ) -> tuple[AIModel, list[Backend], int]:
+        """Validate a generation request. Returns (model, backends, cost per generation)."""
         # Get model
-        model = await self.model_repo.get_by_code(model_code)
+        model = await model_catalog.get_model_by_code(model_code)
         if not model:
             raise NotFoundError("Модель", model_code)
 
         if not model.is_enabled:
             raise ValidationError("Эта модель временно недоступна")
 
+        backends = parse_backends(
+            model.provider, model.provider_model, model.config, set(PROVIDERS)
+        )
+        if not backends:
+            raise ValidationError("Эта модель временно недоступна")
+
         # Validate motion control requirements
         model_mode = model.config.get("mode", "")
         if model_mode == "motion-control":
@@ -83,10 +119,9 @@ class GenerationService:
             if not video_url:
                 raise ValidationError("Для motion control необходимо загрузить референсное видео")
 
-        # Check user balance
-        user = await self.user_repo.get_by_id(user_id)
-        if not user:
-            raise NotFoundError("Пользователь", user_id)
+        # Fast-fail before charging while the provider is down
+        if not await provider_router.any_available(backends):
+            raise ProviderUnavailableError(model.name)
 
         # Расчёт стоимости согласно price_display_mode
         if (
@@ -102,50 +137,67 @@ class GenerationService:
         if cost <= 0:
             cost = int(round(model.price_tokens)) or 1
 
-        if user.balance < cost:
+        return model, backends, cost
+
+    @staticmethod
+    def _build_params(
+        model: AIModel,
+        backends: list[Backend],
+        aspect_ratio: str,
+        duration: int | None,
+        video_url: str | None,
+        extra_params: dict | None,
+    ) -> dict:
+        return {
+            "aspect_ratio": aspect_ratio,
+            "duration": duration,
+            "video_url": video_url,
+            "_provider": model.provider,
+            "_provider_model": model.provider_model,
+            **(
+                {"_backends": [b.to_dict() for b in backends]}
+                if len(backends) > 1 else {}
+            ),
+            **(extra_params or {}),
+        }
+
+    async def _create_charged(
+        self,
+        user_id: int,
+        cost: int,
+        rows: list[dict],
+        description: str,
+        reference_id: str,
+    ) -> tuple[list[Generation], int]:
+        """
+        Deduct tokens and create generations atomically.
+
+        Returns (generations, user's telegram ID).
+        """
+        charged = await self.generation_repo.create_charged(
+            user_id, cost, rows, description, reference_id
+        )
+        if charged is None:
+            # Nothing was written; read the balance only to report it
+            user = await self.user_repo.get_by_id(user_id)
+            if not user:
+                raise NotFoundError("Пользователь", user_id)
             raise InsufficientBalanceError(
                 required=cost,
                 available=user.balance,
             )
 
-        # Deduct tokens
-        new_balance = await self.user_repo.update_balance(
-            user_id, -cost
-        )
-
-        # Create generation record
-        generation = await self.generation_repo.create(
-            user_id=user_id,
-            model_id=model.id,
-            generation_type=model.generation_type,
-            tokens_spent=cost,
-            prompt=prompt,
-            input_file_url=image_url,
-            params={
-                "aspect_ratio": aspect_ratio,
-                "duration": duration,
-                "video_url": video_url,
-                "_provider": model.provider,
-                "_provider_model": model.provider_model,
-                **(extra_params or {}),
-            },
-        )
-
-        # Record balance change
-        await self.balance_history_repo.create(
-            user_id=user_id,
-            amount=-cost,
-            balance_after=new_balance,
-            operation_type=BalanceOperationType.GENERATION,
-            description=f"Генерация: {model.name}",
-            reference_id=str(generation.id),
-        )
+        generations, _, telegram_id = charged
+        return generations, telegram_id
 
-        # Notify user that generation has started
+    def _notify_started(self, telegram_id: int, model: AIModel, cost: int, count: int = 1) -> None:
+        """Notify user that generation has started."""
         gen_type_text = "🎬 Видео" if model.generation_type == GenerationType.VIDEO else "🖼 Изображение"
+        if count > 1:
+            gen_type_text += f" ×{count}"
         asyncio.create_task(
             _notify_user(
-                user.telegram_id,
+                telegram_id,
                 f"{gen_type_text} генерируется...\n\n"
                 f"🤖 Модель: <b>{model.name}</b>\n"
                 f"💰 Списано: <b>{int(cost)} токенов</b>\n\n"
@@ -154,10 +206,62 @@ class GenerationService:
             )
         )
 
-        # Start generation task in background
-        asyncio.create_task(
-            self._process_generation(generation, model.provider_model, model.provider, user.telegram_id)
+    async def create_generation(
+        self,
+        user_id: int,
+        model_code: str,
+        prompt: str | None = None,
+        image_url: str | None = None,
+        video_url: str | None = None,
+        aspect_ratio: str = "1:1",
+        duration: int | None = None,
+        extra_params: dict | None = None,
+    ) -> Generation:
+        """
+        Create and start a new generation task.
+        """
+        model, backends, cost = await self._prepare_generation(
+            model_code, image_url, video_url, duration
+        )
+
+        # Charge, generation record and balance change in one statement
+        generation_id = uuid.uuid4()
+        (generation,), telegram_id = await self._create_charged(
+            user_id,
+            cost,
+            [{
+                "id": generation_id,
+                "model_id": model.id,
+                "generation_type": model.generation_type,
+                "tokens_spent": cost,
+                "prompt": prompt,
+                "input_file_url": image_url,
+                "params": self._build_params(
+                    model, backends, aspect_ratio, duration, video_url, extra_params
+                ),
+            }],
+            description=f"Генерация: {model.name}",
+            reference_id=str(generation_id),
         )
+        set_committed_value(generation, "model", model)
+
+        self._notify_started(telegram_id, model, cost)
+
+        # Start generation task in a worker or in background
+        if queue_enabled():
+            # Worker loads the generation by ID, so it must be committed first
+            await self.session.commit()
+            await self._enqueue_create(generation, model, telegram_id)
+        else:
+            asyncio.create_task(
+                self._process_generation(
+                    generation,
+                    model.provider_model,
+                    model.provider,
+                    telegram_id,
+                    model_code=model.code,
+                )
+            )
 
         logger.info(
             f"Generation started | id={generation.id}, model={model_code}, "
@@ -166,12 +270,143 @@ class GenerationService:
 
         return generation
 
+    async def create_generation_batch(
+        self,
+        user_id: int,
+        model_code: str,
+        count: int,
+        prompt: str | None = None,
+        image_url: str | None = None,
+        video_url: str | None = None,
+        aspect_ratio: str = "1:1",
+        duration: int | None = None,
+        extra_params: dict | None = None,
+    ) -> tuple[uuid.UUID, list[Generation]]:
+        """
+        Create and start `count` variants of a generation as one batch.
+
+        Tokens are charged once, all generations are inserted in a single
+        statement and submitted concurrently. The user gets one
+        notification when the whole batch is finished.
+        """
+        if not 1 <= count <= GENERATION_MAX_BATCH_SIZE:
+            raise ValidationError(
+                f"Количество вариантов должно быть от 1 до {GENERATION_MAX_BATCH_SIZE}",
+                field="count",
+            )
+
+        model, backends, cost = await self._prepare_generation(
+            model_code, image_url, video_url, duration
+        )
+
+        batch_id = uuid.uuid4()
+        params = self._build_params(
+            model, backends, aspect_ratio, duration, video_url, extra_params
+        )
+        generations, telegram_id = await self._create_charged(
+            user_id,
+            cost * count,
+            [
+                {
+                    "model_id": model.id,
+                    "generation_type": model.generation_type,
+                    "tokens_spent": cost,
+                    "prompt": prompt,
+                    "input_file_url": image_url,
+                    "params": params,
+                    "batch_id": batch_id,
+                }
+                for _ in range(count)
+            ],
+            description=f"Генерация: {model.name} ×{count}",
+            reference_id=str(batch_id),
+        )
+        for generation in generations:
+            # Same model for all rows, no need to load the relationship per row
+            set_committed_value(generation, "model", model)
+
+        # Counter first: a member may finish as soon as the rows are committed
+        await start_batch(batch_id, count)
+        # Submissions run in their own sessions, rows must be visible to them
+        await self.session.commit()
+
+        self._notify_started(telegram_id, model, cost * count, count=count)
+
+        if queue_enabled():
+            for generation in generations:
+                await self._enqueue_create(generation, model, telegram_id)
+        else:
+            asyncio.create_task(self._process_batch(
+                generations,
+                model.provider_model,
+                model.provider,
+                telegram_id,
+                model_code=model.code,
+            ))
+
+        logger.info(
+            f"Generation batch started | batch_id={batch_id}, count={count}, "
+            f"model={model_code}, user_id={user_id}, tokens={cost * count}"
+        )
+
+        return batch_id, generations
+
+    async def _enqueue_create(
+        self,
+        generation: Generation,
+        model: AIModel,
+        telegram_id: int | None,
+    ) -> None:
+        """Queue submission to a worker; a generation that cannot be queued is refunded."""
+        try:
+            await enqueue_create(
+                generation.id,
+                model.provider_model,
+                model.provider,
+                telegram_id,
+                model_code=model.code,
+            )
+        except Exception as e:
+            # Nothing would ever submit or poll it: fail it now
+            logger.error(f"Generation enqueue failed | id={generation.id}, error={e}")
+            await self.fail_generation(
+                generation.id,
+                error_message=f"Не удалось поставить в очередь: {e}",
+                telegram_id=telegram_id,
+            )
+
+    @staticmethod
+    async def _process_batch(
+        generations: list[Generation],
+        provider_model: str,
+        provider_name: str,
+        telegram_id: int | None = None,
+        model_code: str | None = None,
+    ) -> None:
+        """Submit batch generations concurrently, each in its own session."""
+
+        async def process(generation: Generation) -> None:
+            async with background_session_maker() as session:
+                await GenerationService(session)._process_generation(
+                    generation,
+                    provider_model,
+                    provider_name,
+                    telegram_id,
+                    model_code=model_code,
+                )
+
+        await asyncio.gather(
+            *(process(generation) for generation in generations),
+            return_exceptions=True,
+        )
+
     async def _process_generation(
         self,
         generation: Generation,
         provider_model: str,
         provider_name: str,
         telegram_id: int | None = None,
+        model_code: str | None = None,
     ) -> None:
         """Process generation in background."""
         try:
@@ -188,186 +423,252 @@ class GenerationService:
             if video_url:
                 video_url = await self._ensure_mp4(video_url)
 
-            request = GenerationRequest(
-                model=provider_model,
-                prompt=generation.prompt,
-                image_url=generation.input_file_url,
-                video_url=video_url,
-                aspect_ratio=generation.params.get("aspect_ratio", "1:1"),
-                duration=generation.params.get("duration"),
-                output_format=output_format,
-                extra_params={
-                    k: v for k, v in generation.params.items()
-                    if not k.startswith("_") and k != "video_url"
-                },
-            )
-
-            # Select provider
-            provider = self._get_provider(provider_name)
-
-            logger.debug(
-                f"Submitting to provider | provider={provider_name}, "
-                f"model={provider_model}, generation_id={generation.id}"
-            )
+            extra_params = {
+                k: v for k, v in generation.params.items()
+                if not k.startswith("_") and k != "video_url"
+            }
+
+            async def submit(backend: Backend) -> GenerationTask:
+                request = GenerationRequest(
+                    model=backend.provider_model,
+                    prompt=generation.prompt,
+                    image_url=generation.input_file_url,
+                    video_url=video_url,
+                    aspect_ratio=generation.params.get("aspect_ratio", "1:1"),
+                    duration=generation.params.get("duration"),
+                    output_format=output_format,
+                    callback_url=build_callback_url(backend.provider, generation.id),
+                    user_id=generation.user_id,
+                    extra_params=extra_params,
+                )
 
-            # Create task on provider
-            task = await provider.create_task(request)
+                logger.debug(
+                    f"Submitting to provider | provider={backend.provider}, "
+                    f"model={backend.provider_model}, generation_id={generation.id}"
+                )
+                return await self._get_provider(backend.provider).create_task(request)
+
+            # Create task on the best available provider backend
+            backends = [Backend(**b) for b in generation.params.get("_backends", [])] or [
+                Backend(provider=provider_name, provider_model=provider_model)
+            ]
+            task, backend = await provider_router.submit(backends, submit)
+
+            # Remember which backend serves the task, polling and resume rely on it
+            params = None
+            if (backend.provider, backend.provider_model) != (provider_name, provider_model):
+                provider_name = backend.provider
+                params = {
+                    **generation.params,
+                    "_provider": backend.provider,
+                    "_provider_model": backend.provider_model,
+                }
 
             # Update generation with task ID
             async with self.session.begin_nested():
                 await self.generation_repo.set_processing(
                     generation.id,
                     task.task_id,
+                    params=params,
                 )
             await self.session.commit()
 
-            # Poll for completion
-            await self._poll_generation(
+            # Track completion in workers or in the shared poller
+            if queue_enabled():
+                await enqueue_poll(
+                    generation.id,
+                    task.task_id,
+                    provider_name=provider_name,
+                    telegram_id=telegram_id,
+                    model_code=model_code,
+                    generation_type=generation.generation_type,
+                )
+            else:
+                generation_poller.register(
+                    generation.id,
+                    task.task_id,
+                    provider_name=provider_name,
+                    telegram_id=telegram_id,
+                    model_code=model_code,
+                    generation_type=generation.generation_type,
+                )
+
+        except Exception as e:
+            logger.exception(f"Generation processing failed | id={generation.id}, error={e}")
+            await self.fail_generation(
                 generation.id,
-                task.task_id,
-                provider_name=provider_name,
+                error_message=str(e),
                 telegram_id=telegram_id,
             )
 
-        except Exception as e:
-            logger.exception(f"Generation processing failed | id={generation.id}, error={e}")
+    async def handle_task_result(
+        self,
+        generation_id: uuid.UUID,
+        task: GenerationTask,
+        provider_name: str = "kie.ai",
+        telegram_id: int | None = None,
+    ) -> None:
+        """Complete generation from a terminal provider task status."""
+        current = await self.generation_repo.get_by_id(generation_id)
+        if not current or current.is_completed:
+            logger.debug(f"Generation already completed, skipping result | id={generation_id}")
+            return
+
+        if task.status == "failed":
+            await self.fail_generation(
+                generation_id,
+                error_message=task.error or "Unknown error",
+                telegram_id=telegram_id,
+            )
+            return
+
+        if not task.result_url:
+            logger.error(
+                f"Generation success but no result_url | "
+                f"id={generation_id}, task_id={task.task_id}, provider={provider_name}"
+            )
+            await self.fail_generation(
+                generation_id,
+                error_message="Провайдер вернул success, но без URL результата",
+                telegram_id=telegram_id,
+            )
+            return
+
+        try:
+            # Download and save result
+            file_path = await self._download_result(
+                generation_id,
+                task.result_url,
+            )
+
             async with self.session.begin_nested():
-                await self.generation_repo.set_failed(
-                    generation.id,
-                    error_message=str(e),
+                completed = await self.generation_repo.set_success(
+                    generation_id,
+                    result_url=task.result_url,
+                    result_file_path=file_path,
                 )
+
+                # Add to gallery
+                generation = await self.generation_repo.get_by_id(generation_id)
+                is_video = bool(generation) and generation.generation_type == GenerationType.VIDEO
+                if generation and completed:
+                    thumbnail_path = None
+                    if is_video and not queue_enabled():
+                        thumbnail_path = await self._generate_video_thumbnail(file_path)
+                    await self.gallery_repo.create(
+                        user_id=generation.user_id,
+                        generation_id=generation.id,
+                        file_path=file_path,
+                        file_type="video" if is_video else "image",
+                        thumbnail_path=thumbnail_path,
+                    )
+
             await self.session.commit()
 
-            # Refund tokens
-            await self._refund_tokens(generation)
+            if not completed:
+                return
 
-            if telegram_id:
-                await _notify_user(
-                    telegram_id,
-                    "❌ Генерация не удалась. Токены возвращены на баланс.",
-                )
+            if is_video and queue_enabled():
+                await enqueue_thumbnail(generation_id, file_path)
+
+        except Exception as e:
+            logger.exception(f"Generation completion failed | id={generation_id}, error={e}")
+            await self.session.rollback()
+            await self.fail_generation(
+                generation_id,
+                error_message=f"Не удалось сохранить результат: {e}",
+                telegram_id=telegram_id,
+            )
+            return
 
-    async def _poll_generation(
+        logger.info(f"Generation completed | id={generation_id}, provider={provider_name}")
+
+        if generation and generation.batch_id:
+            await self._finish_batch_member(generation.batch_id, telegram_id)
+            return
+
+        # Send result to user in Telegram
+        if telegram_id and file_path:
+            await self._send_result_to_user(telegram_id, file_path, generation)
+
+    async def resolve_callback(
         self,
+        provider_name: str,
         generation_id: uuid.UUID,
-        task_id: str,
-        max_attempts: int = 120,
-        interval: float = 5.0,
-        provider_name: str = "kie.ai",
-        telegram_id: int | None = None,
-    ) -> None:
-        """Poll for generation completion."""
-        provider = self._get_provider(provider_name)
-
-        for attempt in range(max_attempts):
-            await asyncio.sleep(interval)
-
-            try:
-                task = await provider.get_task_status(task_id)
-
-                if task.status == "success":
-                    if not task.result_url:
-                        logger.error(
-                            f"Generation success but no result_url | "
-                            f"id={generation_id}, task_id={task_id}, provider={provider_name}"
-                        )
-                        async with self.session.begin_nested():
-                            await self.generation_repo.set_failed(
-                                generation_id,
-                                error_message="Провайдер вернул success, но без URL результата",
-                            )
-                        await self.session.commit()
-                        generation = await self.generation_repo.get_by_id(generation_id)
-                        if generation:
-                            await self._refund_tokens(generation)
-                        if telegram_id:
-                            await _notify_user(telegram_id, "❌ Генерация не удалась. Токены возвращены на баланс.")
-                        return
-
-                    # Download and save result
-                    file_path = await self._download_result(
-                        generation_id,
-                        task.result_url,
-                    )
+        task: GenerationTask,
+    ) -> tuple[Generation, int | None] | None:
+        """
+        Resolve the generation a provider callback refers to.
 
-                    async with self.session.begin_nested():
-                        await self.generation_repo.set_success(
-                            generation_id,
-                            result_url=task.result_url,
-                            result_file_path=file_path,
-                        )
-
-                        # Add to gallery
-                        generation = await self.generation_repo.get_by_id(generation_id)
-                        if generation:
-                            is_video = generation.generation_type == GenerationType.VIDEO
-                            thumbnail_path = None
-                            if is_video:
-                                thumbnail_path = await self._generate_video_thumbnail(file_path)
-                            await self.gallery_repo.create(
-                                user_id=generation.user_id,
-                                generation_id=generation.id,
-                                file_path=file_path,
-                                file_type="video" if is_video else "image",
-                                thumbnail_path=thumbnail_path,
-                            )
-
-                    await self.session.commit()
-
-                    logger.info(f"Generation completed | id={generation_id}, provider={provider_name}")
-
-                    # Send result to user in Telegram
-                    if telegram_id and file_path:
-                        await self._send_result_to_user(telegram_id, file_path, generation)
-
-                    return
-
-                elif task.status == "failed":
-                    async with self.session.begin_nested():
-                        await self.generation_repo.set_failed(
-                            generation_id,
-                            error_message=task.error or "Unknown error",
-                        )
-                    await self.session.commit()
-
-                    # Refund tokens
-                    generation = await self.generation_repo.get_by_id(generation_id)
-                    if generation:
-                        await self._refund_tokens(generation)
-
-                    if telegram_id:
-                        await _notify_user(telegram_id, "❌ Генерация не удалась. Токены возвращены на баланс.")
-
-                    return
-
-                # Still processing, continue polling
-                if attempt % 10 == 0:
-                    logger.debug(
-                        f"Generation polling | id={generation_id}, "
-                        f"attempt={attempt + 1}/{max_attempts}, status={task.status}, "
-                        f"provider={provider_name}"
-                    )
+        The callback token is bound to `generation_id`, the task must be the
+        one submitted for it. Stops in-process polling for the task and
+        returns (generation, telegram_id), or None if the generation is
+        unknown or already completed. In queue mode the caller cancels the
+        poll job once the download job is enqueued.
+        """
+        generation = await self.generation_repo.get_by_id(generation_id)
+        if not generation or generation.kie_task_id != task.task_id:
+            logger.warning(
+                f"Callback for unknown task | provider={provider_name}, "
+                f"generation_id={generation_id}, task_id={task.task_id}"
+            )
+            return None
 
-            except Exception as e:
-                logger.error(
-                    f"Polling error | id={generation_id}, attempt={attempt + 1}, "
-                    f"provider={provider_name}, error={e}"
-                )
+        if generation.is_completed:
+            logger.debug(f"Callback for completed generation | id={generation.id}")
+            return None
+
+        entry = generation_poller.unregister(provider_name, task.task_id)
+        if entry and entry.telegram_id:
+            telegram_id = entry.telegram_id
+        else:
+            user = await self.user_repo.get_by_id(generation.user_id)
+            telegram_id = user.telegram_id if user else None
+
+        return generation, telegram_id
 
-        # Max attempts reached
+    async def fail_generation(
+        self,
+        generation_id: uuid.UUID,
+        error_message: str,
+        telegram_id: int | None = None,
+        notice: str = "❌ Генерация не удалась. Токены возвращены на баланс.",
+    ) -> None:
+        """Mark generation as failed, refund tokens and notify user."""
         async with self.session.begin_nested():
-            await self.generation_repo.set_failed(
+            failed = await self.generation_repo.set_failed(
                 generation_id,
-                error_message="Timeout: превышено время ожидания",
+                error_message=error_message,
             )
         await self.session.commit()
 
+        # Already completed elsewhere (callback, another replica) - nothing to refund
+        if not failed:
+            return
+
         generation = await self.generation_repo.get_by_id(generation_id)
         if generation:
             await self._refund_tokens(generation)
 
+        if generation and generation.batch_id:
+            await self._finish_batch_member(generation.batch_id, telegram_id)
+            return
+
         if telegram_id:
-            await _notify_user(telegram_id, "❌ Генерация не удалась (timeout). Токены возвращены на баланс.")
+            await _notify_user(telegram_id, notice)
+
+    async def _finish_batch_member(self, batch_id: uuid.UUID, telegram_id: int | None) -> None:
+        """Count a finished batch generation, notify user once the batch is done."""
+        last = await finish_batch_member(batch_id)
+        if last is None:
+            # Counter unavailable: done once no member is left unfinished.
+            # Members finishing at the same moment may both notify
+            last = await self.generation_repo.count_unfinished_batch(batch_id) == 0
+        if not last or not telegram_id:
+            return
+
+        generations = await self.generation_repo.get_batch(batch_id)
+        await self._send_batch_result_to_user(telegram_id, generations)
 
     async def _send_result_to_user(
         self,
@@ -378,6 +679,7 @@ class GenerationService:
         """Send generation result file to user in Telegram."""
         try:
             from aiogram.types import FSInputFile
+
             from src.bot.loader import bot
 
             path = Path(file_path)
@@ -401,49 +703,75 @@ class GenerationService:
             logger.warning(f"Failed to send result to user | telegram_id={telegram_id}, error={e}")
             await _notify_user(telegram_id, "✅ Генерация завершена! Результат доступен в приложении.")
 
+    async def _send_batch_result_to_user(
+        self,
+        telegram_id: int,
+        generations: list[Generation],
+    ) -> None:
+        """Send all results of a finished batch to user in one album."""
+        succeeded = [
+            g for g in generations
+            if g.status == GenerationStatus.SUCCESS
+            and g.result_file_path and Path(g.result_file_path).exists()
+        ]
+        failed = len(generations) - len(succeeded)
+
+        caption = f"✅ Готово! Вариантов: {len(succeeded)} из {len(generations)}"
+        if failed:
+            caption += f"\n❌ Не удалось: {failed}, токены за них возвращены."
+        prompt = generations[0].prompt if generations else None
+        if prompt:
+            caption += f"\n\n📝 <i>{prompt[:200]}</i>"
+
+        if not succeeded:
+            await _notify_user(
+                telegram_id,
+                "❌ Генерация не удалась. Токены возвращены на баланс.",
+            )
+            return
+
+        try:
+            from aiogram.types import FSInputFile, InputMediaPhoto, InputMediaVideo
+
+            from src.bot.loader import bot
+
+            media = []
+            for index, generation in enumerate(succeeded):
+                path = Path(generation.result_file_path)
+                media_class = (
+                    InputMediaVideo
+                    if path.suffix.lower() in (".mp4", ".webm", ".gif")
+                    else InputMediaPhoto
+                )
+                media.append(media_class(
+                    media=FSInputFile(path),
+                    caption=caption if index == 0 else None,
+                    parse_mode="HTML",
+                ))
+
+            # Telegram albums hold 2..10 items
+            if len(media) == 1:
+                await self._send_result_to_user(telegram_id, succeeded[0].result_file_path, succeeded[0])
+            else:
+                for start in range(0, len(media), 10):
+                    await bot.send_media_group(chat_id=telegram_id, media=media[start:start + 10])
+
+        except Exception as e:
+            logger.warning(f"Failed to send batch result | telegram_id={telegram_id}, error={e}")
+            await _notify_user(telegram_id, "✅ Генерация завершена! Результаты доступны в приложении.")
+
     async def _download_result(
         self,
         generation_id: uuid.UUID,
         url: str,
     ) -> str:
         """Download result file from URL."""
-
-        url_lower = url.lower().split("?")[0]
-        ext = ".png"
-        if url_lower.endswith(".mp4") or "video" in url_lower:
-            ext = ".mp4"
-        elif url_lower.endswith(".webp"):
-            ext = ".webp"
-        elif url_lower.endswith(".jpg") or url_lower.endswith(".jpeg"):
-            ext = ".jpg"
-        elif url_lower.endswith(".gif"):
-            ext = ".gif"
-        elif url_lower.endswith(".webm"):
-            ext = ".webm"
-
-        file_name = f"{generation_id}{ext}"
-        file_path = STORAGE_DIR / "generations" / file_name
-
-        async with httpx.AsyncClient(timeout=120.0, follow_redirects=True) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-
-            content_type = response.headers.get("content-type", "")
-            if ext == ".png" and "video" in content_type:
-                ext = ".mp4"
-                file_name = f"{generation_id}{ext}"
-                file_path = STORAGE_DIR / "generations" / file_name
-            elif ext == ".png" and "jpeg" in content_type:
-                ext = ".jpg"
-                file_name = f"{generation_id}{ext}"
-                file_path = STORAGE_DIR / "generations" / file_name
-
-            file_path.parent.mkdir(parents=True, exist_ok=True)
-            file_path.write_bytes(response.content)
-
-        logger.debug(f"Result downloaded | id={generation_id}, path={file_path}, size={len(response.content)}")
-
-        return str(file_path)
+        result = await result_downloader.download(
+            url,
+            dest_dir=STORAGE_DIR / "generations",
+            stem=str(generation_id),
+        )
+        return str(result.path)
 
     async def _ensure_mp4(self, video_url: str) -> str:
         """Конвертировать видео в mp4, если оно не является mp4. Возвращает URL mp4-файла."""
@@ -550,10 +878,11 @@ class GenerationService:
         offset: int = 0,
         limit: int = 50,
         generation_type: GenerationType | None = None,
+        cursor: Cursor | None = None,
     ) -> list[Generation]:
         """Get user's generations."""
         return await self.generation_repo.get_user_generations(
-            user_id, offset, limit, generation_type
+            user_id, offset, limit, generation_type, cursor=cursor
         )
 
     async def get_stats(self) -> dict:
@@ -3,7 +3,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,13 @@ class Payment(Base):
     """Payment model."""
 
     __tablename__ = "payments"
+    __table_args__ = (
+        # Keyset pagination of user and admin lists
+        Index("ix_payments_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_payments_created_at_id", "created_at", "id"),
+        # Admin list filtered by status
+        Index("ix_payments_status_created_at", "status", "created_at", "id"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -22,7 +29,10 @@ class Payment(Base):
         BigInteger, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
-    amount: Mapped[int] = mapped_column(Integer, nullable=False)  # в USD
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)  # в валюте платежа
+    currency: Mapped[str] = mapped_column(
+        String(3), default="USD", server_default="USD", nullable=False
+    )
     tokens: Mapped[int] = mapped_column(Integer, nullable=False)  # токены
 
     lava_id: Mapped[str | None] = mapped_column(String(255), nullable=True, unique=True)
@@ -36,7 +46,7 @@ class Payment(Base):
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    paid_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    paid_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
 
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="payments")
@@ -48,6 +58,10 @@ class BalanceHistory(Base):
     """Balance history model for tracking all balance changes."""
 
     __tablename__ = "balance_history"
+    __table_args__ = (
+        # Keyset pagination of user history
+        Index("ix_balance_history_user_id_created_at", "user_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     user_id: Mapped[int] = mapped_column(
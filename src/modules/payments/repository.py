@@ -3,13 +3,38 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Row, Select, func, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.config import settings
+from src.core.pagination import Cursor, paginate
+from src.modules.admin.stats import track_on_commit
 from src.modules.payments.models import BalanceHistory, Payment
 from src.shared.enums import BalanceOperationType, PaymentStatus
 from src.shared.logger import logger
 
+# Below this size an exact COUNT is cheap enough to always run
+APPROXIMATE_COUNT_MIN_ROWS = 100_000
+
+
+def _apply_filters(
+    query: Select,
+    user_id: int | None = None,
+    status: PaymentStatus | None = None,
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+) -> Select:
+    """Payment list filters shared by the pages and their counts."""
+    if user_id is not None:
+        query = query.where(Payment.user_id == user_id)
+    if status:
+        query = query.where(Payment.status == status)
+    if created_from:
+        query = query.where(Payment.created_at >= created_from)
+    if created_to:
+        query = query.where(Payment.created_at < created_to)
+    return query
+
 
 class PaymentRepository:
     """Repository for Payment database operations."""
@@ -22,17 +47,23 @@ class PaymentRepository:
         user_id: int,
         amount: int,
         tokens: int,
+        currency: str = "USD",
     ) -> Payment:
         """Create new payment."""
         payment = Payment(
             user_id=user_id,
             amount=amount,
+            currency=currency,
             tokens=tokens,
             status=PaymentStatus.PENDING,
         )
         self.session.add(payment)
         await self.session.flush()
-        await self.session.refresh(payment)
+        track_on_commit(
+            self.session.sync_session,
+            totals={"payments.pending": 1},
+            events={"payments.created": 1},
+        )
 
         logger.info(f"Payment created | id={payment.id}, user_id={user_id}, amount={amount}")
         return payment
@@ -58,15 +89,24 @@ class PaymentRepository:
                 setattr(payment, key, value)
 
         await self.session.flush()
-        await self.session.refresh(payment)
         return payment
 
+    async def _lock(self, payment_id: uuid.UUID) -> Row | None:
+        """Lock the payment row and return its status and amount before a transition."""
+        result = await self.session.execute(
+            select(Payment.status, Payment.amount)
+            .where(Payment.id == payment_id)
+            .with_for_update()
+        )
+        return result.one_or_none()
+
     async def mark_as_paid(
         self,
         payment_id: uuid.UUID,
         lava_status: str | None = None,
     ) -> None:
         """Mark payment as successful."""
+        previous = await self._lock(payment_id)
         await self.session.execute(
             update(Payment)
             .where(Payment.id == payment_id)
@@ -77,6 +117,17 @@ class PaymentRepository:
             )
         )
         await self.session.flush()
+        if previous is not None and previous.status != PaymentStatus.SUCCESS:
+            track_on_commit(
+                self.session.sync_session,
+                totals={
+                    "payments.success": 1,
+                    "payments.success_amount": previous.amount,
+                    "payments.pending": -int(previous.status == PaymentStatus.PENDING),
+                },
+                events={"payments.success": 1, "payments.amount": previous.amount},
+            )
+
         logger.info(f"Payment marked as paid | id={payment_id}")
 
     async def mark_as_failed(
@@ -85,6 +136,7 @@ class PaymentRepository:
         lava_status: str | None = None,
     ) -> None:
         """Mark payment as failed."""
+        previous = await self._lock(payment_id)
         await self.session.execute(
             update(Payment)
             .where(Payment.id == payment_id)
@@ -94,6 +146,13 @@ class PaymentRepository:
             )
         )
         await self.session.flush()
+        if previous is not None and previous.status == PaymentStatus.PENDING:
+            track_on_commit(
+                self.session.sync_session,
+                totals={"payments.pending": -1},
+                events={"payments.failed": 1},
+            )
+
         logger.info(f"Payment marked as failed | id={payment_id}")
 
     async def get_user_payments(
@@ -102,14 +161,13 @@ class PaymentRepository:
         offset: int = 0,
         limit: int = 50,
         status: PaymentStatus | None = None,
+        cursor: Cursor | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
     ) -> list[Payment]:
         """Get user payments with optional filtering."""
-        query = select(Payment).where(Payment.user_id == user_id)
-
-        if status:
-            query = query.where(Payment.status == status)
-
-        query = query.order_by(Payment.created_at.desc()).offset(offset).limit(limit)
+        query = _apply_filters(select(Payment), user_id, status, created_from, created_to)
+        query = paginate(query, Payment.created_at, Payment.id, limit, offset, cursor)
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -119,18 +177,71 @@ class PaymentRepository:
         offset: int = 0,
         limit: int = 50,
         status: PaymentStatus | None = None,
+        cursor: Cursor | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
     ) -> list[Payment]:
         """Get all payments for admin."""
-        query = select(Payment)
-
-        if status:
-            query = query.where(Payment.status == status)
-
-        query = query.order_by(Payment.created_at.desc()).offset(offset).limit(limit)
+        query = _apply_filters(select(Payment), None, status, created_from, created_to)
+        query = paginate(query, Payment.created_at, Payment.id, limit, offset, cursor)
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def count_payments(
+        self,
+        user_id: int | None = None,
+        status: PaymentStatus | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+    ) -> int:
+        """Count payments with optional filtering."""
+        query = _apply_filters(
+            select(func.count(Payment.id)), user_id, status, created_from, created_to
+        )
+        result = await self.session.execute(query)
+        return result.scalar_one()
+
+    async def estimate_payments(self, status: PaymentStatus | None = None) -> int | None:
+        """
+        Approximate payment count from PostgreSQL planner statistics.
+
+        Uses pg_class.reltuples and, for a status, its frequency in pg_stats,
+        so the cost does not grow with the table. Returns None when an exact
+        count should be used instead: on SQLite, before the table has been
+        analyzed, for a status missing from the statistics, or while the
+        table is smaller than APPROXIMATE_COUNT_MIN_ROWS.
+        """
+        if settings.is_sqlite:
+            return None
+
+        result = await self.session.execute(
+            text("SELECT reltuples FROM pg_class WHERE oid = 'payments'::regclass")
+        )
+        rows = result.scalar_one_or_none()
+        if rows is None or rows < APPROXIMATE_COUNT_MIN_ROWS:
+            return None
+
+        if status is None:
+            return int(rows)
+
+        result = await self.session.execute(
+            text(
+                "SELECT most_common_vals::text::text[], most_common_freqs FROM pg_stats "
+                "WHERE schemaname = current_schema() AND tablename = 'payments' "
+                "AND attname = 'status'"
+            )
+        )
+        stats = result.one_or_none()
+        if stats is None or stats[0] is None:
+            return None
+
+        # Enum labels are stored by name
+        frequencies = dict(zip(stats[0], stats[1]))
+        if status.name not in frequencies:
+            return None
+        return int(rows * frequencies[status.name])
+
     async def get_stats(self) -> dict:
         """Get payment statistics."""
         total_result = await self.session.execute(
@@ -169,7 +280,13 @@ class BalanceHistoryRepository:
         description: str,
         reference_id: str | None = None,
     ) -> BalanceHistory:
-        """Create balance history record."""
+        """
+        Create balance history record.
+
+        Nothing reads the record back, so it is not flushed here: it is
+        written with the session's next flush, together with the other
+        pending rows.
+        """
         record = BalanceHistory(
             user_id=user_id,
             amount=amount,
@@ -179,8 +296,6 @@ class BalanceHistoryRepository:
             reference_id=reference_id,
         )
         self.session.add(record)
-        await self.session.flush()
-        await self.session.refresh(record)
 
         logger.debug(
             f"Balance history created | user_id={user_id}, "
@@ -194,6 +309,7 @@ class BalanceHistoryRepository:
         offset: int = 0,
         limit: int = 50,
         operation_type: BalanceOperationType | None = None,
+        cursor: Cursor | None = None,
     ) -> list[BalanceHistory]:
         """Get user balance history."""
         query = select(BalanceHistory).where(BalanceHistory.user_id == user_id)
@@ -201,7 +317,9 @@ class BalanceHistoryRepository:
         if operation_type:
             query = query.where(BalanceHistory.operation_type == operation_type)
 
-        query = query.order_by(BalanceHistory.created_at.desc()).offset(offset).limit(limit)
+        query = paginate(
+            query, BalanceHistory.created_at, BalanceHistory.id, limit, offset, cursor
+        )
 
         result = await self.session.execute(query)
         return list(result.scalars().all())
@@ -3,11 +3,12 @@
 import uuid
 from datetime import datetime
 
-import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.core.exceptions import NotFoundError, PaymentError
+from src.core.http import get_http_client
+from src.core.pagination import Cursor
 from src.modules.payments.models import Payment
 from src.modules.payments.repository import BalanceHistoryRepository, PaymentRepository
 from src.modules.user.repository import UserRepository
@@ -38,8 +39,8 @@ class PaymentService:
             "Content-Type": "application/json",
             "Accept": "application/json",
         }
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(method=method, url=url, headers=headers, **kwargs)
+        client = get_http_client("lava.top")
+        response = await client.request(method=method, url=url, headers=headers, **kwargs)
         if response.status_code not in (200, 201):
             logger.error(f"Lava.top API error | status={response.status_code}, body={response.text}")
             raise PaymentError(f"Lava.top API error: {response.status_code}")
@@ -70,7 +71,9 @@ class PaymentService:
             raise PaymentError(f"No Lava.top offer_id configured for package: {package_name}")
 
         # Create payment in database
-        payment = await self.payment_repo.create(user_id=user_id, amount=amount, tokens=tokens)
+        payment = await self.payment_repo.create(
+            user_id=user_id, amount=amount, tokens=tokens, currency=currency or self.lava_currency,
+        )
 
         # Create Lava.top invoice
         try:
@@ -224,9 +227,19 @@ class PaymentService:
 
         return new_balance
 
-    async def get_user_payments(self, user_id: int, offset: int = 0, limit: int = 50) -> list[Payment]:
+    async def get_user_payments(
+        self,
+        user_id: int,
+        offset: int = 0,
+        limit: int = 50,
+        cursor: Cursor | None = None,
+    ) -> list[Payment]:
         """Get user payment history."""
-        return await self.payment_repo.get_user_payments(user_id, offset, limit)
+        return await self.payment_repo.get_user_payments(user_id, offset, limit, cursor=cursor)
+
+    async def count_user_payments(self, user_id: int) -> int:
+        """Count user payments."""
+        return await self.payment_repo.count_payments(user_id=user_id)
 
     async def get_stats(self) -> dict:
         """Get payment statistics."""
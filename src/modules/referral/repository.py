@@ -30,7 +30,6 @@ class ReferralRepository:
         )
         self.session.add(referral)
         await self.session.flush()
-        await self.session.refresh(referral)
         
         logger.info(
             f"Referral created | referrer_id={referrer_id}, referred_id={referred_id}"
@@ -0,0 +1,196 @@
+"""Cache of authenticated users for API requests."""
+
+import asyncio
+import hashlib
+import json
+import time
+from datetime import datetime
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from src.config import settings
+from src.core.cache import LocalCache
+from src.core.hooks import on_commit
+from src.core.redis import get_redis
+from src.modules.user.models import User
+from src.shared.logger import logger
+
+# Other processes drop their local copies of users published here
+INVALIDATE_CHANNEL = "user_cache:invalidate"
+
+_PENDING_KEY = "user_cache_invalidate"
+
+
+def auth_cache_key(*credentials: str) -> str:
+    """Cache key of verified credentials (initData or token)."""
+    return hashlib.sha256("\n".join(credentials).encode()).hexdigest()
+
+
+def _credentials_key(key: str) -> str:
+    return f"user:auth:{key}"
+
+
+def _user_key(user_id: int) -> str:
+    return f"user:principal:{user_id}"
+
+
+def _dump(user: User) -> str:
+    data = {}
+    for attr in inspect(User).column_attrs:
+        value = getattr(user, attr.key)
+        data[attr.key] = value.isoformat() if isinstance(value, datetime) else value
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _load(raw: str) -> User:
+    data = json.loads(raw)
+    for key in ("created_at", "updated_at"):
+        if data.get(key):
+            data[key] = datetime.fromisoformat(data[key])
+    user = User(**data)
+    # Behaves like a row loaded by a closed session: columns are there,
+    # relationships must be loaded explicitly
+    make_transient_to_detached(user)
+    return user
+
+
+class AuthCache:
+    """
+    Resolved users of verified credentials, in process memory and Redis.
+
+    Credentials map to a user ID, and the user ID to a snapshot of the
+    user row, so a change of the user drops all of its credentials at once.
+    Snapshots are invalidated after commits that change balance, ban state
+    or profile; the TTL bounds staleness if an invalidation is lost.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self._credentials = LocalCache(max_size, ttl)
+        self._users = LocalCache(max_size, ttl)
+        # Invalidation time per user, so a load that raced with it is not cached
+        self._invalidated = LocalCache(max_size, ttl)
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, key: str) -> User | None:
+        """User of verified credentials, None on miss."""
+        raw = None
+        user_id = self._credentials.get(key)
+        if user_id is not None:
+            raw = self._users.get(user_id)
+
+        if raw is None:
+            try:
+                client = await get_redis()
+                if user_id is None:
+                    value = await client.get(_credentials_key(key))
+                    if value is None:
+                        return None
+                    user_id = int(value)
+                    self._credentials.set(key, user_id)
+                raw = await client.get(_user_key(user_id))
+            except Exception as e:
+                logger.warning(f"Auth cache lookup failed | error={e}")
+                return None
+            if raw is None:
+                return None
+            self._users.set(user_id, raw)
+
+        return _load(raw)
+
+    async def store(self, key: str, user: User, loaded_at: float) -> None:
+        """
+        Cache the user resolved for credentials.
+
+        `loaded_at` is the monotonic time before the user was read; the
+        snapshot is dropped if the user was invalidated since.
+        """
+        invalidated_at = self._invalidated.get(user.id)
+        if invalidated_at is not None and invalidated_at >= loaded_at:
+            return
+
+        raw = _dump(user)
+        self._credentials.set(key, user.id)
+        self._users.set(user.id, raw)
+        try:
+            client = await get_redis()
+            async with client.pipeline(transaction=False) as pipe:
+                pipe.set(_credentials_key(key), user.id, ex=self.ttl)
+                pipe.set(_user_key(user.id), raw, ex=self.ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Auth cache store failed | user_id={user.id}, error={e}")
+
+    def drop_local(self, user_ids: set[int]) -> None:
+        now = time.monotonic()
+        for user_id in user_ids:
+            self._users.delete(user_id)
+            self._invalidated.set(user_id, now)
+
+    async def invalidate(self, user_ids: set[int]) -> None:
+        """Drop cached users here, in Redis and in other processes."""
+        self.drop_local(user_ids)
+        try:
+            client = await get_redis()
+            async with client.pipeline(transaction=False) as pipe:
+                for user_id in user_ids:
+                    pipe.delete(_user_key(user_id))
+                    pipe.publish(INVALIDATE_CHANNEL, user_id)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Auth cache invalidation failed | user_ids={user_ids}, error={e}")
+
+    async def start(self) -> None:
+        """Start listening for invalidations of other processes."""
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                client = await get_redis()
+                pubsub = client.pubsub()
+                await pubsub.subscribe(INVALIDATE_CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.drop_local({int(message["data"])})
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Invalidations may have been missed while disconnected
+                logger.warning(f"Auth cache listener failed, retrying | error={e}")
+                self._users.clear()
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+
+def invalidate_user_on_commit(session: Session, user_id: int) -> None:
+    """Drop the cached user once the session commits its change."""
+    on_commit(session, _PENDING_KEY, _invalidate_users, set).add(user_id)
+
+
+def _invalidate_users(user_ids: set[int]):
+    auth_cache.drop_local(user_ids)
+    return auth_cache.invalidate(user_ids)
+
+
+auth_cache = AuthCache(
+    ttl=settings.AUTH_CACHE_TTL,
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+)
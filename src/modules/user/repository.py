@@ -1,12 +1,60 @@
 """User repository for database operations."""
 
-from sqlalchemy import func, select, update
+from sqlalchemy import Row, Select, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
+from src.modules.admin.stats import track_on_commit
+from src.modules.user.cache import invalidate_user_on_commit
 from src.modules.user.models import User
+from src.shared.enums import GenerationStatus
 from src.shared.logger import logger
 
 
+def _apply_filters(query: Select, search: str | None, is_banned: bool | None) -> Select:
+    """Admin list filters shared by the page and its count."""
+    if search:
+        search_pattern = f"%{search}%"
+        query = query.where(
+            (User.username.ilike(search_pattern)) |
+            (User.first_name.ilike(search_pattern)) |
+            (User.last_name.ilike(search_pattern)) |
+            (User.telegram_id.cast(str).ilike(search_pattern))
+        )
+
+    if is_banned is not None:
+        query = query.where(User.is_banned == is_banned)
+
+    return query
+
+
+def _generation_totals() -> tuple:
+    """
+    Per-user generation totals as correlated subqueries.
+
+    Each one is an index lookup on (user_id, created_at), so only the
+    users on the page are aggregated unless the page is sorted by a total.
+    """
+    # Imported here: the generation package imports this module via its service.
+    from src.modules.generation.models import Generation
+
+    owned = Generation.user_id == User.id
+    return (
+        select(func.count(Generation.id))
+        .where(owned)
+        .scalar_subquery()
+        .label("total_generations"),
+        select(func.coalesce(func.sum(Generation.tokens_spent), 0))
+        .where(owned, Generation.status == GenerationStatus.SUCCESS)
+        .scalar_subquery()
+        .label("total_spent"),
+        select(func.max(Generation.created_at))
+        .where(owned)
+        .scalar_subquery()
+        .label("last_activity_at"),
+    )
+
+
 class UserRepository:
     """Repository for User database operations."""
 
@@ -47,7 +95,11 @@ class UserRepository:
         )
         self.session.add(user)
         await self.session.flush()
-        await self.session.refresh(user)
+        track_on_commit(
+            self.session.sync_session,
+            totals={"users.total": 1, "users.balance": balance},
+            events={"users.created": 1},
+        )
         
         logger.info(f"User created | telegram_id={telegram_id}, balance={balance}")
         return user
@@ -59,7 +111,7 @@ class UserRepository:
                 setattr(user, key, value)
         
         await self.session.flush()
-        await self.session.refresh(user)
+        invalidate_user_on_commit(self.session.sync_session, user.id)
         return user
 
     async def update_balance(self, user_id: int, amount: int) -> int:
@@ -75,36 +127,56 @@ class UserRepository:
         )
         new_balance = result.scalar_one()
         await self.session.flush()
+        invalidate_user_on_commit(self.session.sync_session, user_id)
+        track_on_commit(self.session.sync_session, totals={"users.balance": amount})
         
         logger.debug(f"Balance updated | user_id={user_id}, change={amount}, new_balance={new_balance}")
         return new_balance
 
     async def set_balance(self, user_id: int, balance: int) -> int:
         """Set user balance to specific value."""
+        result = await self.session.execute(
+            select(User.balance).where(User.id == user_id).with_for_update()
+        )
+        old_balance = result.scalar_one()
         await self.session.execute(
             update(User)
             .where(User.id == user_id)
             .values(balance=balance)
         )
         await self.session.flush()
+        invalidate_user_on_commit(self.session.sync_session, user_id)
+        track_on_commit(self.session.sync_session, totals={"users.balance": balance - old_balance})
         
         logger.debug(f"Balance set | user_id={user_id}, balance={balance}")
         return balance
 
     async def ban(self, user_id: int) -> None:
         """Ban user."""
-        await self.session.execute(
-            update(User).where(User.id == user_id).values(is_banned=True)
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id, User.is_banned.is_(False))
+            .values(is_banned=True)
+            .returning(User.id)
         )
         await self.session.flush()
+        invalidate_user_on_commit(self.session.sync_session, user_id)
+        if result.scalar_one_or_none() is not None:
+            track_on_commit(self.session.sync_session, totals={"users.banned": 1})
         logger.info(f"User banned | user_id={user_id}")
 
     async def unban(self, user_id: int) -> None:
         """Unban user."""
-        await self.session.execute(
-            update(User).where(User.id == user_id).values(is_banned=False)
+        result = await self.session.execute(
+            update(User)
+            .where(User.id == user_id, User.is_banned.is_(True))
+            .values(is_banned=False)
+            .returning(User.id)
         )
         await self.session.flush()
+        invalidate_user_on_commit(self.session.sync_session, user_id)
+        if result.scalar_one_or_none() is not None:
+            track_on_commit(self.session.sync_session, totals={"users.banned": -1})
         logger.info(f"User unbanned | user_id={user_id}")
 
     async def get_all(
@@ -115,20 +187,7 @@ class UserRepository:
         is_banned: bool | None = None,
     ) -> list[User]:
         """Get all users with optional filtering."""
-        query = select(User)
-        
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.where(
-                (User.username.ilike(search_pattern)) |
-                (User.first_name.ilike(search_pattern)) |
-                (User.last_name.ilike(search_pattern)) |
-                (User.telegram_id.cast(str).ilike(search_pattern))
-            )
-        
-        if is_banned is not None:
-            query = query.where(User.is_banned == is_banned)
-        
+        query = _apply_filters(select(User), search, is_banned)
         query = query.order_by(User.created_at.desc()).offset(offset).limit(limit)
         
         result = await self.session.execute(query)
@@ -140,22 +199,56 @@ class UserRepository:
         is_banned: bool | None = None,
     ) -> int:
         """Count users with optional filtering."""
-        query = select(func.count(User.id))
-        
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.where(
-                (User.username.ilike(search_pattern)) |
-                (User.first_name.ilike(search_pattern)) |
-                (User.last_name.ilike(search_pattern))
-            )
-        
-        if is_banned is not None:
-            query = query.where(User.is_banned == is_banned)
-        
+        query = _apply_filters(select(func.count(User.id)), search, is_banned)
         result = await self.session.execute(query)
         return result.scalar_one()
 
+    async def get_admin_list(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        is_banned: bool | None = None,
+        sort: str = "created_at",
+        descending: bool = True,
+    ) -> tuple[list[Row], int]:
+        """
+        Users with generation totals for the admin panel, in one query.
+
+        Rows carry `User`, `total_generations`, `total_spent` and
+        `last_activity_at`; the filtered total rides along as a window
+        function. Relationships are not loaded.
+        """
+        totals = _generation_totals()
+        sort_columns = {
+            "created_at": User.created_at,
+            "balance": User.balance,
+            **{column.name: column for column in totals},
+        }
+        order = sort_columns[sort].desc() if descending else sort_columns[sort].asc()
+
+        query = _apply_filters(
+            select(User, *totals, func.count().over().label("total")).options(raiseload("*")),
+            search,
+            is_banned,
+        )
+        query = query.order_by(order.nulls_last(), User.id.desc()).offset(offset).limit(limit)
+
+        rows = list((await self.session.execute(query)).all())
+        if rows:
+            return rows, rows[0].total
+        # Past the last page there is no row to carry the total
+        return rows, await self.count(search, is_banned) if offset else 0
+
+    async def get_admin_entry(self, user_id: int) -> Row | None:
+        """Single user with the same totals as `get_admin_list`."""
+        result = await self.session.execute(
+            select(User, *_generation_totals())
+            .where(User.id == user_id)
+            .options(raiseload("*"))
+        )
+        return result.one_or_none()
+
     async def get_by_balance_filter(
         self,
         balance_threshold: int,
@@ -1,9 +1,11 @@
 """User service for business logic."""
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import settings
 from src.core.exceptions import NotFoundError, UserBannedError
+from src.core.pagination import Cursor
 from src.modules.payments.repository import BalanceHistoryRepository
 from src.modules.referral.repository import ReferralRepository
 from src.modules.user.models import User
@@ -186,10 +188,11 @@ class UserService:
         user_id: int,
         offset: int = 0,
         limit: int = 50,
+        cursor: Cursor | None = None,
     ) -> list:
         """Get user balance history."""
         return await self.balance_history_repo.get_user_history(
-            user_id, offset, limit
+            user_id, offset, limit, cursor=cursor
         )
 
     async def get_referral_info(self, user: User) -> dict:
@@ -229,6 +232,27 @@ class UserService:
         total = await self.user_repo.count(search, is_banned)
         return users, total
 
+    async def get_admin_users(
+        self,
+        offset: int = 0,
+        limit: int = 50,
+        search: str | None = None,
+        is_banned: bool | None = None,
+        sort: str = "created_at",
+        descending: bool = True,
+    ) -> tuple[list[Row], int]:
+        """Get users with generation totals for the admin panel."""
+        return await self.user_repo.get_admin_list(
+            offset, limit, search, is_banned, sort, descending
+        )
+
+    async def get_admin_user(self, user_id: int) -> Row:
+        """Get user with generation totals for the admin panel."""
+        row = await self.user_repo.get_admin_entry(user_id)
+        if not row:
+            raise NotFoundError("Пользователь", user_id)
+        return row
+
     async def ban_user(self, user_id: int) -> None:
         """Ban user."""
         user = await self.get_user(user_id)
@@ -17,8 +17,9 @@ EARN_TOKENS_BUTTON_TEXT = "💎 Заработать токены"
 TELEGRAM_CHANNEL_URL = "https://t.me/aimakepromt"
 
 # === Generation ===
-GENERATION_POLL_INTERVAL = 3
+GENERATION_POLL_INTERVAL = 5
 GENERATION_MAX_POLL_ATTEMPTS = 120
+GENERATION_MAX_BATCH_SIZE = 4
 
 # === Files ===
 MAX_FILE_SIZE_MB = 10
@@ -0,0 +1,158 @@
+"""Generation worker entry point."""
+
+import asyncio
+import signal
+
+from src.bot.loader import bot
+from src.config import settings
+from src.core.database import check_db_connection, close_db
+from src.core.http import close_http_clients, init_http_clients
+from src.core.queue import Job, JobQueue
+from src.core.redis import check_redis_connection, close_redis
+from src.modules.generation.jobs import (
+    ABANDON_HANDLERS,
+    HANDLERS,
+    generation_queue,
+    resume_pending,
+)
+from src.shared.logger import logger
+
+
+class Worker:
+    """
+    Consume generation jobs from the queue.
+
+    Each job keeps its visibility deadline extended while it runs, so long
+    downloads are not redelivered to another worker. On shutdown, running
+    jobs get a grace period; whatever is left is redelivered later.
+    """
+
+    IDLE_DELAY = 0.5
+    SHUTDOWN_GRACE = 30.0
+
+    def __init__(self, queue: JobQueue, concurrency: int):
+        self.queue = queue
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        """Dequeue jobs until stopped."""
+        logger.info(f"Worker started | queue={self.queue.name}, concurrency={self.concurrency}")
+
+        while not self._stopping.is_set():
+            await self._semaphore.acquire()
+            try:
+                job = await self.queue.dequeue()
+            except Exception as e:
+                self._semaphore.release()
+                logger.error(f"Dequeue failed | error={e}")
+                await self._idle()
+                continue
+
+            if job is None:
+                self._semaphore.release()
+                await self._idle()
+                continue
+
+            task = asyncio.create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if self._tasks:
+            logger.info(f"Waiting for running jobs | count={len(self._tasks)}")
+            _, pending = await asyncio.wait(self._tasks, timeout=self.SHUTDOWN_GRACE)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        logger.info("Worker stopped")
+
+    async def _idle(self) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=self.IDLE_DELAY)
+        except TimeoutError:
+            pass
+
+    async def _execute(self, job: Job) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                logger.error(f"Unknown job kind | kind={job.kind}, id={job.id}")
+                await self.queue.ack(job)
+                return
+
+            if job.exhausted:
+                # Redelivered after a crash or shutdown: the job may have run
+                # already and must not run more often than max_attempts
+                abandon = ABANDON_HANDLERS.get(job.kind)
+                if abandon is not None:
+                    await abandon(job)
+                await self.queue.dead_letter(
+                    job, f"Redelivered past max_attempts={job.max_attempts}"
+                )
+                return
+
+            rescheduled = await handler(job)
+            if not rescheduled:
+                await self.queue.ack(job)
+
+        except asyncio.CancelledError:
+            # Not acked: redelivered after the visibility timeout
+            raise
+        except Exception as e:
+            logger.exception(f"Job failed | kind={job.kind}, id={job.id}, error={e}")
+            try:
+                await self.queue.retry(job, str(e))
+            except Exception as retry_error:
+                logger.error(f"Job retry failed | id={job.id}, error={retry_error}")
+        finally:
+            heartbeat.cancel()
+            self._semaphore.release()
+
+    async def _heartbeat(self, job: Job) -> None:
+        interval = self.queue.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.extend(job)
+            except Exception as e:
+                logger.warning(f"Job heartbeat failed | id={job.id}, error={e}")
+
+
+async def main() -> None:
+    """Run generation worker until SIGINT/SIGTERM."""
+    if not await check_db_connection():
+        raise RuntimeError("Failed to connect to database")
+    if not await check_redis_connection():
+        raise RuntimeError("Failed to connect to Redis")
+
+    init_http_clients()
+
+    try:
+        await resume_pending()
+    except Exception as e:
+        logger.error(f"Failed to resume generations | error={e}")
+
+    worker = Worker(generation_queue, concurrency=settings.GENERATION_WORKER_CONCURRENCY)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await close_http_clients()
+        await close_db()
+        await close_redis()
+        await bot.session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
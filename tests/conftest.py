@@ -0,0 +1,43 @@
+"""Shared fixtures: a throwaway SQLite database and an in-memory Redis."""
+
+import os
+import tempfile
+
+_database = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["DEV_MODE"] = "true"
+os.environ["DATABASE_URL_DEV"] = f"sqlite+aiosqlite:///{_database}"
+# Well-formed placeholder, the bot is created on import but never called
+os.environ["BOT_TOKEN_DEV"] = "123456:TEST-test-test-test-test-test-test00"
+
+import fakeredis  # noqa: E402
+import pytest  # noqa: E402
+
+from src.core import redis as redis_module  # noqa: E402
+from src.core.database import Base, engine  # noqa: E402
+from src.modules.ai_models import models as _ai_models  # noqa: E402, F401
+from src.modules.analytics import models as _analytics  # noqa: E402, F401
+from src.modules.gallery import models as _gallery  # noqa: E402, F401
+from src.modules.generation import models as _generation  # noqa: E402, F401
+from src.modules.payments import models as _payments  # noqa: E402, F401
+from src.modules.referral import models as _referral  # noqa: E402, F401
+from src.modules.user import models as _user  # noqa: E402, F401
+
+
+@pytest.fixture
+async def database():
+    """Fresh schema for the test, dropped afterwards."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+@pytest.fixture
+async def redis():
+    """In-memory Redis behind `get_redis`, Lua scripts included."""
+    client = fakeredis.aioredis.FakeRedis(decode_responses=True)
+    redis_module._redis_client = client
+    yield client
+    redis_module._redis_client = None
+    await client.aclose()
@@ -0,0 +1,70 @@
+"""Provider callback authentication."""
+
+import uuid
+
+from src.config import settings
+from src.core.database import async_session_maker
+from src.modules.generation.callbacks import (
+    build_callback_url,
+    callback_token,
+    verify_callback_token,
+)
+from src.modules.generation.models import Generation
+from src.modules.generation.providers import GenerationTask
+from src.modules.generation.service import GenerationService
+from src.modules.user.models import User
+from src.shared.enums import GenerationStatus, GenerationType
+
+
+def test_token_bound_to_generation():
+    generation_id = uuid.uuid4()
+    token = callback_token("kie.ai", generation_id)
+
+    assert verify_callback_token("kie.ai", generation_id, token)
+    assert not verify_callback_token("kie.ai", uuid.uuid4(), token)
+    assert not verify_callback_token("poyo.ai", generation_id, token)
+    assert not verify_callback_token("kie.ai", None, token)
+    assert not verify_callback_token("kie.ai", generation_id, None)
+
+
+def test_callback_url_carries_generation(monkeypatch):
+    monkeypatch.setattr(settings, "GENERATION_CALLBACK_BASE_URL", "https://bot.example/")
+    generation_id = uuid.uuid4()
+
+    url = build_callback_url("kie.ai", generation_id)
+
+    assert url == (
+        "https://bot.example/api/v1/generation/callback/kie.ai"
+        f"?generation_id={generation_id}&token={callback_token('kie.ai', generation_id)}"
+    )
+
+
+async def _pending_generation(task_id: str) -> uuid.UUID:
+    async with async_session_maker() as session:
+        user = User(telegram_id=42, first_name="Test")
+        session.add(user)
+        await session.flush()
+        generation = Generation(
+            user_id=user.id,
+            generation_type=GenerationType.IMAGE,
+            status=GenerationStatus.PROCESSING,
+            kie_task_id=task_id,
+        )
+        session.add(generation)
+        await session.commit()
+        return generation.id
+
+
+async def test_resolve_callback_requires_matching_task(database):
+    generation_id = await _pending_generation("task-1")
+
+    async with async_session_maker() as session:
+        service = GenerationService(session)
+        foreign = GenerationTask(task_id="task-2", status="success", result_url="https://evil")
+        assert await service.resolve_callback("kie.ai", generation_id, foreign) is None
+
+        own = GenerationTask(task_id="task-1", status="success", result_url="https://cdn")
+        generation, telegram_id = await service.resolve_callback("kie.ai", generation_id, own)
+
+    assert generation.id == generation_id
+    assert telegram_id == 42
@@ -0,0 +1,47 @@
+"""Provider circuit breakers."""
+
+import time
+
+from src.modules.generation.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreakerRegistry
+
+
+def _half_open(registry: CircuitBreakerRegistry, provider: str, model: str | None = None):
+    breaker = registry.get(provider, model)
+    breaker.state = OPEN
+    breaker.opened_at = time.monotonic() - breaker.cooldown
+    return breaker
+
+
+def test_half_open_admits_single_probe():
+    registry = CircuitBreakerRegistry()
+    breaker = _half_open(registry, "kie.ai")
+
+    assert registry.admit("kie.ai", "veo3") is True
+    assert breaker.state == HALF_OPEN
+    assert registry.admit("kie.ai", "veo3") is False
+
+    breaker.record(ok=True, latency=0.1)
+    assert breaker.state == CLOSED
+    assert registry.admit("kie.ai", "veo3") is True
+
+
+def test_open_circuit_refuses():
+    registry = CircuitBreakerRegistry()
+    breaker = registry.get("kie.ai")
+    breaker.state = OPEN
+    breaker.opened_at = time.monotonic()
+
+    assert registry.admit("kie.ai") is False
+
+
+def test_refused_model_keeps_provider_probe():
+    registry = CircuitBreakerRegistry()
+    provider = _half_open(registry, "kie.ai")
+    model = registry.get("kie.ai", "veo3")
+    model.state = OPEN
+    model.opened_at = time.monotonic()
+
+    assert registry.admit("kie.ai", "veo3") is False
+    # The provider probe slot is still free for another model
+    assert provider.allow() is True
+    assert registry.admit("kie.ai", "flux") is True
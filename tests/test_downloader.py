@@ -0,0 +1,42 @@
+"""Result downloader part file handling."""
+
+import asyncio
+
+import pytest
+
+from src.core.exceptions import ExternalAPIError
+from src.modules.generation.downloader import ResultDownloader, _RetryableDownloadError
+
+
+def _failing_downloader(error: BaseException) -> ResultDownloader:
+    downloader = ResultDownloader(max_attempts=2, retry_delay=0)
+
+    async def transfer(url, part_path, ext):
+        part_path.write_bytes(b"partial")
+        raise error
+
+    downloader._transfer = transfer
+    return downloader
+
+
+async def test_part_file_kept_on_cancel(tmp_path):
+    downloader = _failing_downloader(asyncio.CancelledError())
+
+    with pytest.raises(asyncio.CancelledError):
+        await downloader.download("https://example.com/a.png", tmp_path, "result")
+
+    assert (tmp_path / "result.part").exists()
+
+
+@pytest.mark.parametrize("error", [
+    _RetryableDownloadError("connection reset"),
+    ExternalAPIError(service="download", message="too large"),
+])
+async def test_part_file_removed_on_failure(tmp_path, error):
+    downloader = _failing_downloader(error)
+
+    with pytest.raises(ExternalAPIError):
+        await downloader.download("https://example.com/a.png", tmp_path, "result")
+
+    assert not (tmp_path / "result.part").exists()
+    assert downloader.stats.failures == 1
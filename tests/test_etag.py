@@ -0,0 +1,81 @@
+"""Conditional GET with ETags."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api.etag import conditional, etag_matches
+
+STAMPS: dict[int, str | None] = {}
+CALLS: list[int] = []
+
+
+async def stamp_of(user_id: int) -> str | None:
+    return STAMPS.get(user_id)
+
+
+app = FastAPI()
+
+
+@app.get("/balance")
+@conditional(stamp_of)
+async def get_balance(user_id: int) -> dict:
+    CALLS.append(user_id)
+    return {"user_id": user_id, "balance": 100}
+
+
+@pytest.fixture
+def client():
+    STAMPS.clear()
+    CALLS.clear()
+    return TestClient(app)
+
+
+def test_matching_etag_gets_304_without_running_endpoint(client):
+    STAMPS[1] = "v1"
+    first = client.get("/balance", params={"user_id": 1})
+    etag = first.headers["etag"]
+
+    second = client.get("/balance", params={"user_id": 1}, headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.json() == {"user_id": 1, "balance": 100}
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+    assert CALLS == [1]
+
+
+def test_changed_stamp_serves_fresh_response(client):
+    STAMPS[1] = "v1"
+    etag = client.get("/balance", params={"user_id": 1}).headers["etag"]
+    STAMPS[1] = "v2"
+
+    response = client.get("/balance", params={"user_id": 1}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert CALLS == [1, 1]
+
+
+def test_etag_depends_on_url(client):
+    STAMPS[1] = STAMPS[2] = "v1"
+    etag = client.get("/balance", params={"user_id": 1}).headers["etag"]
+
+    response = client.get("/balance", params={"user_id": 2}, headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+
+
+def test_no_stamp_serves_unconditionally(client):
+    response = client.get("/balance", params={"user_id": 3}, headers={"If-None-Match": "*"})
+
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches(None, '"a"')
+    assert not etag_matches('"a"', '"b"')
@@ -0,0 +1,96 @@
+"""Refunds of generations that never reach a provider."""
+
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy import select
+
+from src.core.database import async_session_maker
+from src.core.queue import Job
+from src.modules.generation.jobs import JOB_CREATE, abandon_create
+from src.modules.generation.models import Generation
+from src.modules.generation.service import GenerationService
+from src.modules.payments.models import BalanceHistory
+from src.modules.user.models import User
+from src.shared.enums import BalanceOperationType, GenerationStatus, GenerationType
+
+
+async def _charged_generation(task_id: str | None = None) -> uuid.UUID:
+    """Generation of 10 tokens, already charged from a balance of 100."""
+    async with async_session_maker() as session:
+        user = User(telegram_id=7, first_name="Test", balance=90)
+        session.add(user)
+        await session.flush()
+        generation = Generation(
+            user_id=user.id,
+            generation_type=GenerationType.IMAGE,
+            status=GenerationStatus.PENDING,
+            tokens_spent=10,
+            kie_task_id=task_id,
+        )
+        session.add(generation)
+        await session.commit()
+        return generation.id
+
+
+async def _state(generation_id: uuid.UUID) -> tuple[GenerationStatus, int, list[int]]:
+    """Generation status, user balance and refunded amounts."""
+    async with async_session_maker() as session:
+        generation = await session.get(Generation, generation_id)
+        user = await session.get(User, generation.user_id)
+        refunds = await session.scalars(
+            select(BalanceHistory.amount).where(
+                BalanceHistory.reference_id == str(generation_id),
+                BalanceHistory.operation_type == BalanceOperationType.REFUND,
+            )
+        )
+        return generation.status, user.balance, list(refunds)
+
+
+def _create_job(generation_id: uuid.UUID) -> Job:
+    return Job(
+        kind=JOB_CREATE,
+        payload={"generation_id": str(generation_id), "telegram_id": None},
+        max_attempts=1,
+    )
+
+
+async def test_abandon_create_refunds(database, redis):
+    generation_id = await _charged_generation()
+
+    await abandon_create(_create_job(generation_id))
+
+    assert await _state(generation_id) == (GenerationStatus.FAILED, 100, [10])
+
+
+async def test_abandon_create_keeps_submitted_generation(database, redis):
+    generation_id = await _charged_generation(task_id="task-1")
+
+    await abandon_create(_create_job(generation_id))
+
+    assert await _state(generation_id) == (GenerationStatus.PENDING, 90, [])
+
+
+async def test_abandon_create_refunds_once(database, redis):
+    generation_id = await _charged_generation()
+
+    await abandon_create(_create_job(generation_id))
+    await abandon_create(_create_job(generation_id))
+
+    assert await _state(generation_id) == (GenerationStatus.FAILED, 100, [10])
+
+
+async def test_failed_enqueue_refunds(database, redis, monkeypatch):
+    generation_id = await _charged_generation()
+
+    async def unavailable(*args, **kwargs):
+        raise ConnectionError("Redis unavailable")
+
+    monkeypatch.setattr("src.modules.generation.service.enqueue_create", unavailable)
+    model = SimpleNamespace(provider_model="flux", provider="kie.ai", code="flux")
+
+    async with async_session_maker() as session:
+        generation = await session.get(Generation, generation_id)
+        await GenerationService(session)._enqueue_create(generation, model, telegram_id=None)
+
+    assert await _state(generation_id) == (GenerationStatus.FAILED, 100, [10])
@@ -0,0 +1,151 @@
+"""Charging and creating generations in one step.
+
+Runs on SQLite, and on PostgreSQL too (the single-statement CTE path)
+when TEST_POSTGRES_URL points at a disposable database, e.g.
+postgresql+asyncpg://postgres@localhost/test.
+"""
+
+import os
+import uuid
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.config import settings
+from src.core.database import Base, async_session_maker
+from src.core.database import engine as database_engine
+from src.modules.generation.models import Generation
+from src.modules.generation.repository import GenerationRepository
+from src.modules.payments.models import BalanceHistory
+from src.modules.user.models import User
+from src.shared.enums import BalanceOperationType, GenerationStatus, GenerationType
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+async def session_maker(request, redis, monkeypatch):
+    """Session factory of each backend; the repository picks its path by the URL."""
+    if request.param == "sqlite":
+        engine, maker = database_engine, async_session_maker
+    else:
+        if not POSTGRES_URL:
+            pytest.skip("TEST_POSTGRES_URL is not set")
+        monkeypatch.setattr(settings, "DATABASE_URL_DEV", POSTGRES_URL)
+        engine = create_async_engine(POSTGRES_URL)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield maker
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        if engine is not database_engine:
+            await engine.dispose()
+
+
+async def _user(session_maker, balance: int) -> int:
+    async with session_maker() as session:
+        user = User(telegram_id=555, first_name="Test", balance=balance)
+        session.add(user)
+        await session.commit()
+        return user.id
+
+
+def _rows(count: int, batch_id: uuid.UUID) -> list[dict]:
+    return [
+        {
+            "model_id": None,
+            "generation_type": GenerationType.IMAGE,
+            "tokens_spent": 10,
+            "prompt": f"variant {i}",
+            "input_file_url": None,
+            "params": {"aspect_ratio": "1:1", "_provider": "kie.ai"},
+            "batch_id": batch_id,
+        }
+        for i in range(count)
+    ]
+
+
+async def _written(session_maker, user_id: int) -> tuple[int, list[Generation], list[BalanceHistory]]:
+    async with session_maker() as session:
+        balance = await session.scalar(select(User.balance).where(User.id == user_id))
+        generations = list(await session.scalars(
+            select(Generation).where(Generation.user_id == user_id).order_by(Generation.prompt)
+        ))
+        ledger = list(await session.scalars(
+            select(BalanceHistory).where(BalanceHistory.user_id == user_id)
+        ))
+        return balance, generations, ledger
+
+
+async def test_insufficient_balance_writes_nothing(session_maker):
+    user_id = await _user(session_maker, balance=25)
+
+    async with session_maker() as session:
+        charged = await GenerationRepository(session).create_charged(
+            user_id, 30, _rows(3, uuid.uuid4()), "batch", "ref"
+        )
+        await session.commit()
+
+    assert charged is None
+    balance, generations, ledger = await _written(session_maker, user_id)
+    assert (balance, generations, ledger) == (25, [], [])
+
+
+async def test_unknown_user(session_maker):
+    async with session_maker() as session:
+        charged = await GenerationRepository(session).create_charged(
+            999, 10, _rows(1, uuid.uuid4()), "single", "ref"
+        )
+
+    assert charged is None
+
+
+async def test_charges_batch_in_one_step(session_maker):
+    user_id = await _user(session_maker, balance=100)
+    batch_id = uuid.uuid4()
+
+    async with session_maker() as session:
+        generations, balance, telegram_id = await GenerationRepository(session).create_charged(
+            user_id, 30, _rows(3, batch_id), "batch", str(batch_id)
+        )
+        await session.commit()
+
+    assert (balance, telegram_id) == (70, 555)
+    assert len({generation.id for generation in generations}) == 3
+    assert all(generation.status == GenerationStatus.PENDING for generation in generations)
+
+    stored_balance, stored, ledger = await _written(session_maker, user_id)
+    assert stored_balance == 70
+    assert sorted(g.id for g in stored) == sorted(g.id for g in generations)
+    assert [g.prompt for g in stored] == ["variant 0", "variant 1", "variant 2"]
+    assert all(
+        (g.batch_id, g.tokens_spent, g.status, g.params["_provider"])
+        == (batch_id, 10, GenerationStatus.PENDING, "kie.ai")
+        for g in stored
+    )
+    assert [
+        (row.amount, row.balance_after, row.operation_type, row.reference_id) for row in ledger
+    ] == [(-30, 70, BalanceOperationType.GENERATION, str(batch_id))]
+
+
+async def test_returned_generations_usable_after_commit(session_maker):
+    user_id = await _user(session_maker, balance=10)
+    generation_id = uuid.uuid4()
+    rows = _rows(1, uuid.uuid4())
+    rows[0]["id"] = generation_id
+
+    async with session_maker() as session:
+        (generation,), _, _ = await GenerationRepository(session).create_charged(
+            user_id, 10, rows, "single", str(generation_id)
+        )
+        await session.commit()
+        assert generation.id == generation_id
+        assert generation.prompt == "variant 0"
+
+        count = await session.scalar(select(func.count()).select_from(Generation))
+    assert count == 1
@@ -0,0 +1,42 @@
+"""Session commit hooks."""
+
+import asyncio
+
+from sqlalchemy import text
+
+from src.core.database import async_session_maker
+from src.core.hooks import on_commit
+
+
+async def test_on_commit_runs_once_with_collected_state():
+    seen = []
+
+    async def record(values: list[int]) -> None:
+        seen.append(list(values))
+
+    async with async_session_maker() as session:
+        await session.execute(text("SELECT 1"))
+        on_commit(session.sync_session, "numbers", record, list).append(1)
+        on_commit(session.sync_session, "numbers", record, list).append(2)
+        await session.commit()
+    await asyncio.sleep(0)
+
+    assert seen == [[1, 2]]
+
+
+async def test_on_commit_dropped_on_rollback():
+    seen = []
+
+    async def record(values: list[int]) -> None:
+        seen.append(values)
+
+    async with async_session_maker() as session:
+        await session.execute(text("SELECT 1"))
+        on_commit(session.sync_session, "numbers", record, list).append(1)
+        await session.rollback()
+
+        await session.execute(text("SELECT 1"))
+        await session.commit()
+    await asyncio.sleep(0)
+
+    assert seen == []
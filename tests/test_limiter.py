@@ -0,0 +1,63 @@
+"""Provider rate and concurrency limits."""
+
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.core.exceptions import ExternalAPIError
+from src.modules.generation.providers import GenerationTask
+from src.modules.generation.providers.base import BaseGenerationProvider, GenerationRequest
+from src.modules.generation.providers.limiter import RateLimitedProvider
+
+
+class FakeProvider(BaseGenerationProvider):
+    """Creates are limited on their own bucket, status checks are not limited."""
+
+    def endpoint_for_request(self, request: GenerationRequest) -> str:
+        return "create"
+
+    def endpoint_for_task(self, task_id: str) -> str:
+        return "status"
+
+    async def create_task(self, request: GenerationRequest) -> GenerationTask:
+        return GenerationTask(task_id="task", status="pending")
+
+    async def get_task_status(self, task_id: str) -> GenerationTask:
+        return GenerationTask(task_id=task_id, status="processing")
+
+    async def cancel_task(self, task_id: str) -> bool:
+        return True
+
+
+@pytest.fixture
+def limited(redis, monkeypatch):
+    # One create per second, a single concurrency slot shared by all endpoints
+    monkeypatch.setattr(settings, "PROVIDER_RATE_LIMITS", {"fake:create": 1.0})
+    monkeypatch.setattr(settings, "PROVIDER_RATE_BURST_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "PROVIDER_MAX_CONCURRENCY", {"fake": 1})
+    monkeypatch.setattr(settings, "PROVIDER_RATE_LIMIT_MAX_WAIT", 5.0)
+    return RateLimitedProvider("fake", FakeProvider())
+
+
+async def test_throttled_create_does_not_hold_slot(limited):
+    await limited.create_task(GenerationRequest(model="m"))
+    throttled = asyncio.create_task(limited.create_task(GenerationRequest(model="m")))
+    await asyncio.sleep(0.05)
+
+    try:
+        # The only slot is free while the second create waits for its token
+        status = await asyncio.wait_for(limited.get_task_status("task"), timeout=0.5)
+        assert status.status == "processing"
+        assert not throttled.done()
+    finally:
+        await throttled
+
+
+async def test_create_fails_when_token_wait_too_long(limited, monkeypatch):
+    monkeypatch.setattr(settings, "PROVIDER_RATE_LIMIT_MAX_WAIT", 0.1)
+    await limited.create_task(GenerationRequest(model="m"))
+
+    with pytest.raises(ExternalAPIError) as error:
+        await limited.create_task(GenerationRequest(model="m"))
+    assert error.value.status_code == 429
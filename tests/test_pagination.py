@@ -0,0 +1,46 @@
+"""Keyset pagination cursors."""
+
+import uuid
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.core.exceptions import ValidationError
+from src.core.pagination import Cursor
+
+CREATED_AT = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+
+
+@pytest.mark.parametrize("row_id, id_type", [(uuid.uuid4(), uuid.UUID), (42, int)])
+def test_round_trip(row_id, id_type):
+    cursor = Cursor(created_at=CREATED_AT, id=row_id)
+
+    assert Cursor.decode(cursor.encode(), id_type) == cursor
+
+
+@pytest.mark.parametrize("row_id, id_type", [(42, uuid.UUID), (uuid.uuid4(), int)])
+def test_cursor_of_another_list_rejected(row_id, id_type):
+    # E.g. a balance history cursor (int IDs) sent to the generation list
+    encoded = Cursor(created_at=CREATED_AT, id=row_id).encode()
+
+    with pytest.raises(ValidationError):
+        Cursor.decode(encoded, id_type)
+
+
+@pytest.mark.parametrize("value", ["", "not-base64!", "WzEsMiwzXQ", "WyJub3QgYSBkYXRlIiwgMV0"])
+def test_malformed_cursor_rejected(value):
+    with pytest.raises(ValidationError):
+        Cursor.decode(value, int)
+
+
+def test_decode_optional():
+    assert Cursor.decode_optional(None) is None
+    assert Cursor.decode_optional("") is None
+
+
+def test_next_page_only_when_page_is_full():
+    rows = [SimpleNamespace(created_at=CREATED_AT, id=i) for i in (3, 2)]
+
+    assert Cursor.next_page(rows, limit=3) is None
+    assert Cursor.decode(Cursor.next_page(rows, limit=2), int) == Cursor(CREATED_AT, 2)
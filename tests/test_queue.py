@@ -0,0 +1,124 @@
+"""Durable Redis job queue and worker delivery rules."""
+
+import pytest
+
+from src.core.queue import Job, JobQueue
+from src.worker import Worker
+
+
+@pytest.fixture
+def queue(redis):
+    # No retry backoff, so nothing waits on the clock
+    return JobQueue("test", retry_delay=0)
+
+
+async def _redelivered(queue: JobQueue, job: Job) -> Job:
+    """Deliver the job, then again as if its worker died without acking."""
+    queue.visibility_timeout = 0
+    await queue.enqueue(job)
+    await queue.dequeue()
+    redelivered = await queue.dequeue()
+    queue.visibility_timeout = 300
+    return redelivered
+
+
+async def test_enqueue_is_idempotent_by_id(queue):
+    assert await queue.enqueue(Job(kind="k", payload={"n": 1}, id="job")) is True
+    assert await queue.enqueue(Job(kind="k", payload={"n": 2}, id="job")) is False
+
+    job = await queue.dequeue()
+    assert (job.id, job.payload, job.attempt) == ("job", {"n": 1}, 1)
+    assert await queue.dequeue() is None
+
+
+async def test_ack_removes_job(queue):
+    await queue.enqueue(Job(kind="k", payload={}, id="job"))
+    job = await queue.dequeue()
+
+    await queue.ack(job)
+
+    assert await queue.stats() == {"ready": 0, "delayed": 0, "inflight": 0, "dead": 0}
+    assert await queue.dequeue() is None
+
+
+async def test_reschedule_resets_deliveries(queue):
+    await queue.enqueue(Job(kind="k", payload={}, id="job"))
+    job = await queue.dequeue()
+    job.payload["step"] = 2
+
+    assert await queue.reschedule(job, delay=0) is True
+
+    again = await queue.dequeue()
+    assert again.attempt == 1
+    assert again.payload == {"step": 2}
+
+
+async def test_reschedule_of_cancelled_job_is_dropped(queue):
+    await queue.enqueue(Job(kind="k", payload={}, id="job"))
+    job = await queue.dequeue()
+    await queue.cancel(job.id)
+
+    assert await queue.reschedule(job, delay=0) is False
+    assert await queue.dequeue() is None
+
+
+async def test_retry_then_dead_letter(queue, redis):
+    await queue.enqueue(Job(kind="k", payload={}, id="job", max_attempts=2))
+
+    first = await queue.dequeue()
+    await queue.retry(first, "boom")
+    second = await queue.dequeue()
+    assert second.attempt == 2
+
+    await queue.retry(second, "boom")
+
+    assert await queue.dequeue() is None
+    assert (await queue.stats())["dead"] == 1
+    assert "boom" in await redis.hget(queue.dead_key, "job")
+
+
+async def test_unacked_job_redelivered_after_visibility_timeout(queue):
+    redelivered = await _redelivered(queue, Job(kind="k", payload={}, id="job", max_attempts=1))
+
+    assert redelivered.id == "job"
+    assert redelivered.attempt == 2
+    assert redelivered.exhausted
+
+
+async def test_worker_abandons_exhausted_job(queue, monkeypatch):
+    ran, abandoned = [], []
+
+    async def handler(job):
+        ran.append(job.id)
+
+    async def abandon(job):
+        abandoned.append(job.id)
+
+    monkeypatch.setattr("src.worker.HANDLERS", {"k": handler})
+    monkeypatch.setattr("src.worker.ABANDON_HANDLERS", {"k": abandon})
+    redelivered = await _redelivered(queue, Job(kind="k", payload={}, id="job", max_attempts=1))
+
+    worker = Worker(queue, concurrency=1)
+    await worker._semaphore.acquire()
+    await worker._execute(redelivered)
+
+    assert ran == []
+    assert abandoned == ["job"]
+    assert (await queue.stats())["dead"] == 1
+
+
+async def test_worker_retries_failed_job(queue, monkeypatch):
+    async def handler(job):
+        raise RuntimeError("provider down")
+
+    monkeypatch.setattr("src.worker.HANDLERS", {"k": handler})
+    await queue.enqueue(Job(kind="k", payload={}, id="job", max_attempts=3))
+    job = await queue.dequeue()
+
+    worker = Worker(queue, concurrency=1)
+    await worker._semaphore.acquire()
+    await worker._execute(job)
+
+    retried = await queue.dequeue()
+    assert retried.attempt == 2
+    assert (await queue.stats())["dead"] == 0
@@ -0,0 +1,52 @@
+"""Analytics rollup job."""
+
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import func, select
+
+from src.core.database import background_session_maker
+from src.modules.analytics.models import BalanceRollup, RollupWatermark
+from src.modules.analytics.rollup import RollupJob
+from src.modules.payments.models import BalanceHistory
+from src.modules.user.models import User
+from src.shared.enums import BalanceOperationType
+
+
+async def test_run_returns_once_caught_up(database):
+    start = datetime.now(UTC) - timedelta(hours=3)
+    async with background_session_maker() as session:
+        user = User(telegram_id=1, first_name="Test")
+        session.add(user)
+        await session.flush()
+        session.add_all(
+            BalanceHistory(
+                user_id=user.id,
+                amount=10,
+                balance_after=10 * (i + 1),
+                operation_type=BalanceOperationType.DEPOSIT,
+                description="deposit",
+                created_at=start + timedelta(minutes=10 * i),
+            )
+            for i in range(12)
+        )
+        await session.commit()
+
+    job = RollupJob(lag=60)
+    aggregated = await asyncio.wait_for(job.run(), timeout=10)
+    assert aggregated == {"generations": 0, "revenue": 0, "balance": 12}
+
+    # Caught up: a second run has nothing left to aggregate
+    assert await asyncio.wait_for(job.run(), timeout=10) == {
+        "generations": 0, "revenue": 0, "balance": 0,
+    }
+
+    async with background_session_maker() as session:
+        watermark = await session.scalar(
+            select(RollupWatermark.position).where(RollupWatermark.name == "balance")
+        )
+        operations = await session.scalar(
+            select(func.sum(BalanceRollup.operations)).where(BalanceRollup.resolution == "day")
+        )
+    assert watermark is not None
+    assert operations == 12
@@ -0,0 +1,77 @@
+"""Provider failover routing."""
+
+import time
+
+import pytest
+
+from src.core.exceptions import ExternalAPIError, ProviderUnavailableError
+from src.modules.generation.circuit import OPEN, circuit_breakers
+from src.modules.generation.providers import GenerationTask
+from src.modules.generation.routing import Backend, ProviderRouter
+
+
+@pytest.fixture(autouse=True)
+def breakers():
+    circuit_breakers._breakers.clear()
+    yield
+    circuit_breakers._breakers.clear()
+
+
+def _open(provider: str) -> None:
+    breaker = circuit_breakers.get(provider)
+    breaker.state = OPEN
+    breaker.opened_at = time.monotonic()
+
+
+def _recorder(fail: set[str] = frozenset()):
+    tried = []
+
+    async def submit(backend: Backend) -> GenerationTask:
+        tried.append(backend.provider)
+        if backend.provider in fail:
+            raise ExternalAPIError(service=backend.provider, message="down", status_code=502)
+        return GenerationTask(task_id="task", status="pending")
+
+    return tried, submit
+
+
+BACKENDS = [Backend("kie.ai", "veo3"), Backend("poyo.ai", "veo3-fast")]
+
+
+async def test_open_backend_skipped():
+    _open("kie.ai")
+    tried, submit = _recorder()
+
+    task, backend = await ProviderRouter().submit(BACKENDS, submit)
+
+    assert tried == ["poyo.ai"]
+    assert backend.provider == "poyo.ai"
+    assert task.task_id == "task"
+
+
+async def test_fails_over_on_provider_error():
+    tried, submit = _recorder(fail={"kie.ai"})
+
+    _, backend = await ProviderRouter().submit(BACKENDS, submit)
+
+    assert tried == ["kie.ai", "poyo.ai"]
+    assert backend.provider == "poyo.ai"
+
+
+async def test_no_backend_admitted():
+    _open("kie.ai")
+    _open("poyo.ai")
+    tried, submit = _recorder()
+
+    with pytest.raises(ProviderUnavailableError):
+        await ProviderRouter().submit(BACKENDS, submit)
+    assert tried == []
+
+
+async def test_last_error_raised_when_tried_backends_fail():
+    _open("poyo.ai")
+    tried, submit = _recorder(fail={"kie.ai"})
+
+    with pytest.raises(ExternalAPIError):
+        await ProviderRouter().submit(BACKENDS, submit)
+    assert tried == ["kie.ai"]
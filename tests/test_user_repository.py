@@ -0,0 +1,58 @@
+"""Admin user listing."""
+
+from sqlalchemy import event
+
+from src.core.database import async_session_maker, engine
+from src.modules.generation.models import Generation
+from src.modules.user.models import User
+from src.modules.user.repository import UserRepository
+from src.shared.enums import GenerationStatus, GenerationType
+
+
+async def _seed() -> int:
+    """Three users, the first with three generations. Returns its id."""
+    async with async_session_maker() as session:
+        users = [User(telegram_id=100 + i, first_name=f"User {i}") for i in range(3)]
+        session.add_all(users)
+        await session.flush()
+        session.add_all(
+            Generation(
+                user_id=users[0].id,
+                generation_type=GenerationType.IMAGE,
+                status=status,
+                tokens_spent=5,
+            )
+            for status in (GenerationStatus.SUCCESS, GenerationStatus.SUCCESS, GenerationStatus.FAILED)
+        )
+        await session.commit()
+        return users[0].id
+
+
+async def test_admin_list_is_one_query(database):
+    await _seed()
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+    try:
+        async with async_session_maker() as session:
+            rows, total = await UserRepository(session).get_admin_list(sort="total_generations")
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count)
+
+    assert len(statements) == 1
+    assert total == 3
+    top = rows[0]
+    assert (top.User.telegram_id, top.total_generations, top.total_spent) == (100, 3, 10)
+    assert [row.total_generations for row in rows[1:]] == [0, 0]
+
+
+async def test_admin_entry_has_totals(database):
+    user_id = await _seed()
+    async with async_session_maker() as session:
+        row = await UserRepository(session).get_admin_entry(user_id)
+
+    assert row.total_generations == 3
+    assert row.total_spent == 10